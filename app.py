@@ -2,141 +2,294 @@
 FastAPI Application for TikTok Metrics AI Agent
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, FileResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, create_model, model_validator
 from typing import Dict, Any, List, Optional
-import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
+from time import perf_counter
+import hmac
+import io
 import json
+import math
 import os
+import threading
+import anyio
 
+from src.api.http_caching import (
+    FingerprintedStaticFiles, StaticAssetFingerprints, conditional_payload_response
+)
+from src.api.admission import AdmissionController, AdmissionMiddleware
+from src.api.coalescing import SingleFlight, payload_key
+from src.api.live_updates import ScoreUpdateBroker, format_score_event
+from src.api.responses import FastJSONResponse, PayloadCache, loads_json
 from src.config.config import settings
+from src.config.metric_value_ranges import METRIC_BOUNDS, METRIC_DEFAULTS
+from src.config.scoring_config import scoring_config
+from src.jobs.manager import JobManager
+from src.jobs.store import JobStore
 from src.logger.logger import logger
-from src.processors.kpi_orchestrator import KPIOrchestrator
-from src.processors.recommendation_generator import RecommendationGenerator
+from src.monitoring.memory import memory_stage
+from src.monitoring.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from src.monitoring.profiling import REPORT_FORMATS as PROFILE_REPORT_FORMATS, profiled, profiler
+from src.monitoring.tracing import tracer
+from src.storage.history import SCORER_COLUMNS, SORT_KEYS, AnalysisHistoryStore, history_row, parse_timestamp
+from src.storage.write_behind import WriteBehindBuffer
+
+
+# Heavy components (scorers, recommendation pipeline, Jinja2) are created on
+# first use or during warm-up, so importing this module stays cheap.
+@lru_cache(maxsize=None)
+def get_kpi_orchestrator():
+    """Get the shared KPI orchestrator"""
+    from src.processors.kpi_orchestrator import KPIOrchestrator
+    return KPIOrchestrator()
+
+
+@lru_cache(maxsize=None)
+def get_recommendation_generator():
+    """Get the shared recommendation generator"""
+    from src.processors.recommendation_generator import RecommendationGenerator
+    return RecommendationGenerator()
+
+
+@lru_cache(maxsize=None)
+def get_batch_scorer():
+    """Get the shared vectorized batch scorer (imports NumPy)"""
+    from src.processors.batch_scorer import BatchScorer
+    return BatchScorer()
+
+
+@lru_cache(maxsize=None)
+def get_level_index():
+    """Get the performance-level bitmaps over latest stored scores (imports NumPy)"""
+    from src.storage.bitmap_index import LevelBitmapIndex
+    return LevelBitmapIndex(SCORER_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def get_cohort_snapshot():
+    """Get the columnar snapshot of latest scores and inputs for cohort queries (imports NumPy)"""
+    from src.storage.cohorts import CohortSnapshot
+    return CohortSnapshot()
 
 
-# Initialize FastAPI app
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.version,
-    description="Professional demo implementation of KPI algorithm optimization and revenue optimization AI pipeline"
+@lru_cache(maxsize=None)
+def get_templates():
+    """Get the Jinja2 templates with the fingerprinted static_url() helper"""
+    from fastapi.templating import Jinja2Templates
+    templates = Jinja2Templates(directory="templates")
+    templates.env.globals["static_url"] = static_fingerprints.url
+    return templates
+
+
+# Content-fingerprinted URLs for files under static/
+static_fingerprints = StaticAssetFingerprints("static", url_prefix="/static")
+
+# Admission control: bounded concurrency with per-route priorities
+admission_controller = AdmissionController(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    max_degraded=settings.ADMISSION_MAX_DEGRADED
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Encoded payloads that only change with the weight configuration
+payload_cache = PayloadCache()
+
+# Request tracing (sampled spans are appended to a Chrome Trace Event file)
+tracer.configure(settings.TRACING_SAMPLE_RATE, settings.TRACING_EXPORT_PATH)
+
+# On-demand cProfile sessions over live requests (started by an admin)
+profiler.configure(settings.PROFILING_OUTPUT_DIR, settings.PROFILING_MAX_REPORTS)
+
+# Scoring configuration file (weights, tiers, ranges, thresholds), polled for
+# changes while the app is running
+scoring_config.configure(settings.SCORING_CONFIG_PATH, settings.SCORING_CONFIG_POLL_SECONDS)
+
+# Shares one computation between identical concurrent /analyze requests
+analysis_flights = SingleFlight()
+
+# Pushes finished analyses to dashboards subscribed to their creator, those of
+# other workers picked up from the shared history store
+score_updates = ScoreUpdateBroker(
+    max_subscribers=settings.SSE_MAX_SUBSCRIBERS,
+    max_pending=settings.SSE_SUBSCRIBER_QUEUE_SIZE,
+    max_latest=settings.SSE_LATEST_CACHE_SIZE
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+# Analysis history, written in batches off the request path
+analysis_history = AnalysisHistoryStore(settings.HISTORY_DB_PATH)
+history_writer = WriteBehindBuffer(
+    analysis_history.insert_many,
+    name="history",
+    max_buffer=settings.HISTORY_BUFFER_SIZE,
+    batch_size=settings.HISTORY_BATCH_SIZE,
+    flush_interval=settings.HISTORY_FLUSH_INTERVAL_SECONDS
+)
+
+# Set once warm-up has primed all components and caches
+_ready = threading.Event()
+_warm_up_lock = threading.Lock()
+
+router = APIRouter(default_response_class=FastJSONResponse)
 
-# Initialize components
-kpi_orchestrator = KPIOrchestrator()
-recommendation_generator = RecommendationGenerator()
+
+def _cache_lookups() -> Dict[tuple, float]:
+    """Cache lookups by cache and result, read at scrape time"""
+    payload = payload_cache.stats()
+    flights = analysis_flights.stats()
+    return {
+        ("payload", "hit"): payload["hits"],
+        ("payload", "miss"): payload["misses"],
+        ("analyze_coalescing", "hit"): flights["coalesced"],
+        ("analyze_coalescing", "miss"): flights["computations"],
+    }
+
+
+def _cache_hit_ratio() -> Dict[tuple, float]:
+    """Cache hit ratios, read at scrape time"""
+    return {
+        ("payload",): payload_cache.stats()["hit_rate"],
+        ("analyze_coalescing",): analysis_flights.stats()["coalesce_rate"],
+    }
+
+
+def _queue_depth() -> Dict[tuple, float]:
+    """Requests waiting for the admission limiter and the worker threadpool"""
+    threadpool = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        ("admission",): admission_controller.stats()["queue_depth"],
+        ("threadpool",): threadpool.tasks_waiting,
+    }
+
+
+def _in_flight() -> Dict[tuple, float]:
+    """Requests executing under the admission limiter and in the worker threadpool"""
+    threadpool = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        ("admission",): admission_controller.stats()["active"],
+        ("threadpool",): threadpool.borrowed_tokens,
+    }
+
+
+metrics_registry.callback("tiktok_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"], _cache_lookups, "counter")
+metrics_registry.callback("tiktok_cache_hit_ratio", "Cache hit ratio since start", ["cache"], _cache_hit_ratio)
+metrics_registry.callback("tiktok_pool_queue_depth", "Requests waiting for an execution slot", ["pool"], _queue_depth)
+metrics_registry.callback("tiktok_pool_in_flight", "Requests currently executing", ["pool"], _in_flight)
+metrics_registry.callback(
+    "tiktok_admission_shed_total",
+    "Requests shed or degraded by admission control",
+    ["outcome"],
+    lambda: {(key,): admission_controller.stats()[key] for key in ("rejected", "timed_out", "evicted", "degraded")},
+    "counter"
+)
+metrics_registry.callback(
+    "tiktok_jobs",
+    "Batch jobs in the job store by status",
+    ["status"],
+    lambda: {(status,): count for status, count in job_manager.store.count_by_status().items()}
+)
+metrics_registry.callback(
+    "tiktok_history_rows_total",
+    "Analysis history rows by write-behind outcome",
+    ["outcome"],
+    lambda: {(key,): history_writer.stats()[key] for key in ("added", "written", "dropped", "failed")},
+    "counter"
+)
+metrics_registry.callback(
+    "tiktok_live_subscribers",
+    "Open live score update streams",
+    [],
+    lambda: {(): score_updates.stats()["subscribers"]}
+)
+metrics_registry.callback(
+    "tiktok_live_updates_total",
+    "Live score updates by outcome (dropped/coalesced for slow clients)",
+    ["outcome"],
+    lambda: {(key,): score_updates.stats()[key] for key in ("published", "delivered", "coalesced", "dropped")},
+    "counter"
+)
 
 
 # Pydantic models
-class CreatorMetrics(BaseModel):
-    """Creator metrics input model"""
+class CreatorIdentity(BaseModel):
+    """Creator fields other than the metrics"""
     creator_id: str
+    niche: Optional[str] = None
+    tenant_id: Optional[str] = None  # Selects the tenant's scoring profile, ahead of the niche's
     timestamp: Optional[str] = None
     
-    # Sales Performance Metrics
-    conversion_rate: Optional[float] = 0.0
-    total_revenue: Optional[float] = 0.0
-    avg_order_value: Optional[float] = 0.0
-    target_revenue: Optional[float] = 10000.0
-    target_aov: Optional[float] = 50.0
-    
-    # Shop Conversion Metrics
-    funnel_completion_rate: Optional[float] = 0.0
-    cart_abandonment_rate: Optional[float] = 1.0
-    checkout_success_rate: Optional[float] = 0.0
-    
-    # TikTok Shop Metrics
-    listing_quality: Optional[float] = 0.0
-    product_velocity: Optional[float] = 0.0
-    integration_seamlessness: Optional[float] = 0.0
-    
-    # Engagement Metrics
-    likes_ratio: Optional[float] = 0.0
-    comments_ratio: Optional[float] = 0.0
-    shares_ratio: Optional[float] = 0.0
-    retention_rate: Optional[float] = 0.0
-    avg_watch_time: Optional[float] = 0.0
-    video_duration: Optional[float] = 30.0
-    
-    # Growth Metrics
-    engagement_growth_rate: Optional[float] = 0.0
-    follower_growth_rate: Optional[float] = 0.0
-    views_growth_rate: Optional[float] = 0.0
-    
-    # Discovery Metrics
-    hashtag_performance: Optional[float] = 0.0
-    search_visibility: Optional[float] = 0.0
-    recommendation_rate: Optional[float] = 0.0
-    viral_potential: Optional[float] = 0.0
-    
-    # Content Strategy Metrics
-    video_quality: Optional[float] = 0.0
-    content_freshness: Optional[float] = 0.0
-    posting_consistency: Optional[float] = 0.0
-    content_diversity: Optional[float] = 0.0
-    
-    # Audience Fit Metrics
-    target_demographic_match: Optional[float] = 0.0
-    audience_engagement_quality: Optional[float] = 0.0
-    follower_quality_score: Optional[float] = 0.0
-    audience_retention: Optional[float] = 0.0
-    
-    # Brand Fit Metrics
-    brand_alignment: Optional[float] = 0.0
-    trust_score: Optional[float] = 0.0
-    authenticity_score: Optional[float] = 0.0
-    brand_consistency: Optional[float] = 0.0
-    
-    # Trend Fit Metrics
-    trend_alignment: Optional[float] = 0.0
-    timing_score: Optional[float] = 0.0
-    trend_relevance: Optional[float] = 0.0
-    
-    # Image Quality Metrics
-    image_quality: Optional[float] = 0.0
-    lighting_score: Optional[float] = 0.0
-    composition_score: Optional[float] = 0.0
-    color_balance: Optional[float] = 0.0
-    
-    # Reach Metrics
-    total_reach: Optional[float] = 0.0
-    unique_viewers: Optional[float] = 0.0
-    impression_rate: Optional[float] = 0.0
-    visibility_score: Optional[float] = 0.0
-    target_reach: Optional[float] = 10000.0
-    
-    # Cost Efficiency Metrics
-    cost_per_acquisition: Optional[float] = 100.0
-    cost_per_engagement: Optional[float] = 1.0
-    cost_per_view: Optional[float] = 0.1
-    roi_score: Optional[float] = 0.0
-    target_cpa: Optional[float] = 50.0
-    target_cpe: Optional[float] = 0.5
-    target_cpv: Optional[float] = 0.05
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_missing_metrics(cls, values: Any) -> Any:
+        """Metrics sent as null take their defaults, as in bulk ingestion"""
+        if isinstance(values, dict):
+            return {name: value for name, value in values.items() if value is not None or name not in METRIC_DEFAULTS}
+        return values
+
+
+def _metric_field(name: str) -> Any:
+    """Field definition of a metric: default from METRIC_DEFAULTS, accepted range from METRIC_BOUNDS"""
+    low, high = METRIC_BOUNDS[name]
+    return (float, Field(
+        METRIC_DEFAULTS[name],
+        ge=low if math.isfinite(low) else None,
+        le=high if math.isfinite(high) else None,
+        allow_inf_nan=False
+    ))
+
+
+# Creator metrics input model, one field per metric. Defaults and ranges come
+# from the tables bulk ingestion (/jobs/columns) validates against, so a
+# creator accepted by one endpoint is accepted by the other.
+CreatorMetrics = create_model(
+    "CreatorMetrics",
+    __base__=CreatorIdentity,
+    __doc__="Creator metrics input model",
+    __module__=__name__,
+    **{name: _metric_field(name) for name in METRIC_DEFAULTS}
+)
+
+
+class JobRequest(BaseModel):
+    """Batch job submission model"""
+    kind: str = "score"  # "score": scores only (vectorized), "analyze": scores and recommendations
+    creators: List[CreatorMetrics]
+    chunk_size: Optional[int] = None
+
+
+class CohortQuery(BaseModel):
+    """Cohort query model"""
+    where: Optional[str] = None  # e.g. "tier_1 < 0.3 AND engagement_scorer > 0.6 AND total_revenue > 5000"
+    sort_by: str = "overall_score"
+    order: str = "desc"
+    limit: int = 50
+    columns: Optional[List[str]] = None
+    group_by: Optional[str] = None  # "niche"
+    aggregates: List[str] = []  # e.g. ["count", "mean:overall_score", "p90:total_revenue"]
+
+
+class ProfilingRequest(BaseModel):
+    """Profiling session request model (set requests or interval_seconds)"""
+    requests: Optional[int] = None  # Profile the next N calls
+    interval_seconds: Optional[float] = None  # Or one sampled call per interval
+    duration_seconds: float = 300.0  # The session ends after this long in either mode
+    endpoints: Optional[List[str]] = None  # e.g. ["analyze"]; None profiles every instrumented call
 
 
 class AnalysisResponse(BaseModel):
     """Analysis response model"""
     success: bool
     creator_id: str
+    niche: Optional[str] = None
+    scoring_profile: Optional[str] = None
     overall_score: float
     revenue_focus_score: float
     tier_breakdown: Dict[str, Any]
@@ -145,45 +298,54 @@ class AnalysisResponse(BaseModel):
     recommendations: List[Dict[str, Any]]
     insights: Dict[str, Any]
     timestamp: str
+    degraded: bool = False
 
 
 # API Endpoints
-@app.get("/", response_class=HTMLResponse)
+@router.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Serve the interactive dashboard"""
-    return templates.TemplateResponse("dashboard.html", {"request": request, "base_url": settings.base_url})
+    return get_templates().TemplateResponse("dashboard.html", {"request": request, "base_url": settings.base_url})
 
 
-@app.get("/weights", response_class=HTMLResponse)
-async def weights_visualization():
+@router.get("/weights", response_class=HTMLResponse)
+async def weights_visualization(request: Request):
     """Serve the weights visualization page"""
-    return FileResponse("templates/weights_visualization.html")
+    return get_templates().TemplateResponse("weights_visualization.html", {"request": request})
 
 
-@app.get("/weights/api", response_class=JSONResponse)
-async def get_weights_api():
-    """Get weights data as JSON for API consumption"""
+def _build_weights_payload() -> Dict[str, Any]:
+    """Build the weights API payload for the active configuration"""
+    config = scoring_config.current
     return {
-        "weights": settings.KPI_WEIGHTS,
+        "weights": config.weights,
         "tier_breakdown": {
             "tier_1": {
-                "kpis": settings.TIER_1_KPIS,
-                "total_weight": sum(settings.KPI_WEIGHTS[kpi] for kpi in settings.TIER_1_KPIS)
+                "kpis": config.tiers["tier_1"],
+                "total_weight": sum(config.weights[kpi] for kpi in config.tiers["tier_1"])
             },
             "tier_2": {
-                "kpis": settings.TIER_2_KPIS,
-                "total_weight": sum(settings.KPI_WEIGHTS[kpi] for kpi in settings.TIER_2_KPIS)
+                "kpis": config.tiers["tier_2"],
+                "total_weight": sum(config.weights[kpi] for kpi in config.tiers["tier_2"])
             },
             "tier_3": {
-                "kpis": settings.TIER_3_KPIS,
-                "total_weight": sum(settings.KPI_WEIGHTS[kpi] for kpi in settings.TIER_3_KPIS)
+                "kpis": config.tiers["tier_3"],
+                "total_weight": sum(config.weights[kpi] for kpi in config.tiers["tier_3"])
             }
         },
         "algorithm_description": "Multi-tier weighted algorithm prioritizing e-commerce revenue"
     }
 
 
-@app.get("/api", response_class=HTMLResponse)
+@router.get("/weights/api", response_class=FastJSONResponse)
+async def get_weights_api(request: Request):
+    """Get weights data as JSON for API consumption, validated by ETag and Last-Modified"""
+    config = scoring_config.current
+    payload = payload_cache.get_or_build("weights_api", _build_weights_payload, config.version)
+    return conditional_payload_response(request, payload, last_modified=config.modified_at)
+
+
+@router.get("/api", response_class=HTMLResponse)
 async def api_docs():
     """API documentation page"""
     html_content = """
@@ -210,6 +372,38 @@ async def api_docs():
                 <span class="method">POST</span> /analyze - Analyze creator metrics and generate recommendations
             </div>
             
+            <div class="endpoint">
+                <span class="method">POST</span> /jobs - Submit a batch scoring job (GET /jobs/{job_id} for progress, /jobs/{job_id}/results to download, /jobs/{job_id}/memory for allocations)
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">POST</span> /jobs/columns - Submit a batch job as columns, validated in bulk with a per-creator error report
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">POST</span> /jobs/tiktok-export - Submit a batch job from a raw per-video TikTok export (CSV), aggregated per creator
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /leaderboard - Creators ranked by any score, filtered by niche and date
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /cohorts/levels - Count creators matching a boolean filter over scorer performance levels
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">POST</span> /cohorts/query - Filter, rank and aggregate creators by scores and input metrics
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /history/{creator_id} - Stored analyses of a creator (GET /history for a time-range scan)
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /stream/scores?creator_ids=a,b - Live score updates (server-sent events)
+            </div>
+            
             <div class="endpoint">
                 <span class="method">GET</span> /health - Health check endpoint
             </div>
@@ -222,6 +416,22 @@ async def api_docs():
                 <span class="method">GET</span> /weights/api - Algorithm weights data (JSON)
             </div>
             
+            <div class="endpoint">
+                <span class="method">GET</span> /stats - Cache and request coalescing statistics
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /metrics - Prometheus metrics (request, stage and scorer latency)
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">POST</span> /admin/profiling - Profile the next N requests or one per interval (admin token; GET for status and reports)
+            </div>
+            
+            <div class="endpoint">
+                <span class="method">GET</span> /admin/scoring-config - Active scoring configuration and its version (admin token; POST /admin/scoring-config/reload to reload now)
+            </div>
+            
             <div class="endpoint">
                 <span class="method">GET</span> /docs - Interactive API documentation
             </div>
@@ -280,7 +490,7 @@ async def api_docs():
     return HTMLResponse(content=html_content)
 
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
@@ -291,57 +501,585 @@ async def health_check():
     }
 
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_creator_metrics(metrics: CreatorMetrics):
+def _analysis_response(data: Dict[str, Any], kpi_analysis: Dict[str, Any],
+                       recommendations: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Analyze creator metrics and generate recommendations
+    Build the analysis response payload
     
-    This endpoint implements the optimized KPI algorithm and AI recommendation pipeline
-    """
-    try:
-        # Convert Pydantic model to dictionary
-        data = metrics.dict()
+    Built as a plain dict and encoded with orjson, bypassing Pydantic
+    validation of our own output.
+    
+    Args:
+        data: Creator metrics dictionary with timestamp filled in
+        kpi_analysis: KPIOrchestrator.calculate_overall_score result
+        recommendations: RecommendationGenerator.generate_recommendations result
         
-        # Add timestamp if not provided
-        if not data.get("timestamp"):
-            data["timestamp"] = datetime.now().isoformat()
+    Returns:
+        Analysis response payload
+    """
+    return {
+        "success": True,
+        "creator_id": data["creator_id"],
+        "niche": data.get("niche"),
+        "scoring_profile": kpi_analysis.get("scoring_profile"),
+        "overall_score": kpi_analysis["overall_score"],
+        "revenue_focus_score": kpi_analysis["revenue_focus_score"],
+        "tier_breakdown": kpi_analysis["tier_breakdown"],
+        "individual_scores": kpi_analysis["individual_scores"],
+        "performance_levels": kpi_analysis["performance_levels"],
+        "recommendations": recommendations.get("recommendations", []),
+        "insights": recommendations.get("insights", {}),
+        "timestamp": data["timestamp"]
+    }
+
+
+@profiled("analyze")
+def _run_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the scoring and recommendation pipeline for one creator
+    
+    Args:
+        data: Creator metrics dictionary with timestamp filled in
         
+    Returns:
+        Analysis response payload
+    """
+    # One configuration snapshot for scoring and recommendations, even if a
+    # reload swaps the configuration between them
+    with scoring_config.using(scoring_config.select(data)):
         # Calculate overall score using optimized algorithm
-        kpi_analysis = kpi_orchestrator.calculate_overall_score(data)
+        kpi_analysis = get_kpi_orchestrator().calculate_overall_score(data)
         
         # Generate recommendations using AI pipeline
-        recommendations = recommendation_generator.generate_recommendations(data)
+        recommendations = get_recommendation_generator().generate_recommendations(data)
+    
+    return _analysis_response(data, kpi_analysis, recommendations)
+
+
+@profiled("analyze")
+def _run_score_only(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the scoring step only, used when the service sheds load
+    
+    Args:
+        data: Creator metrics dictionary with timestamp filled in
         
-        # Prepare response
-        response = AnalysisResponse(
-            success=True,
-            creator_id=metrics.creator_id,
-            overall_score=kpi_analysis["overall_score"],
-            revenue_focus_score=kpi_analysis["revenue_focus_score"],
-            tier_breakdown=kpi_analysis["tier_breakdown"],
-            individual_scores=kpi_analysis["individual_scores"],
-            performance_levels=kpi_analysis["performance_levels"],
-            recommendations=recommendations.get("recommendations", []),
-            insights=recommendations.get("insights", {}),
-            timestamp=data["timestamp"]
-        )
+    Returns:
+        Analysis response payload without recommendations
+    """
+    kpi_analysis = get_kpi_orchestrator().calculate_overall_score(data)
+    return {**_analysis_response(data, kpi_analysis, {}), "degraded": True}
+
+
+def _publish_analysis(response: Dict[str, Any], metrics: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Hand a freshly computed analysis to live subscribers and the history store
+    
+    Args:
+        response: Analysis response payload
+        metrics: Input metrics the analysis was computed from
+    """
+    row = history_row(response, metrics=metrics)
+    score_updates.publish(response["creator_id"], response, analyzed_at=row[2])
+    history_writer.add(row)
+
+
+@profiled("jobs")
+def _score_job_chunk(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Job chunk processor: vectorized scores for every creator in the chunk"""
+    with memory_stage("scoring", len(records)):
+        results = get_batch_scorer().score_records(records)
+    for result, record in zip(results, records):
+        row = history_row(result, metrics=record)
+        score_updates.publish(result["creator_id"], result, analyzed_at=row[2], followed_only=True)
+        history_writer.add(row)
+    return results
+
+
+@profiled("jobs")
+def _analyze_job_chunk(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Job chunk processor: full analysis with recommendations per creator"""
+    timestamp = datetime.now().isoformat()
+    inputs = [{**record, "timestamp": record.get("timestamp") or timestamp} for record in records]
+    # Each creator's configuration is taken once, for both stages
+    configs = [scoring_config.select(data) for data in inputs]
+    
+    # One stage at a time over the chunk, so memory reports can tell them apart
+    with memory_stage("scoring", len(inputs)):
+        orchestrator = get_kpi_orchestrator()
+        kpi_analyses = []
+        for data, config in zip(inputs, configs):
+            with scoring_config.using(config):
+                kpi_analyses.append(orchestrator.calculate_overall_score(data))
+    with memory_stage("recommendations", len(inputs)):
+        generator = get_recommendation_generator()
+        recommendations = []
+        for data, config in zip(inputs, configs):
+            with scoring_config.using(config):
+                recommendations.append(generator.generate_recommendations(data))
+    
+    results = []
+    for data, record, kpi_analysis, recommendation in zip(inputs, records, kpi_analyses, recommendations):
+        response = _analysis_response(data, kpi_analysis, recommendation)
+        _publish_analysis(response, record)
+        results.append(response)
+    return results
+
+
+# Background batch jobs, checkpointed per chunk in a local SQLite store
+job_manager = JobManager(
+    JobStore(settings.JOBS_DB_PATH),
+    processors={"score": _score_job_chunk, "analyze": _analyze_job_chunk},
+    max_workers=settings.JOBS_MAX_WORKERS,
+    lease_seconds=settings.JOBS_LEASE_SECONDS,
+    poll_interval=settings.JOBS_POLL_INTERVAL_SECONDS,
+    memory_report_dir=settings.JOBS_MEMORY_REPORT_DIR if settings.JOBS_MEMORY_PROFILING else None,
+    memory_budget=settings.MEMORY_BUDGET_BYTES_PER_CREATOR
+)
+
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics in the text exposition format"""
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@router.get("/stats")
+async def runtime_stats():
+    """Runtime statistics for caches and request coalescing"""
+    return {
+        "payload_cache": payload_cache.stats(),
+        "analyze_coalescing": analysis_flights.stats(),
+        "admission": admission_controller.stats(),
+        "live_updates": score_updates.stats(),
+        "jobs": job_manager.stats(),
+        "history": {**history_writer.stats(), **analysis_history.stats()},
+        "level_index": get_level_index().stats(),
+        "cohorts": get_cohort_snapshot().stats(),
+        "profiling": profiler.stats(),
+        "scoring_config": scoring_config.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.post("/analyze", response_model=AnalysisResponse)
+async def analyze_creator_metrics(metrics: CreatorMetrics, request: Request):
+    """
+    Analyze creator metrics and generate recommendations
+    
+    This endpoint implements the optimized KPI algorithm and AI recommendation pipeline.
+    Concurrent requests with an identical payload share a single computation.
+    Under overload the response is degraded to scores only (no recommendations).
+    """
+    try:
+        # Convert Pydantic model to dictionary
+        data = metrics.model_dump()
+        
+        degraded = getattr(request.state, "degraded", False)
+        pipeline = _run_score_only if degraded else _run_analysis
+        force_sample = request.headers.get("x-trace-sample") == "1"
+        
+        with tracer.start_trace("analyze", force_sample=force_sample,
+                                creator_id=metrics.creator_id, degraded=degraded) as trace_id:
+            # Key on the payload as sent, so requests without a timestamp coalesce
+            mode = "degraded" if degraded else "full"
+            key = payload_key(data, namespace=f"analyze:{mode}:{settings.weight_version}")
+            
+            # Add timestamp if not provided
+            if not data.get("timestamp"):
+                data["timestamp"] = datetime.now().isoformat()
+            
+            async def compute() -> Dict[str, Any]:
+                result = await run_in_threadpool(pipeline, data)
+                _publish_analysis(result, data)
+                return result
+            
+            # Score in the threadpool; identical in-flight requests await the same result
+            response = await analysis_flights.do(key, compute)
+            
+            with tracer.span("serialization"):
+                encoded = FastJSONResponse(response, headers={"X-Trace-Id": trace_id})
         
         logger.info(f"Analysis completed for creator {metrics.creator_id}")
-        return response
+        return encoded
         
     except Exception as e:
         logger.error(f"Error analyzing creator metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/compare-algorithms")
+def _job_chunk_size(chunk_size: Any) -> int:
+    """
+    Resolve the chunk size of a job submission
+    
+    Args:
+        chunk_size: Requested records per chunk, None for the default
+        
+    Returns:
+        Records per chunk
+        
+    Raises:
+        HTTPException: 400 unless chunk_size is None or a positive integer
+    """
+    if chunk_size is None:
+        return settings.JOBS_CHUNK_SIZE
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be a positive integer")
+    return chunk_size
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(job: JobRequest):
+    """
+    Submit a batch job and return its ID immediately
+    
+    Creators are split into chunks that are scored in the background and
+    checkpointed, so a restart resumes from the last completed chunk.
+    """
+    if job.kind not in job_manager.kinds:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{job.kind}', expected one of {list(job_manager.kinds)}")
+    chunk_size = _job_chunk_size(job.chunk_size)
+    if not job.creators or len(job.creators) > settings.JOBS_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {settings.JOBS_MAX_ITEMS} creators")
+    
+    records = [creator.model_dump() for creator in job.creators]
+    return await run_in_threadpool(job_manager.submit, job.kind, records, chunk_size)
+
+
+async def _submit_validated_job(validation: Any, kind: str, chunk_size: int,
+                                skip_invalid: bool) -> Dict[str, Any]:
+    """
+    Submit the creators of a bulk validation as a batch job
+    
+    Any invalid creator fails the request with a per-creator error report,
+    unless skip_invalid is set, in which case the valid creators are
+    submitted and the report is returned with the job.
+    
+    Args:
+        validation: BulkValidation of the creators
+        kind: Job kind
+        chunk_size: Records per chunk
+        skip_invalid: Submit the valid creators instead of failing
+        
+    Returns:
+        Job description with the invalid count and error report
+    """
+    if not validation.size or validation.size > settings.JOBS_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {settings.JOBS_MAX_ITEMS} creators")
+    
+    errors = validation.errors(limit=settings.JOBS_MAX_REPORTED_ERRORS)
+    if validation.invalid_count and (not skip_invalid or validation.invalid_count == validation.size):
+        raise HTTPException(status_code=422, detail={
+            "message": f"{validation.invalid_count} of {validation.size} creators are invalid",
+            "invalid_count": validation.invalid_count,
+            "errors": errors
+        })
+    
+    records = await run_in_threadpool(validation.records)
+    job = await run_in_threadpool(job_manager.submit, kind, records, chunk_size)
+    return {**job, "invalid_count": validation.invalid_count, "errors": errors}
+
+
+@router.post("/jobs/columns", status_code=202)
+async def submit_columnar_job(request: Request):
+    """
+    Submit a batch job given as columns, validated in bulk
+    
+    The body is {"kind", "columns": {field: [one value per creator]},
+    "chunk_size", "skip_invalid"}. Columns are validated whole with NumPy
+    instead of one CreatorMetrics model per creator: values are coerced to
+    floats, missing ones take their defaults, and NaN, infinite and
+    out-of-range values are rejected.
+    """
+    from src.ingestion.validation import validate_columns
+    
+    try:
+        body = loads_json(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(body, dict) or not isinstance(body.get("columns"), dict):
+        raise HTTPException(status_code=400, detail='Expected an object with a "columns" object')
+    kind = body.get("kind", "score")
+    if kind not in job_manager.kinds:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{kind}', expected one of {list(job_manager.kinds)}")
+    chunk_size = _job_chunk_size(body.get("chunk_size"))
+    
+    try:
+        validation = await run_in_threadpool(validate_columns, body["columns"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await _submit_validated_job(validation, kind, chunk_size, bool(body.get("skip_invalid")))
+
+
+@router.post("/jobs/tiktok-export", status_code=202)
+async def submit_tiktok_export_job(request: Request, kind: str = "score", chunk_size: Optional[int] = None,
+                                   skip_invalid: bool = False):
+    """
+    Submit a batch job from a raw TikTok per-video export (CSV request body)
+    
+    Videos are grouped by creator and their view, like, comment, share,
+    impression and watch-time counts summed with NumPy; the ratios the
+    scorers expect are derived from the sums and validated like
+    /jobs/columns.
+    """
+    from src.ingestion.tiktok_export import load_export
+    
+    if kind not in job_manager.kinds:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{kind}', expected one of {list(job_manager.kinds)}")
+    chunk_size = _job_chunk_size(chunk_size)
+    
+    try:
+        export = io.StringIO((await request.body()).decode("utf-8-sig"))
+        validation = await run_in_threadpool(load_export, export)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await _submit_validated_job(validation, kind, chunk_size, skip_invalid)
+
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 50):
+    """List the most recent batch jobs"""
+    jobs = await run_in_threadpool(job_manager.store.list_jobs, max(1, min(limit, 500)))
+    return {"jobs": [JobManager.describe(job) for job in jobs]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get a batch job's status and progress"""
+    job = await run_in_threadpool(job_manager.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobManager.describe(job)
+
+
+@router.get("/jobs/{job_id}/results")
+async def download_job_results(job_id: str):
+    """Download a completed job's results as JSON Lines, in submission order"""
+    job = await run_in_threadpool(job_manager.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, results are available once it completes")
+    
+    return StreamingResponse(
+        job_manager.store.iter_results(job_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{job_id}.jsonl"'}
+    )
+
+
+@router.get("/jobs/{job_id}/memory")
+async def get_job_memory_report(job_id: str):
+    """Per-stage allocation report of a job, written when JOBS_MEMORY_PROFILING is on"""
+    report = await run_in_threadpool(job_manager.memory_report, job_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No memory report for this job (is JOBS_MEMORY_PROFILING on?)")
+    return report
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running batch job"""
+    if not await run_in_threadpool(job_manager.store.cancel_job, job_id):
+        job = await run_in_threadpool(job_manager.store.get_job, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail=f"Job is already {job['status']}")
+    return JobManager.describe(await run_in_threadpool(job_manager.store.get_job, job_id))
+
+
+def _parse_time_param(name: str, value: Optional[str]) -> Optional[float]:
+    """Parse an ISO 8601 or epoch seconds query parameter, 400 if invalid"""
+    timestamp = parse_timestamp(value)
+    if value and timestamp is None:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected ISO 8601 or epoch seconds")
+    return timestamp
+
+
+@router.get("/history")
+async def scan_history(start: Optional[str] = None, end: Optional[str] = None, limit: int = 1000,
+                       cursor: Optional[str] = None):
+    """
+    Scan stored analyses of all creators in time order
+    
+    Pages are keyset-paginated: pass next_cursor from a response as cursor
+    to continue. Results are written behind, so analyses from the last
+    flush interval may not be visible yet.
+    """
+    after = None
+    if cursor:
+        try:
+            analyzed_at, row_id = cursor.split(":")
+            after = (float(analyzed_at), int(row_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    limit = max(1, min(limit, 10000))
+    rows = await run_in_threadpool(
+        analysis_history.time_range,
+        _parse_time_param("start", start), _parse_time_param("end", end), limit, after
+    )
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last['analyzed_at']!r}:{last['id']}"
+    return {"count": len(rows), "rows": rows, "next_cursor": next_cursor}
+
+
+@router.get("/leaderboard")
+async def leaderboard(sort_by: str = "overall_score", order: str = "desc", niche: Optional[str] = None,
+                      start: Optional[str] = None, end: Optional[str] = None, limit: int = 50,
+                      cursor: Optional[str] = None):
+    """
+    Rank creators by a score of their latest stored analysis
+    
+    sort_by is overall_score, revenue_focus_score, a tier (tier_1..tier_3)
+    or a scorer name. start/end filter on the time of the latest analysis.
+    Pages are keyset-paginated: pass next_cursor as cursor to continue.
+    """
+    if sort_by not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by, expected one of: {', '.join(SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order, expected asc or desc")
+    after = None
+    if cursor:
+        try:
+            value, creator_id = cursor.split(":", 1)
+            after = (float(value), creator_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    limit = max(1, min(limit, 1000))
+    rows = await run_in_threadpool(
+        analysis_history.leaderboard,
+        sort_by, order == "desc", niche, _parse_time_param("start", start), _parse_time_param("end", end),
+        limit, after
+    )
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        value = {**last, **last["tier_scores"], **last["individual_scores"]}[sort_by]
+        next_cursor = f"{value!r}:{last['creator_id']}"
+    return {"sort_by": sort_by, "order": order, "count": len(rows), "rows": rows, "next_cursor": next_cursor}
+
+
+@router.get("/cohorts/levels")
+async def level_cohort(q: str, limit: int = 0):
+    """
+    Count (and optionally list) creators matching a boolean performance-level filter
+    
+    q combines scorer:level terms (low, medium, high) with AND, OR, NOT and
+    parentheses, e.g. "shop_conversion:low AND engagement:high AND discovery:medium".
+    The _scorer suffix of scorer names is optional. Levels are those of each
+    creator's latest stored analysis.
+    """
+    level_index = get_level_index()
+    await run_in_threadpool(level_index.sync, analysis_history, settings.COHORT_SYNC_INTERVAL_SECONDS)
+    try:
+        result = level_index.query(q, max(0, min(limit, 10000)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"query": q, "population": level_index.size, **result}
+
+
+@router.post("/cohorts/query")
+async def cohort_query(query: CohortQuery):
+    """
+    Filter, rank and aggregate creators by their latest scores and input metrics
+    
+    where compares any score, tier, scorer or input metric with a number
+    (<, <=, >, >=, =, !=) and niche with a quoted string, combined with AND,
+    OR, NOT and parentheses; unknown values satisfy neither a comparison nor
+    its negation. Aggregates are "count" or mean, sum, min, max or a
+    percentile (p0..p100) of a column, optionally grouped by niche.
+    """
+    if query.order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order, expected asc or desc")
+    
+    def run() -> Dict[str, Any]:
+        cohort_snapshot = get_cohort_snapshot()
+        cohort_snapshot.sync(analysis_history, settings.COHORT_SYNC_INTERVAL_SECONDS)
+        return cohort_snapshot.query(
+            query.where, query.sort_by, query.order == "desc", max(0, min(query.limit, 1000)),
+            query.columns, query.group_by, query.aggregates
+        )
+    
+    try:
+        return await run_in_threadpool(run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/history/{creator_id}")
+async def creator_history(creator_id: str, start: Optional[str] = None, end: Optional[str] = None,
+                          limit: int = 100):
+    """Get a creator's stored analyses, newest first"""
+    rows = await run_in_threadpool(
+        analysis_history.creator_history,
+        creator_id, _parse_time_param("start", start), _parse_time_param("end", end), max(1, min(limit, 10000))
+    )
+    return {"creator_id": creator_id, "count": len(rows), "history": rows}
+
+
+@router.get("/stream/scores")
+async def stream_scores(creator_ids: str):
+    """
+    Stream score updates for a comma-separated list of creator IDs
+    
+    Server-sent events: one "score" event per finished analysis, starting
+    with the latest known analysis of each creator. Clients that fall behind
+    receive only the newest update per creator.
+    """
+    ids = sorted({creator_id.strip() for creator_id in creator_ids.split(",") if creator_id.strip()})
+    if not ids or len(ids) > settings.SSE_MAX_CREATORS_PER_SUBSCRIPTION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 1 and {settings.SSE_MAX_CREATORS_PER_SUBSCRIPTION} creator IDs"
+        )
+    
+    subscription = score_updates.subscribe(ids)
+    if subscription is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live subscribers, please retry later",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+    
+    async def events():
+        try:
+            yield b"retry: %d\n\n" % settings.SSE_RETRY_MILLISECONDS
+            while True:
+                batch = await subscription.next_batch(settings.SSE_HEARTBEAT_SECONDS)
+                if batch:
+                    yield b"".join(format_score_event(event) for event in batch)
+                else:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield b": keep-alive\n\n"
+        finally:
+            score_updates.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@profiled("compare")
+def _run_comparison(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Score a creator with the optimized and the equal weighting"""
+    return get_kpi_orchestrator().compare_with_equal_weighting(data)
+
+
+@router.post("/compare-algorithms")
 async def compare_algorithms(metrics: CreatorMetrics):
     """
     Compare the new optimized algorithm with the old equal weighting approach
     """
     try:
-        data = metrics.dict()
-        comparison = kpi_orchestrator.compare_with_equal_weighting(data)
+        data = metrics.model_dump()
+        # Score in the threadpool so a slow comparison does not block the event loop
+        comparison = await run_in_threadpool(_run_comparison, data)
         
         return {
             "success": True,
@@ -355,99 +1093,320 @@ async def compare_algorithms(metrics: CreatorMetrics):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/demo-data")
-async def get_demo_data():
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency rejecting requests without the configured admin token"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
+
+
+@router.post("/admin/profiling", status_code=201, dependencies=[Depends(require_admin)])
+async def start_profiling(session: ProfilingRequest):
     """
-    Get sample data for testing the API
+    Start profiling live requests in this worker process
+    
+    Profiles either the next N calls of the analysis, comparison and job
+    pipelines or one call per interval, until the session ends; the merged
+    report is then written to disk and listed by GET /admin/profiling.
     """
-    demo_data = {
-        "creator_id": "demo_creator_001",
-        "timestamp": datetime.now().isoformat(),
-        
-        # Sales Performance (Tier 1)
-        "conversion_rate": 0.05,  # 5%
-        "total_revenue": 5000.0,
-        "avg_order_value": 45.0,
-        
-        # Shop Conversion (Tier 1)
-        "funnel_completion_rate": 0.3,
-        "cart_abandonment_rate": 0.7,  # High abandonment
-        "checkout_success_rate": 0.8,
-        
-        # TikTok Shop (Tier 1)
-        "listing_quality": 0.6,
-        "product_velocity": 0.4,
-        "integration_seamlessness": 0.7,
-        
-        # Engagement (Tier 2)
-        "likes_ratio": 0.7,
-        "comments_ratio": 0.15,
-        "shares_ratio": 0.15,
-        "retention_rate": 0.6,
-        "avg_watch_time": 20.0,
-        "video_duration": 30.0,
-        
-        # Growth (Tier 2)
-        "engagement_growth_rate": 0.1,
-        "follower_growth_rate": 0.05,
-        "views_growth_rate": 0.15,
-        
-        # Discovery (Tier 2)
-        "hashtag_performance": 0.4,
-        "search_visibility": 0.3,
-        "recommendation_rate": 0.02,
-        "viral_potential": 0.5,
-        
-        # Content Strategy (Tier 2)
-        "video_quality": 0.3,  # Low quality
-        "content_freshness": 0.6,
-        "posting_consistency": 0.7,
-        "content_diversity": 0.5,
-        
-        # Audience Fit (Tier 2)
-        "target_demographic_match": 0.6,
-        "audience_engagement_quality": 0.5,
-        "follower_quality_score": 0.4,
-        "audience_retention": 0.6,
-        
-        # Brand Fit (Tier 2)
-        "brand_alignment": 0.7,
-        "trust_score": 0.6,
-        "authenticity_score": 0.8,
-        "brand_consistency": 0.5,
-        
-        # Trend Fit (Tier 3)
-        "trend_alignment": 0.4,
-        "timing_score": 0.5,
-        "trend_relevance": 0.6,
-        
-        # Image Quality (Tier 3)
-        "image_quality": 0.3,  # Low quality
-        "lighting_score": 0.4,
-        "composition_score": 0.5,
-        "color_balance": 0.6,
-        
-        # Reach (Tier 3)
-        "total_reach": 5000.0,
-        "unique_viewers": 4000.0,
-        "impression_rate": 0.03,
-        "visibility_score": 0.5,
-        
-        # Cost Efficiency (Tier 3)
-        "cost_per_acquisition": 80.0,
-        "cost_per_engagement": 0.8,
-        "cost_per_view": 0.08,
-        "roi_score": 1.2
-    }
+    try:
+        return await run_in_threadpool(
+            profiler.start,
+            requests=session.requests,
+            interval=session.interval_seconds,
+            duration=session.duration_seconds,
+            endpoints=session.endpoints
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def profiling_status():
+    """Active profiling session and the reports on disk, newest first"""
+    return await run_in_threadpool(profiler.status)
+
+
+@router.delete("/admin/profiling", dependencies=[Depends(require_admin)])
+async def stop_profiling():
+    """End the active profiling session now and write its report"""
+    report = await run_in_threadpool(profiler.stop)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No active profiling session")
+    return report
+
+
+@router.get("/admin/profiling/reports/{report_id}", dependencies=[Depends(require_admin)])
+async def download_profile(report_id: str, format: str = "txt"):
+    """Download a profiling report as text, JSON or a pstats .prof file"""
+    path = profiler.report_path(report_id, format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return FileResponse(path, media_type=PROFILE_REPORT_FORMATS[format], filename=path.name)
+
+
+@router.get("/admin/scoring-config", dependencies=[Depends(require_admin)])
+async def get_scoring_config():
+    """Active scoring configuration of this worker process and the file watcher status"""
+    return {**scoring_config.stats(), "config": scoring_config.current.as_dict()}
+
+
+@router.post("/admin/scoring-config/reload", dependencies=[Depends(require_admin)])
+async def reload_scoring_config():
+    """
+    Reload the scoring configuration file now, in this worker process
     
+    Other workers pick the change up on their next poll. An invalid file is
+    rejected with a 400 and the active configuration is kept.
+    """
+    try:
+        config = await run_in_threadpool(scoring_config.reload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**scoring_config.stats(), "config": config.as_dict()}
+
+
+# Sample creator used by the dashboard "Load Demo Data" button
+DEMO_CREATOR_DATA: Dict[str, Any] = {
+    "creator_id": "demo_creator_001",
+    
+    # Sales Performance (Tier 1)
+    "conversion_rate": 0.05,  # 5%
+    "total_revenue": 5000.0,
+    "avg_order_value": 45.0,
+    
+    # Shop Conversion (Tier 1)
+    "funnel_completion_rate": 0.3,
+    "cart_abandonment_rate": 0.7,  # High abandonment
+    "checkout_success_rate": 0.8,
+    
+    # TikTok Shop (Tier 1)
+    "listing_quality": 0.6,
+    "product_velocity": 0.4,
+    "integration_seamlessness": 0.7,
+    
+    # Engagement (Tier 2)
+    "likes_ratio": 0.7,
+    "comments_ratio": 0.15,
+    "shares_ratio": 0.15,
+    "retention_rate": 0.6,
+    "avg_watch_time": 20.0,
+    "video_duration": 30.0,
+    
+    # Growth (Tier 2)
+    "engagement_growth_rate": 0.1,
+    "follower_growth_rate": 0.05,
+    "views_growth_rate": 0.15,
+    
+    # Discovery (Tier 2)
+    "hashtag_performance": 0.4,
+    "search_visibility": 0.3,
+    "recommendation_rate": 0.02,
+    "viral_potential": 0.5,
+    
+    # Content Strategy (Tier 2)
+    "video_quality": 0.3,  # Low quality
+    "content_freshness": 0.6,
+    "posting_consistency": 0.7,
+    "content_diversity": 0.5,
+    
+    # Audience Fit (Tier 2)
+    "target_demographic_match": 0.6,
+    "audience_engagement_quality": 0.5,
+    "follower_quality_score": 0.4,
+    "audience_retention": 0.6,
+    
+    # Brand Fit (Tier 2)
+    "brand_alignment": 0.7,
+    "trust_score": 0.6,
+    "authenticity_score": 0.8,
+    "brand_consistency": 0.5,
+    
+    # Trend Fit (Tier 3)
+    "trend_alignment": 0.4,
+    "timing_score": 0.5,
+    "trend_relevance": 0.6,
+    
+    # Image Quality (Tier 3)
+    "image_quality": 0.3,  # Low quality
+    "lighting_score": 0.4,
+    "composition_score": 0.5,
+    "color_balance": 0.6,
+    
+    # Reach (Tier 3)
+    "total_reach": 5000.0,
+    "unique_viewers": 4000.0,
+    "impression_rate": 0.03,
+    "visibility_score": 0.5,
+    
+    # Cost Efficiency (Tier 3)
+    "cost_per_acquisition": 80.0,
+    "cost_per_engagement": 0.8,
+    "cost_per_view": 0.08,
+    "roi_score": 1.2
+}
+
+
+def _build_demo_payload() -> Dict[str, Any]:
+    """Build the demo data payload (the same bytes in every worker; /analyze fills in the timestamp)"""
     return {
         "success": True,
-        "demo_data": demo_data,
+        "demo_data": dict(DEMO_CREATOR_DATA),
         "description": "Sample creator data with various performance levels for testing"
     }
 
 
+@router.get("/demo-data")
+async def get_demo_data(request: Request):
+    """
+    Get sample data for testing the API
+    """
+    payload = payload_cache.get_or_build("demo_data", _build_demo_payload)
+    return conditional_payload_response(request, payload)
+
+
+@router.get("/test-weights", response_class=HTMLResponse)
+async def test_weights():
+    """Test page for weights API"""
+    return FileResponse("templates/test_weights.html")
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until warm-up has primed components and caches"""
+    if not _ready.is_set():
+        return FastJSONResponse({"status": "warming_up"}, status_code=503)
+    return {"status": "ready", "timestamp": datetime.now().isoformat()}
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Create heavy components and prime caches before the app reports ready
+    
+    Safe to call more than once; only the first call does any work. Runs
+    synchronously, so a pre-forking server can call it before forking.
+    
+    Returns:
+        Seconds spent per warm-up step (empty if already warm)
+    """
+    with _warm_up_lock:
+        if _ready.is_set():
+            return {}
+        
+        timings = {}
+        steps = [
+            ("kpi_orchestrator", get_kpi_orchestrator),
+            ("recommendation_generator", get_recommendation_generator),
+            ("batch_scorer", get_batch_scorer),
+            ("templates", get_templates),
+            ("payload_cache", lambda: (
+                payload_cache.get_or_build("weights_api", _build_weights_payload, settings.weight_version),
+                payload_cache.get_or_build("demo_data", _build_demo_payload)
+            )),
+            ("static_fingerprints", lambda: [
+                static_fingerprints.digest(os.path.relpath(os.path.join(root, name), "static"))
+                for root, _, names in os.walk("static") for name in names
+            ]),
+            ("analysis_pipeline", lambda: _run_analysis(
+                {**DEMO_CREATOR_DATA, "timestamp": datetime.now().isoformat()}
+            )),
+        ]
+        for name, step in steps:
+            start = perf_counter()
+            step()
+            timings[name] = perf_counter() - start
+        
+        _ready.set()
+        logger.info(f"Warm-up completed in {sum(timings.values()):.3f}s")
+        return timings
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    Warm up before serving (a no-op if warm-up already ran before fork), load
+    the level index and start building the leaderboard indexes, then run the
+    history writer, batch job workers, the scoring configuration watcher and
+    the live update feed in this process until shutdown, and write the queued
+    traces on the way out
+    """
+    await run_in_threadpool(warm_up)
+    await run_in_threadpool(get_level_index().sync, analysis_history)
+    analysis_history.start_index_build()
+    history_writer.start()
+    job_manager.start()
+    scoring_config.start()
+    score_updates.start(analysis_history, settings.SSE_SYNC_INTERVAL_SECONDS)
+    try:
+        yield
+    finally:
+        await run_in_threadpool(score_updates.stop)
+        await run_in_threadpool(scoring_config.stop)
+        await run_in_threadpool(job_manager.stop)
+        await run_in_threadpool(history_writer.stop)
+        await run_in_threadpool(tracer.flush)
+
+
+async def _validation_error_response(request: Request, exc: RequestValidationError) -> FastJSONResponse:
+    """422 for invalid request bodies, rendered with orjson so rejected NaN or infinite inputs echo as null"""
+    return FastJSONResponse({"detail": jsonable_encoder(exc.errors())}, status_code=422)
+
+
+def create_app() -> FastAPI:
+    """
+    Application factory
+    
+    Returns:
+        Configured FastAPI application
+    """
+    application = FastAPI(
+        title=settings.app_name,
+        version=settings.version,
+        description="Professional demo implementation of KPI algorithm optimization and revenue optimization AI pipeline",
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan
+    )
+    
+    # Admission control: bounded concurrency with per-route priorities
+    application.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        route_priorities=settings.ADMISSION_ROUTE_PRIORITIES,
+        degradable_routes=settings.ADMISSION_DEGRADABLE_ROUTES,
+        retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS
+    )
+    
+    # Add CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Request counts and latency per route (outermost, so shed requests are counted too)
+    application.add_middleware(MetricsMiddleware, mounts=["/static"])
+    
+    # Mount static files with content-fingerprinted URLs
+    application.mount(
+        "/static",
+        FingerprintedStaticFiles(directory="static", fingerprints=static_fingerprints),
+        name="static"
+    )
+    
+    application.add_exception_handler(RequestValidationError, _validation_error_response)
+    application.include_router(router)
+    return application
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
@@ -455,8 +1414,3 @@ if __name__ == "__main__":
         reload=True,
         log_level="info"
     )
-
-@app.get("/test-weights", response_class=HTMLResponse)
-async def test_weights():
-    """Test page for weights API"""
-    return FileResponse("templates/test_weights.html")
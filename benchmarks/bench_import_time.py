@@ -0,0 +1,125 @@
+"""
+Cold start benchmark: import, app factory and warm-up timings
+
+Each run starts a fresh interpreter, so module caches from previous runs do
+not hide import cost. Run from the repository root:
+
+    python -m benchmarks.bench_import_time --runs 5
+    python -m benchmarks.bench_import_time --max-import-seconds 1.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter; prints one JSON line of timings
+_PROBE = """
+import json, os, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+steps = app.warm_up()
+warmed = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "create_app_seconds": created - imported,
+    "warm_up_seconds": warmed - created,
+    "warm_up_steps": steps,
+}))
+"""
+
+
+def _probe_env() -> Dict[str, str]:
+    """Environment for the probe process (settings need these to load)"""
+    env = dict(os.environ)
+    env.setdefault("BASE_URL", "http://localhost:8000")
+    env.setdefault("API_HOST", "0.0.0.0")
+    env.setdefault("API_PORT", "8000")
+    return env
+
+
+def run_probe() -> Dict[str, Any]:
+    """
+    Time one cold start in a fresh interpreter
+
+    Returns:
+        Dictionary of timings in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=REPO_ROOT, env=_probe_env(), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def top_imports(limit: int = 15) -> List[Dict[str, Any]]:
+    """
+    List the modules with the largest cumulative import time for ``import app``
+
+    Args:
+        limit: Number of modules to return
+
+    Returns:
+        Modules sorted by cumulative import time (microseconds)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=REPO_ROOT, env=_probe_env(), capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        modules.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    modules.sort(key=lambda m: m["cumulative_us"], reverse=True)
+    return modules[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure application cold start time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter runs to take the median over")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--max-import-seconds", type=float, default=None,
+                        help="Exit non-zero if the median import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+    report = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("import_seconds", "create_app_seconds", "warm_up_seconds")
+    }
+    report["runs"] = args.runs
+    report["warm_up_steps"] = runs[-1]["warm_up_steps"]
+    report["top_imports"] = top_imports(args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Cold start (median of {args.runs} runs)")
+        print(f"  import app:    {report['import_seconds'] * 1000:8.1f} ms")
+        print(f"  create_app():  {report['create_app_seconds'] * 1000:8.1f} ms")
+        print(f"  warm_up():     {report['warm_up_seconds'] * 1000:8.1f} ms")
+        for step, seconds in report["warm_up_steps"].items():
+            print(f"    {step:<26}{seconds * 1000:8.1f} ms")
+        print("\nSlowest imports (cumulative)")
+        for module in report["top_imports"]:
+            print(f"  {module['cumulative_us'] / 1000:8.1f} ms  {module['module']}")
+
+    if args.max_import_seconds is not None and report["import_seconds"] > args.max_import_seconds:
+        print(f"\nFAIL: import time {report['import_seconds']:.3f}s exceeds {args.max_import_seconds:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
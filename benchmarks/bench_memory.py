@@ -0,0 +1,100 @@
+"""
+Memory benchmark: allocations per job stage against the allocation budget
+
+Runs a batch job over synthetic creators through the real job pipeline
+(job store, chunk processors, checkpointing) with JOBS_MEMORY_PROFILING on,
+then prints the per-stage report: peak and retained bytes per creator for
+ingest, scoring, recommendations and serialization, the top allocation
+sites, and peak RSS. "score" jobs use the vectorized batch scorer; "analyze"
+jobs stream every creator through the scalar scorers and the
+recommendation pipeline. Run from the repository root:
+
+    python -m benchmarks.bench_memory --kind analyze --creators 20000
+    python -m benchmarks.bench_memory --kind score --creators 200000 --chunk-size 10000
+    python -m benchmarks.bench_memory --budget budget.json --json memory_report.json
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Settings are read on first import of the app; keep benchmark state out of ./data
+_STATE_DIR = tempfile.mkdtemp(prefix="bench_memory_")
+atexit.register(shutil.rmtree, _STATE_DIR, ignore_errors=True)
+os.environ.setdefault("BASE_URL", "http://localhost:8000")
+os.environ.setdefault("API_HOST", "0.0.0.0")
+os.environ.setdefault("API_PORT", "8000")
+os.environ.setdefault("HISTORY_DB_PATH", os.path.join(_STATE_DIR, "history.sqlite3"))
+os.environ.setdefault("JOBS_DB_PATH", os.path.join(_STATE_DIR, "jobs.sqlite3"))
+os.environ.setdefault("JOBS_MAX_WORKERS", "1")  # tracemalloc is process-wide; one job at a time
+os.environ.setdefault("JOBS_POLL_INTERVAL_SECONDS", "0.1")
+os.environ["JOBS_MEMORY_PROFILING"] = "true"
+os.environ["JOBS_MEMORY_REPORT_DIR"] = os.path.join(_STATE_DIR, "memory")
+
+from benchmarks.synthetic import generate_records
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report per-stage memory use of a batch job against a budget")
+    parser.add_argument("--kind", choices=("score", "analyze"), default="score",
+                        help="Job kind: vectorized scores or per-creator analysis with recommendations")
+    parser.add_argument("--creators", type=int, default=20_000, help="Synthetic creators in the job")
+    parser.add_argument("--chunk-size", type=int, default=1_000, help="Creators per job chunk")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--budget", metavar="PATH",
+                        help="JSON file of stage -> peak bytes per creator (default: MEMORY_BUDGET_BYTES_PER_CREATOR)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    from app import history_writer, job_manager
+    from src.logger.logger import logger
+    from src.monitoring.memory import format_report
+
+    # Per-creator INFO logging would dominate the analyze pipeline
+    logger.setLevel(logging.WARNING)
+    if args.budget:
+        with open(args.budget) as f:
+            job_manager.memory_budget = json.load(f)
+
+    records = generate_records(args.creators, seed=args.seed)
+    history_writer.start()
+    job_manager.start()
+    try:
+        start = time.perf_counter()
+        job_id = job_manager.submit(args.kind, records, args.chunk_size)["job_id"]
+        del records
+        while job_manager.store.get_job(job_id)["status"] in ("queued", "running"):
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+        status = job_manager.store.get_job(job_id)["status"]
+    finally:
+        job_manager.stop()
+        history_writer.stop()
+
+    report = job_manager.memory_report(job_id)
+    if status != "completed" or report is None:
+        print(f"Job {job_id} ended as {status} without a memory report")
+        return 1
+
+    print(f"{args.kind} job, {args.creators:,} creators in chunks of {args.chunk_size:,} ({elapsed:.1f}s traced)\n")
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if not report["within_budget"]:
+        print(f"\nFAIL: over budget in {', '.join(report['over_budget'])}")
+        return 1
+    print("\nOK: every stage is within its budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
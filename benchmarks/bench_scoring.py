@@ -0,0 +1,297 @@
+"""
+Scoring benchmark: latency percentiles and throughput of the scoring pipeline
+
+Times, in-process on synthetic creators:
+
+- each scorer's calculate_score, calculate_overall_score,
+  generate_recommendations and the full /analyze handler (through the ASGI
+  app, no network) per record;
+- calculate_overall_score over batches of records, up to --max-scalar-size;
+- the vectorized BatchScorer, whole and per scorer, and the bulk input
+  validation (validate_columns), at batch sizes from 1 up to --max-size
+  (1M by default).
+
+Results can be saved as a baseline and later runs compared against it,
+failing when throughput drops by more than --max-regression. Baselines are
+only comparable on the same machine. Run from the repository root:
+
+    python -m benchmarks.bench_scoring --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_scoring --baseline benchmarks/baseline.json --max-regression 0.2
+    python -m benchmarks.bench_scoring --max-size 10000 --cases batch.score_columns
+"""
+
+import argparse
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+# Settings are read on first import of the app; keep benchmark state out of ./data
+_STATE_DIR = tempfile.mkdtemp(prefix="bench_scoring_")
+atexit.register(shutil.rmtree, _STATE_DIR, ignore_errors=True)
+os.environ.setdefault("BASE_URL", "http://localhost:8000")
+os.environ.setdefault("API_HOST", "0.0.0.0")
+os.environ.setdefault("API_PORT", "8000")
+os.environ.setdefault("HISTORY_DB_PATH", os.path.join(_STATE_DIR, "history.sqlite3"))
+os.environ.setdefault("JOBS_DB_PATH", os.path.join(_STATE_DIR, "jobs.sqlite3"))
+
+import numpy as np
+
+from benchmarks.synthetic import generate_columns, generate_records
+
+
+Result = Dict[str, Any]
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(durations: List[float], items: int) -> Result:
+    """
+    Summarize per-call durations
+
+    Args:
+        durations: Seconds per call
+        items: Records processed per call
+
+    Returns:
+        Latency percentiles (seconds) and throughput (records per second)
+    """
+    ordered = sorted(durations)
+    total = sum(durations)
+    return {
+        "size": items,
+        "runs": len(durations),
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1],
+        "throughput": items * len(durations) / total if total > 0 else float("inf"),
+    }
+
+
+def measure(call: Callable[[], Any], items: int, min_runs: int, min_seconds: float, max_runs: int) -> Result:
+    """
+    Time a call repeatedly until both min_runs and min_seconds are reached
+
+    Args:
+        call: Function under test
+        items: Records processed per call
+        min_runs: Minimum timed calls
+        min_seconds: Minimum total time
+        max_runs: Stop after this many calls even if min_seconds is not reached
+
+    Returns:
+        summarize() of the timings
+    """
+    call()  # Warm caches and lazy imports outside the timed runs
+    durations: List[float] = []
+    started = perf_counter()
+    while len(durations) < min_runs or (perf_counter() - started < min_seconds and len(durations) < max_runs):
+        start = perf_counter()
+        call()
+        durations.append(perf_counter() - start)
+    return summarize(durations, items)
+
+
+def batch_sizes(max_size: int) -> List[int]:
+    """Powers of ten from 1 up to max_size"""
+    sizes = []
+    size = 1
+    while size <= max_size:
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Result]:
+    """
+    Run every selected benchmark case
+
+    Args:
+        args: Parsed command line
+
+    Returns:
+        Case key ("name@size") -> result
+    """
+    from app import create_app, get_batch_scorer, get_kpi_orchestrator, get_recommendation_generator, warm_up
+    from src.ingestion.validation import validate_columns
+    from src.logger.logger import logger
+
+    # Per-call INFO logging would dominate the scalar timings
+    logger.setLevel(logging.WARNING)
+
+    records = generate_records(args.records, seed=args.seed)
+    columns = generate_columns(args.max_size, seed=args.seed)
+    orchestrator = get_kpi_orchestrator()
+    generator = get_recommendation_generator()
+    batch_scorer = get_batch_scorer()
+    timing = dict(min_runs=args.min_runs, min_seconds=args.min_seconds, max_runs=args.max_runs)
+
+    results: Dict[str, Result] = {}
+
+    def selected(name: str) -> bool:
+        return not args.cases or any(pattern in name for pattern in args.cases)
+
+    def run(name: str, call: Callable[[], Any], items: int) -> None:
+        if not selected(name):
+            return
+        result = measure(call, items, **timing)
+        results[f"{name}@{items}"] = result
+        print_result(name, result)
+
+    def cycle() -> Iterator[Dict[str, Any]]:
+        return itertools.cycle(records)
+
+    # Per-record latency of the scalar pipeline
+    for scorer_name, scorer in orchestrator.scorers.items():
+        source = cycle()
+        run(f"scalar.{scorer_name}", lambda scorer=scorer, source=source: scorer.calculate_score(next(source)), 1)
+    source = cycle()
+    run("scalar.calculate_overall_score", lambda: orchestrator.calculate_overall_score(next(source)), 1)
+    source = cycle()
+    run("scalar.generate_recommendations", lambda: generator.generate_recommendations(next(source)), 1)
+
+    if selected("handler.analyze"):
+        application = create_app()
+        warm_up()
+        result = asyncio.run(_measure_analyze(application, records, **timing))
+        results["handler.analyze@1"] = result
+        print_result("handler.analyze", result)
+
+    # Scalar throughput over batches of records
+    for size in batch_sizes(min(args.max_scalar_size, len(records))):
+        batch = records[:size]
+        run("scalar_batch.calculate_overall_score",
+            lambda batch=batch: [orchestrator.calculate_overall_score(record) for record in batch], size)
+
+    # Vectorized scoring
+    creator_ids = np.char.add("creator_", np.arange(args.max_size).astype(str))
+    for size in batch_sizes(args.max_size):
+        batch = {name: values[:size] for name, values in columns.items()}
+        run("bulk.validate_columns",
+            lambda batch=batch, size=size: validate_columns({"creator_id": creator_ids[:size], **batch}), size)
+        run("batch.score_columns", lambda batch=batch: batch_scorer.score_columns(batch), size)
+        for scorer_name in orchestrator.scorers:
+            run(f"batch.{scorer_name}",
+                lambda batch=batch, scorer_name=scorer_name: batch_scorer.score_scorer(scorer_name, batch), size)
+
+    return results
+
+
+async def _measure_analyze(application: Any, records: List[Dict[str, Any]], min_runs: int, min_seconds: float,
+                           max_runs: int) -> Result:
+    """Time POST /analyze through the ASGI app, one request at a time"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        source = itertools.cycle(records)
+        response = await client.post("/analyze", json=next(source))
+        response.raise_for_status()
+
+        durations: List[float] = []
+        started = perf_counter()
+        while len(durations) < min_runs or (perf_counter() - started < min_seconds and len(durations) < max_runs):
+            record = next(source)
+            start = perf_counter()
+            response = await client.post("/analyze", json=record)
+            durations.append(perf_counter() - start)
+            response.raise_for_status()
+    return summarize(durations, 1)
+
+
+def print_result(name: str, result: Result) -> None:
+    """Print one result row"""
+    print(
+        f"{name:<44}{result['size']:>9} {result['p50'] * 1000:10.3f} {result['p95'] * 1000:10.3f} "
+        f"{result['p99'] * 1000:10.3f} {result['throughput']:>14,.0f}",
+        flush=True
+    )
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, Result], max_regression: float) -> List[str]:
+    """
+    Find cases whose throughput dropped by more than max_regression
+
+    Args:
+        results: Current results
+        baseline: Baseline results
+        max_regression: Allowed relative throughput drop (0.2 = 20%)
+
+    Returns:
+        Descriptions of regressed cases
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None or not reference["throughput"]:
+            continue
+        change = result["throughput"] / reference["throughput"] - 1.0
+        if change < -max_regression:
+            regressions.append(
+                f"{key}: {result['throughput']:,.0f}/s vs baseline {reference['throughput']:,.0f}/s ({change:+.1%})"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scorers, orchestrator, recommendations and /analyze")
+    parser.add_argument("--cases", nargs="*", default=[], help="Only run cases whose name contains one of these")
+    parser.add_argument("--max-size", type=int, default=1_000_000, help="Largest vectorized batch size")
+    parser.add_argument("--max-scalar-size", type=int, default=1_000, help="Largest scalar batch size")
+    parser.add_argument("--records", type=int, default=1_000, help="Distinct synthetic records for scalar cases")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--min-runs", type=int, default=5, help="Minimum timed calls per case")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Minimum timed seconds per case")
+    parser.add_argument("--max-runs", type=int, default=20_000, help="Maximum timed calls per case")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results to this baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against this baseline file")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Exit non-zero if any case's throughput drops by more than this fraction")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    print(f"{'case':<44}{'size':>9} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'records/s':>14}")
+    results = run_benchmarks(args)
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": results,
+    }
+    for path in filter(None, (args.save_baseline, args.json)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} case(s) regressed by more than {args.max_regression:.0%}")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nOK: no case regressed by more than {args.max_regression:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,475 @@
+"""
+Differential check of fast scoring paths against the scalar scorers
+
+Every scorer's calculate_score and get_components (the reference) are run
+on the same inputs as each registered fast path, and the maximum absolute
+difference per scorer and per component is reported. KPIOrchestrator's
+overall, revenue focus and tier scores and the performance levels are
+compared on a sample.
+
+Inputs mix realistic synthetic creators, uniform values over wide ranges
+and adversarial rows. Each field of an adversarial row is drawn from values
+the scalar code special-cases or that break naive vectorization:
+- zeros of either sign (video_duration == 0, empty interaction totals);
+- values at and around the max(cost, 0.01) and max(cost, 0.001) guards;
+- targets equal to zero (empty normalize_score ranges);
+- values far outside the clamped ranges;
+- subnormals, NaN and infinities;
+- missing fields, which fall back to METRIC_DEFAULTS in the batch path and
+  to the scorers' own .get() defaults in the scalar path.
+
+The scalar reference is the slow side. Each scorer only sees the fields it
+reads, and rows are split across worker processes. Run from the
+repository root:
+
+    python -m benchmarks.equivalence --count 1000000
+    python -m benchmarks.equivalence --count 200000 --adversarial 0.5 --tolerance 1e-12 --json equivalence.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+os.environ.setdefault("BASE_URL", "http://localhost:8000")
+os.environ.setdefault("API_HOST", "0.0.0.0")
+os.environ.setdefault("API_PORT", "8000")
+
+import numpy as np
+
+from benchmarks.synthetic import generate_columns
+from src.config.metric_value_ranges import METRIC_DEFAULTS
+
+
+# Scorer name -> (score, component name -> values) for every row
+ScorerResults = Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]
+Implementation = Callable[[Dict[str, np.ndarray]], ScorerResults]
+
+# Values every field of an adversarial row is drawn from
+ADVERSARIAL_VALUES: Sequence[float] = (
+    0.0, -0.0, 1.0, -1.0, 0.5, 0.1, 0.3, 0.6, 2.0, 5.0, 100.0,
+    0.01, 0.0099999, 0.0100001, 0.001, 0.0009999, 0.0010001,  # max() guards in the cost scorer
+    1e-300, 5e-324, -5e-324, 1e300, -1e300,
+    float("nan"), float("inf"), float("-inf"),
+)
+
+MISSING_RATE = 0.1  # Fraction of adversarial fields left out entirely
+
+
+def _batch(columns: Dict[str, np.ndarray]) -> ScorerResults:
+    """The vectorized BatchScorer"""
+    from app import get_batch_scorer
+    result = get_batch_scorer().score_columns(columns, include_components=True)
+    return {name: (score, result["components"][name]) for name, score in result["individual_scores"].items()}
+
+
+# Fast paths checked against the scalar scorers
+IMPLEMENTATIONS: Dict[str, Implementation] = {
+    "batch": _batch,
+}
+
+
+class _FieldRecorder(dict):
+    """Dictionary remembering which keys were read"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read = []
+
+    def get(self, key, default=None):
+        self.read.append(key)
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        self.read.append(key)
+        return super().__getitem__(key)
+
+
+def scorer_fields(orchestrator: Any) -> Dict[str, List[str]]:
+    """
+    Find the input fields each scorer reads
+
+    Args:
+        orchestrator: KPIOrchestrator
+
+    Returns:
+        Scorer name -> fields read by calculate_score or get_components, in first-read order
+    """
+    fields = {}
+    for name, scorer in orchestrator.scorers.items():
+        data = _FieldRecorder(METRIC_DEFAULTS)
+        scorer.calculate_score(data)
+        scorer.get_components(data)
+        fields[name] = [field for field in dict.fromkeys(data.read) if field in METRIC_DEFAULTS]
+    return fields
+
+
+def generate_cases(count: int, adversarial: float, seed: int) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Generate test inputs
+
+    Args:
+        count: Rows
+        adversarial: Fraction of adversarial rows; the rest is split between
+            realistic synthetic creators and uniform values over wide ranges
+        seed: Random seed
+
+    Returns:
+        (metric name -> values, metric name -> mask of rows where the field is missing)
+    """
+    rng = np.random.default_rng(seed)
+    columns = generate_columns(count, seed=seed)
+    kind = rng.random(count)
+    adversarial_rows = kind < adversarial
+    uniform_rows = (kind >= adversarial) & (kind < adversarial + (1.0 - adversarial) / 2)
+    special = np.array(ADVERSARIAL_VALUES)
+    missing = {}
+    for name, values in columns.items():
+        values[uniform_rows] = rng.uniform(-2.0, 3.0, int(uniform_rows.sum())) * 10.0 ** rng.integers(
+            -3, 6, int(uniform_rows.sum())
+        )
+        values[adversarial_rows] = special[rng.integers(0, special.size, int(adversarial_rows.sum()))]
+        missing[name] = adversarial_rows & (rng.random(count) < MISSING_RATE)
+    return columns, missing
+
+
+def _reference_chunk(task: Tuple[str, List[str], List[np.ndarray], List[np.ndarray]]
+                     ) -> Tuple[np.ndarray, Dict[str, np.ndarray], int]:
+    """
+    Run one scorer's scalar calculate_score and get_components over rows
+
+    Args:
+        task: (scorer name, fields, per-field values, per-field missing masks)
+
+    Returns:
+        (scores, component name -> values, rows where the scalar code raised)
+    """
+    name, fields, columns, masks = task
+    scorer = _orchestrator().scorers[name]
+    # The scalar code sees Python floats, as it does behind the API
+    values = [column.tolist() for column in columns]
+    dropped: Dict[int, List[str]] = {}
+    for field, mask in zip(fields, masks):
+        for i in compress(range(len(mask)), mask.tolist()):
+            dropped.setdefault(i, []).append(field)
+
+    scores: List[float] = []
+    components: Optional[Dict[str, List[float]]] = None
+    failures = 0
+    nan = float("nan")
+    for i, row in enumerate(zip(*values)):
+        data = dict(zip(fields, row))
+        for field in dropped.get(i, ()):
+            del data[field]
+        scores.append(scorer.calculate_score(data))
+        try:
+            parts = scorer.get_components(data)
+        except Exception:
+            failures += 1
+            parts = {}
+        if components is None and parts:
+            # Every row reports the same components; rows before the first success have none
+            components = {component: [nan] * i for component in parts}
+        if components is not None:
+            for component, column in components.items():
+                column.append(parts.get(component, nan))
+    return (
+        np.array(scores, dtype=np.float64),
+        {component: np.array(column, dtype=np.float64) for component, column in (components or {}).items()},
+        failures,
+    )
+
+
+_cached_orchestrator = None
+
+
+def _orchestrator():
+    """KPIOrchestrator of this process, with per-call logging silenced"""
+    global _cached_orchestrator
+    if _cached_orchestrator is None:
+        from app import get_kpi_orchestrator
+        from src.logger.logger import logger
+        logger.setLevel(logging.CRITICAL)  # Scorers log every swallowed exception
+        _cached_orchestrator = get_kpi_orchestrator()
+    return _cached_orchestrator
+
+
+def run_reference(columns: Dict[str, np.ndarray], missing: Dict[str, np.ndarray], fields: Dict[str, List[str]],
+                  workers: int, chunk_size: int = 50_000) -> Tuple[ScorerResults, Dict[str, int]]:
+    """
+    Run the scalar scorers over every row
+
+    Args:
+        columns: Metric name -> values
+        missing: Metric name -> missing mask
+        fields: Scorer name -> fields it reads
+        workers: Worker processes (1 runs in this process)
+        chunk_size: Rows per task
+
+    Returns:
+        (scorer results, scorer name -> rows where get_components raised)
+    """
+    count = len(next(iter(columns.values())))
+    tasks, owners = [], []
+    for name, names in fields.items():
+        for start in range(0, count, chunk_size):
+            end = min(count, start + chunk_size)
+            tasks.append((
+                name, names,
+                [columns[field][start:end] for field in names],
+                [missing[field][start:end] for field in names],
+            ))
+            owners.append(name)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_reference_chunk, tasks))
+    else:
+        outputs = [_reference_chunk(task) for task in tasks]
+
+    results: ScorerResults = {}
+    failures: Dict[str, int] = {}
+    partial: Dict[str, List[Tuple[np.ndarray, Dict[str, np.ndarray]]]] = {}
+    for name, (scores, components, failed) in zip(owners, outputs):
+        partial.setdefault(name, []).append((scores, components))
+        failures[name] = failures.get(name, 0) + failed
+    for name, chunks in partial.items():
+        component_names = dict.fromkeys(component for _, components in chunks for component in components)
+        results[name] = (
+            np.concatenate([scores for scores, _ in chunks]),
+            {
+                component: np.concatenate([
+                    components[component] if component in components else np.full(scores.size, np.nan)
+                    for scores, components in chunks
+                ])
+                for component in component_names
+            },
+        )
+    return results, failures
+
+
+def compare_arrays(expected: np.ndarray, actual: np.ndarray) -> Tuple[float, int, Optional[int]]:
+    """
+    Compare two result arrays, treating NaN as equal to NaN and equal infinities as equal
+
+    Args:
+        expected: Reference values
+        actual: Values under test
+
+    Returns:
+        (maximum absolute difference, rows differing at all, index of the worst row or None)
+    """
+    with np.errstate(invalid="ignore"):
+        difference = np.abs(expected - actual)
+    same = (expected == actual) | (np.isnan(expected) & np.isnan(actual))
+    difference[same] = 0.0
+    difference[np.isnan(difference)] = np.inf  # One side NaN, or opposite infinities
+    mismatched = int(np.count_nonzero(difference))
+    if not mismatched:
+        return 0.0, 0, None
+    worst = int(np.argmax(difference))
+    return float(difference[worst]), mismatched, worst
+
+
+def _row(columns: Dict[str, np.ndarray], missing: Dict[str, np.ndarray], fields: Sequence[str],
+         index: int) -> Dict[str, Any]:
+    """Inputs of one row for a report, with missing fields marked"""
+    return {field: "missing" if missing[field][index] else repr(float(columns[field][index])) for field in fields}
+
+
+def compare_scorers(reference: ScorerResults, candidate: ScorerResults, columns: Dict[str, np.ndarray],
+                    missing: Dict[str, np.ndarray], fields: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Compare a fast path's scores and components with the reference
+
+    Args:
+        reference: Scalar results
+        candidate: Fast path results
+        columns: Inputs
+        missing: Missing masks
+        fields: Scorer name -> fields it reads
+
+    Returns:
+        Scorer name -> score and per-component differences, worst inputs included
+    """
+    report = {}
+    for name, (expected_score, expected_components) in reference.items():
+        actual_score, actual_components = candidate[name]
+        entries = {"score": (expected_score, actual_score)}
+        for component, values in actual_components.items():
+            if component in expected_components:
+                entries[component] = (expected_components[component], values)
+        scorer_report: Dict[str, Any] = {"components": {}}
+        for key, (expected, actual) in entries.items():
+            max_difference, mismatched, worst = compare_arrays(expected, np.broadcast_to(actual, expected.shape))
+            entry = {"max_abs_diff": max_difference, "mismatched_rows": mismatched}
+            if worst is not None:
+                entry["worst"] = {
+                    "row": worst,
+                    "expected": repr(float(expected[worst])),
+                    "actual": repr(float(np.broadcast_to(actual, expected.shape)[worst])),
+                    "inputs": _row(columns, missing, fields[name], worst),
+                }
+            if key == "score":
+                scorer_report.update(entry)
+            else:
+                scorer_report["components"][key] = entry
+        # Components the scalar scorer reports but the fast path does not (raw input echoes)
+        scorer_report["unchecked_components"] = sorted(expected_components.keys() - actual_components.keys())
+        report[name] = scorer_report
+    return report
+
+
+def compare_overall(columns: Dict[str, np.ndarray], missing: Dict[str, np.ndarray], sample: int,
+                    seed: int) -> Dict[str, Any]:
+    """
+    Compare KPIOrchestrator.calculate_overall_score with the batch totals on a sample of rows
+
+    Args:
+        columns: Inputs
+        missing: Missing masks
+        sample: Rows to compare
+        seed: Sampling seed
+
+    Returns:
+        Differences for overall_score, revenue_focus_score, each tier and performance levels
+    """
+    from app import get_batch_scorer
+    from src.processors.batch_scorer import PERFORMANCE_LEVELS
+
+    count = len(next(iter(columns.values())))
+    rows = np.sort(np.random.default_rng(seed).choice(count, size=min(sample, count), replace=False))
+    filled = {name: np.where(missing[name], METRIC_DEFAULTS[name], values)[rows] for name, values in columns.items()}
+    batch = get_batch_scorer().score_columns(filled)
+
+    orchestrator = _orchestrator()
+    expected: Dict[str, List[float]] = {"overall_score": [], "revenue_focus_score": [],
+                                        "tier_1": [], "tier_2": [], "tier_3": []}
+    level_mismatches = 0
+    for i, row in enumerate(rows.tolist()):
+        data = {name: float(values[row]) for name, values in columns.items() if not missing[name][row]}
+        result = orchestrator.calculate_overall_score(data)
+        expected["overall_score"].append(result["overall_score"])
+        expected["revenue_focus_score"].append(result.get("revenue_focus_score", np.nan))
+        for tier in ("tier_1", "tier_2", "tier_3"):
+            expected[tier].append(result.get("tier_scores", {}).get(tier, np.nan))
+        for name, level in result.get("performance_levels", {}).items():
+            level_mismatches += level != PERFORMANCE_LEVELS[batch["performance_levels"][name][i]]
+
+    actual = {
+        "overall_score": batch["overall_score"],
+        "revenue_focus_score": batch["revenue_focus_score"],
+        **batch["tier_scores"],
+    }
+    report: Dict[str, Any] = {"rows": int(rows.size), "performance_level_mismatches": int(level_mismatches)}
+    for key, values in expected.items():
+        max_difference, mismatched, _ = compare_arrays(np.array(values, dtype=np.float64), actual[key])
+        report[key] = {"max_abs_diff": max_difference, "mismatched_rows": mismatched}
+    return report
+
+
+def print_report(name: str, report: Dict[str, Any], failures: Dict[str, int]) -> None:
+    """Print one fast path's differences per scorer and component"""
+    print(f"\n{name}: maximum absolute difference vs scalar scorers")
+    print(f"{'scorer / component':<48}{'max abs diff':>16}{'rows':>10}")
+    def worst(entry: Dict[str, Any]) -> None:
+        if "worst" in entry:
+            case = entry["worst"]
+            print(f"      worst row {case['row']}: expected {case['expected']}, got {case['actual']}, "
+                  f"inputs {case['inputs']}")
+
+    for scorer, entry in report["scorers"].items():
+        print(f"{scorer:<48}{entry['max_abs_diff']:>16.3g}{entry['mismatched_rows']:>10}")
+        worst(entry)
+        for component, component_entry in entry["components"].items():
+            print(f"  {component:<46}{component_entry['max_abs_diff']:>16.3g}{component_entry['mismatched_rows']:>10}")
+            worst(component_entry)
+        if failures.get(scorer):
+            print(f"  (scalar get_components raised on {failures[scorer]} rows)")
+    overall = report.get("overall")
+    if overall:
+        print(f"\noverall ({overall['rows']} sampled rows, "
+              f"{overall['performance_level_mismatches']} performance level mismatches)")
+        for key in ("overall_score", "revenue_focus_score", "tier_1", "tier_2", "tier_3"):
+            print(f"  {key:<46}{overall[key]['max_abs_diff']:>16.3g}{overall[key]['mismatched_rows']:>10}")
+
+
+def _max_difference(report: Dict[str, Any]) -> float:
+    """Largest difference anywhere in a fast path's report"""
+    values = []
+    for entry in report["scorers"].values():
+        values.append(entry["max_abs_diff"])
+        values.extend(component["max_abs_diff"] for component in entry["components"].values())
+    overall = report.get("overall")
+    if overall:
+        values.extend(overall[key]["max_abs_diff"] for key in ("overall_score", "revenue_focus_score",
+                                                               "tier_1", "tier_2", "tier_3"))
+        if overall["performance_level_mismatches"]:
+            values.append(float("inf"))
+    return max(values, default=0.0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check fast scoring paths against the scalar scorers")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Rows to compare")
+    parser.add_argument("--adversarial", type=float, default=0.3, help="Fraction of adversarial rows")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--implementations", nargs="*", default=list(IMPLEMENTATIONS),
+                        help=f"Fast paths to check (default: all of {', '.join(IMPLEMENTATIONS)})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes running the scalar reference")
+    parser.add_argument("--overall-sample", type=int, default=20_000,
+                        help="Rows compared against KPIOrchestrator.calculate_overall_score")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Exit non-zero if any difference exceeds this (0: bit-identical)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report, with worst-case inputs, as JSON")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.implementations if name not in IMPLEMENTATIONS]
+    if unknown:
+        parser.error(f"Unknown implementations: {', '.join(unknown)}")
+
+    started = perf_counter()
+    columns, missing = generate_cases(args.count, args.adversarial, args.seed)
+    fields = scorer_fields(_orchestrator())
+    reference, failures = run_reference(columns, missing, fields, args.workers)
+    reference_seconds = perf_counter() - started
+    print(f"{args.count:,} rows ({args.adversarial:.0%} adversarial), scalar reference in {reference_seconds:.1f}s "
+          f"on {args.workers} worker(s)")
+
+    filled = {name: np.where(missing[name], METRIC_DEFAULTS[name], values) for name, values in columns.items()}
+    reports = {}
+    failed = []
+    for name in args.implementations:
+        implementation = IMPLEMENTATIONS[name]
+        start = perf_counter()
+        candidate = implementation(filled)
+        seconds = perf_counter() - start
+        report = {"seconds": seconds, "scorers": compare_scorers(reference, candidate, columns, missing, fields)}
+        if name == "batch" and args.overall_sample > 0:
+            report["overall"] = compare_overall(columns, missing, args.overall_sample, args.seed)
+        reports[name] = report
+        print_report(f"{name} ({seconds:.2f}s)", report, failures)
+        if _max_difference(report) > args.tolerance:
+            failed.append(name)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"count": args.count, "adversarial": args.adversarial, "seed": args.seed,
+                       "scalar_failures": failures, "implementations": reports}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if failed:
+        print(f"\nFAIL: {', '.join(failed)} differ from the scalar scorers by more than {args.tolerance:g}")
+        return 1
+    print(f"\nOK: every implementation matches the scalar scorers within {args.tolerance:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+HTTP load generator: latency percentiles, throughput and errors under concurrency
+
+Drives /analyze, /compare-algorithms and /jobs on a running server with
+synthetic creators, over pooled keep-alive connections. Two arrival modes:
+
+- closed loop (--concurrency N): N clients each send the next request as
+  soon as the previous one returns, measuring capacity;
+- open loop (--rate R): requests arrive at R per second (Poisson or
+  constant spacing) whether or not earlier ones have returned, measuring
+  latency at a given load. Latency counts from the scheduled arrival, so a
+  stalled server is not hidden by a stalled client.
+
+Run from the repository root against a running server:
+
+    python -m benchmarks.load_test --concurrency 32 --duration 30
+    python -m benchmarks.load_test --rate 200 --duration 60 --mix analyze=8 compare=1 jobs=1
+    python -m benchmarks.load_test --rate 500 --max-error-rate 0.01 --max-p99-ms 250
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from collections import Counter, defaultdict
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic import generate_records
+from src.utils.lazy_imports import optional_import
+
+# HTTP client, a development dependency (requirements-dev.txt)
+httpx = optional_import("httpx")
+
+
+# Endpoint name -> path; every endpoint takes a JSON POST
+ENDPOINTS: Dict[str, str] = {
+    "analyze": "/analyze",
+    "compare": "/compare-algorithms",
+    "jobs": "/jobs",
+}
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint, ignoring requests started during warm-up"""
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+        self.first_start: Optional[float] = None
+        self.last_end = 0.0
+
+    def record(self, endpoint: str, started: float, outcome: Optional[str]) -> None:
+        """
+        Record one request
+
+        Args:
+            endpoint: Endpoint name
+            started: Scheduled (open loop) or actual (closed loop) start time
+            outcome: None on success, otherwise the error (status code or exception name)
+        """
+        if started < self.measure_from:
+            return
+        ended = perf_counter()
+        if self.first_start is None or started < self.first_start:
+            self.first_start = started
+        self.last_end = max(self.last_end, ended)
+        self.latencies[endpoint].append(ended - started)
+        if outcome is not None:
+            self.errors[endpoint][outcome] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded requests
+
+        Returns:
+            Per-endpoint and total request counts, error rates, throughput and
+            latency percentiles (milliseconds)
+        """
+        elapsed = max(self.last_end - (self.first_start or 0.0), 1e-9)
+
+        def summary(latencies: List[float], errors: Counter) -> Dict[str, Any]:
+            values = np.array(latencies) * 1000.0
+            failed = sum(errors.values())
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) if values.size else (0.0, 0.0, 0.0)
+            return {
+                "requests": len(latencies),
+                "errors": failed,
+                "error_rate": failed / len(latencies) if latencies else 0.0,
+                "throughput": len(latencies) / elapsed,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(values.max()) if values.size else 0.0,
+                "error_breakdown": dict(errors),
+            }
+
+        endpoints = {name: summary(self.latencies[name], self.errors[name]) for name in sorted(self.latencies)}
+        all_errors = sum(self.errors.values(), Counter())
+        total = summary([latency for name in self.latencies for latency in self.latencies[name]], all_errors)
+        return {"elapsed_seconds": elapsed, "endpoints": endpoints, "total": total}
+
+
+def build_payloads(endpoints: Sequence[str], pool_size: int, job_size: int, seed: int) -> Dict[str, List[bytes]]:
+    """
+    Pre-encode request bodies so the client spends its time sending, not serializing
+
+    Args:
+        endpoints: Endpoint names in the mix
+        pool_size: Distinct creators to draw payloads from
+        job_size: Creators per /jobs submission
+        seed: Synthetic data seed
+
+    Returns:
+        Endpoint name -> encoded bodies
+    """
+    records = generate_records(pool_size, seed=seed)
+    payloads: Dict[str, List[bytes]] = {}
+    for endpoint in endpoints:
+        if endpoint == "jobs":
+            payloads[endpoint] = [
+                json.dumps({"kind": "score", "creators": records[start:start + job_size]}).encode()
+                for start in range(0, max(1, len(records) - job_size + 1), job_size)
+            ]
+        else:
+            payloads[endpoint] = [json.dumps(record).encode() for record in records]
+    return payloads
+
+
+async def send(client: "httpx.AsyncClient", recorder: Recorder, endpoint: str, body: bytes, started: float) -> None:
+    """Send one request and record its outcome"""
+    try:
+        response = await client.post(ENDPOINTS[endpoint], content=body,
+                                     headers={"Content-Type": "application/json"})
+        await response.aread()
+        outcome = None if response.is_success else str(response.status_code)
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    recorder.record(endpoint, started, outcome)
+
+
+async def closed_loop(client: "httpx.AsyncClient", recorder: Recorder, choose, concurrency: int,
+                      deadline: float) -> None:
+    """Run concurrency clients back to back until the deadline"""
+    async def worker() -> None:
+        while perf_counter() < deadline:
+            endpoint, body = choose()
+            await send(client, recorder, endpoint, body, perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(client: "httpx.AsyncClient", recorder: Recorder, choose, rate: float, poisson: bool,
+                    max_in_flight: int, deadline: float, rng: random.Random) -> None:
+    """Start requests at the given arrival rate until the deadline"""
+    in_flight: set = set()
+    scheduled = perf_counter()
+    while scheduled < deadline:
+        delay = scheduled - perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint, body = choose()
+        if len(in_flight) >= max_in_flight:
+            # The client itself is saturated; count the arrival as failed rather than delay it
+            recorder.record(endpoint, scheduled, "client_saturated")
+        else:
+            task = asyncio.create_task(send(client, recorder, endpoint, body, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        scheduled += rng.expovariate(rate) if poisson else 1.0 / rate
+    if in_flight:
+        await asyncio.wait(in_flight)
+
+
+def parse_mix(items: Sequence[str]) -> Tuple[List[str], List[float]]:
+    """Parse name=weight items into endpoint names and weights"""
+    names, weights = [], []
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        names.append(name)
+        weights.append(float(weight or 1.0))
+    return names, weights
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the load test and return the report"""
+    names, weights = parse_mix(args.mix)
+    payloads = build_payloads(names, args.pool, args.job_size, args.seed)
+    rng = random.Random(args.seed)
+
+    def choose() -> Tuple[str, bytes]:
+        endpoint = rng.choices(names, weights)[0]
+        return endpoint, rng.choice(payloads[endpoint])
+
+    connections = args.connections or (args.concurrency if args.rate is None else args.max_in_flight)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        start = perf_counter()
+        recorder = Recorder(measure_from=start + args.warmup)
+        deadline = start + args.warmup + args.duration
+        if args.rate is None:
+            await closed_loop(client, recorder, choose, args.concurrency, deadline)
+        else:
+            await open_loop(client, recorder, choose, args.rate, args.arrival == "poisson",
+                            args.max_in_flight, deadline, rng)
+
+    report = recorder.report()
+    report["config"] = {
+        "url": args.url,
+        "mode": "closed" if args.rate is None else "open",
+        "concurrency": args.concurrency if args.rate is None else None,
+        "rate": args.rate,
+        "arrival": args.arrival if args.rate is not None else None,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "mix": dict(zip(names, weights)),
+        "connections": connections,
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report as a table"""
+    config = report["config"]
+    load = f"concurrency {config['concurrency']}" if config["mode"] == "closed" else \
+        f"{config['rate']:g} req/s ({config['arrival']})"
+    print(f"{config['url']}: {config['mode']} loop, {load}, {report['elapsed_seconds']:.1f}s measured\n")
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'err %':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        print(f"{name:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['error_rate'] * 100:>8.2f}"
+              f"{stats['throughput']:>10.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    for name, stats in report["endpoints"].items():
+        if stats["error_breakdown"]:
+            errors = ", ".join(f"{error}: {count}" for error, count in sorted(stats["error_breakdown"].items()))
+            print(f"  {name} errors: {errors}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test /analyze, /compare-algorithms and /jobs")
+    parser.add_argument("--url", default=os.environ.get("BASE_URL", "http://localhost:8000"), help="Server URL")
+    parser.add_argument("--mix", nargs="+", default=["analyze=1"],
+                        help="Endpoints and relative weights, e.g. analyze=8 compare=1 jobs=1")
+    parser.add_argument("--concurrency", type=int, default=16, help="Closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, default=None, help="Open loop: arrivals per second")
+    parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson",
+                        help="Open loop: arrival process")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Open loop: arrivals beyond this many outstanding requests count as errors")
+    parser.add_argument("--connections", type=int, default=None,
+                        help="Keep-alive connection pool size (default: concurrency or max in-flight)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--pool", type=int, default=10_000, help="Distinct synthetic creators in payloads")
+    parser.add_argument("--job-size", type=int, default=100, help="Creators per /jobs submission")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data and arrival seed")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    parser.add_argument("--max-error-rate", type=float, default=None,
+                        help="Exit non-zero if the total error rate exceeds this fraction")
+    parser.add_argument("--max-p99-ms", type=float, default=None,
+                        help="Exit non-zero if the total p99 latency exceeds this")
+    args = parser.parse_args()
+    if httpx is None:
+        raise SystemExit("The load test needs httpx: pip install -r requirements-dev.txt")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    total = report["total"]
+    failures = []
+    if args.max_error_rate is not None and total["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {total['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+    if args.max_p99_ms is not None and total["p99_ms"] > args.max_p99_ms:
+        failures.append(f"p99 {total['p99_ms']:.1f} ms exceeds {args.max_p99_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
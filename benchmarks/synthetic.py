@@ -0,0 +1,319 @@
+"""
+Synthetic creator populations for benchmarks, load tests and batch tests
+
+Creators are generated from a few latent traits (content quality, commerce
+skill, virality, audience size) plus noise, so related metrics move
+together: conversion rate is right-skewed and drives revenue and cost per
+acquisition, watch time follows video duration and quality, reach scales
+with audience size. Marginals follow typical TikTok Shop shapes, e.g.
+cart_abandonment_rate around 0.7 and conversion rates of about 1%.
+
+Generation is vectorized and seeded. Creators are produced in fixed-size
+chunks, each drawn from its own (seed, chunk) stream, so the first k
+creators are the same for any population size and populations of any size
+can be streamed to disk. Run from the repository root:
+
+    python -m benchmarks.synthetic --count 1000000 --format csv --output creators.csv
+    python -m benchmarks.synthetic --count 5000000 --format parquet --output creators.parquet --seed 7
+    python -m benchmarks.synthetic --count 100000 --format npz --output creators.npz
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.config.metric_value_ranges import METRIC_DEFAULTS
+from src.utils.lazy_imports import optional_import
+
+
+# Creators per generated chunk (the unit of reproducibility and streaming)
+CHUNK_SIZE = 100_000
+
+FORMATS = ("csv", "jsonl", "parquet", "npz")
+
+# Niche shares and typical average order value
+NICHES: Dict[str, Dict[str, float]] = {
+    "beauty": {"share": 0.18, "aov": 32.0},
+    "fashion": {"share": 0.17, "aov": 45.0},
+    "lifestyle": {"share": 0.12, "aov": 38.0},
+    "food": {"share": 0.10, "aov": 22.0},
+    "fitness": {"share": 0.09, "aov": 48.0},
+    "tech": {"share": 0.08, "aov": 85.0},
+    "gaming": {"share": 0.07, "aov": 55.0},
+    "home": {"share": 0.07, "aov": 42.0},
+    "pets": {"share": 0.06, "aov": 30.0},
+    "education": {"share": 0.06, "aov": 60.0},
+}
+
+Population = Dict[str, np.ndarray]
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _chunk(seed: int, index: int) -> Population:
+    """Generate one chunk of CHUNK_SIZE creators"""
+    n = CHUNK_SIZE
+    rng = np.random.default_rng([seed, index])
+    normal = lambda scale=1.0: rng.normal(0.0, scale, n)
+
+    # Latent traits
+    quality = normal()
+    commerce = 0.4 * quality + normal(0.9)
+    virality = 0.5 * quality + normal(0.85)
+    log_followers = np.clip(rng.normal(4.2, 0.8, n) + 0.3 * virality, 2.0, 7.5)  # log10 followers
+
+    niche_names = list(NICHES)
+    niche_index = rng.choice(len(niche_names), size=n, p=[NICHES[name]["share"] for name in niche_names])
+    niche_aov = np.array([NICHES[name]["aov"] for name in niche_names])[niche_index]
+
+    unit = lambda *terms, noise=0.7, bias=0.0: _sigmoid(bias + sum(terms) + normal(noise))
+    columns: Population = {}
+
+    # Sales
+    conversion_rate = np.clip(np.exp(np.log(0.012) + 0.45 * commerce + normal(0.5)), 0.0005, 0.35)
+    avg_order_value = np.clip(niche_aov * np.exp(normal(0.45)), 3.0, 2000.0)
+    followers = 10.0 ** log_followers
+    total_reach = followers * np.exp(0.4 * virality + normal(0.6))
+    orders = total_reach * 0.02 * conversion_rate * np.exp(normal(0.3))
+    columns["conversion_rate"] = conversion_rate
+    columns["total_revenue"] = np.round(orders * avg_order_value, 2)
+    columns["avg_order_value"] = np.round(avg_order_value, 2)
+    columns["target_revenue"] = np.choose(
+        np.digitize(log_followers, [4.0, 5.0, 6.0]), [5000.0, 10000.0, 25000.0, 50000.0]
+    )
+    columns["target_aov"] = np.round(niche_aov * 1.1, 2)
+
+    # Shop conversion
+    columns["funnel_completion_rate"] = unit(0.6 * commerce, bias=-1.4, noise=0.5)
+    columns["cart_abandonment_rate"] = np.clip(rng.beta(7.0, 3.0, n) - 0.05 * commerce, 0.05, 0.99)
+    columns["checkout_success_rate"] = np.clip(rng.beta(9.0, 1.5, n) + 0.02 * commerce, 0.2, 1.0)
+
+    # TikTok Shop
+    columns["listing_quality"] = unit(0.8 * commerce, 0.3 * quality, bias=0.2)
+    columns["product_velocity"] = np.clip(np.exp(np.log(0.3) + 0.5 * commerce + normal(0.5)), 0.0, 3.0)
+    columns["integration_seamlessness"] = unit(0.6 * commerce, bias=0.4)
+
+    # Engagement: likes dominate, comments and shares are a few percent of views
+    engagement = 0.5 * quality + 0.4 * virality + normal(0.6)
+    columns["likes_ratio"] = np.clip(np.exp(np.log(0.06) + 0.35 * engagement + normal(0.3)), 0.001, 0.5)
+    columns["comments_ratio"] = np.clip(np.exp(np.log(0.004) + 0.35 * engagement + normal(0.4)), 0.0, 0.1)
+    columns["shares_ratio"] = np.clip(np.exp(np.log(0.003) + 0.45 * engagement + normal(0.5)), 0.0, 0.1)
+    video_duration = np.clip(np.exp(np.log(28.0) + normal(0.6)), 5.0, 600.0)
+    completion = unit(0.6 * quality, bias=-0.3, noise=0.5)
+    columns["retention_rate"] = np.clip(completion * 0.9 + normal(0.05), 0.0, 1.0)
+    columns["avg_watch_time"] = np.round(video_duration * completion, 2)
+    columns["video_duration"] = np.round(video_duration, 1)
+
+    # Growth
+    columns["engagement_growth_rate"] = np.clip(0.05 + 0.08 * engagement + normal(0.2), -0.9, 5.0)
+    columns["follower_growth_rate"] = np.clip(0.03 + 0.04 * virality + normal(0.08), -0.5, 3.0)
+    columns["views_growth_rate"] = np.clip(0.05 + 0.12 * virality + normal(0.3), -0.9, 5.0)
+
+    # Discovery
+    columns["hashtag_performance"] = unit(0.7 * virality)
+    columns["search_visibility"] = unit(0.4 * virality, 0.3 * quality, bias=-0.2)
+    columns["recommendation_rate"] = np.clip(np.exp(np.log(0.02) + 0.5 * virality + normal(0.5)), 0.0, 0.3)
+    columns["viral_potential"] = unit(0.9 * virality, noise=0.5)
+
+    # Content strategy
+    columns["video_quality"] = unit(0.9 * quality, bias=0.3, noise=0.5)
+    columns["content_freshness"] = unit(0.4 * virality, bias=0.2)
+    columns["posting_consistency"] = unit(0.5 * quality, bias=0.1, noise=0.9)
+    columns["content_diversity"] = unit(0.3 * quality)
+
+    # Audience fit
+    columns["target_demographic_match"] = unit(0.3 * commerce, bias=0.3)
+    columns["audience_engagement_quality"] = unit(0.5 * engagement)
+    columns["follower_quality_score"] = unit(0.4 * quality, -0.2 * (log_followers - 4.2), bias=0.4)
+    columns["audience_retention"] = np.clip(columns["retention_rate"] + normal(0.08), 0.0, 1.0)
+
+    # Brand fit: authenticity erodes slightly with audience size
+    trust = 0.6 * quality + normal(0.7)
+    columns["brand_alignment"] = unit(0.4 * commerce, bias=0.2)
+    columns["trust_score"] = _sigmoid(0.4 + trust)
+    columns["authenticity_score"] = unit(0.5 * trust, -0.3 * (log_followers - 4.2), bias=0.5)
+    columns["brand_consistency"] = unit(0.5 * quality, bias=0.3)
+
+    # Trend fit
+    columns["trend_alignment"] = unit(0.7 * virality)
+    columns["timing_score"] = unit(0.4 * virality, bias=0.1)
+    columns["trend_relevance"] = unit(0.6 * virality, 0.2 * quality)
+
+    # Image
+    image = 0.8 * quality + normal(0.5)
+    columns["image_quality"] = _sigmoid(0.3 + image)
+    columns["lighting_score"] = unit(0.7 * image, bias=0.2, noise=0.4)
+    columns["composition_score"] = unit(0.7 * image, noise=0.4)
+    columns["color_balance"] = unit(0.6 * image, bias=0.3, noise=0.4)
+
+    # Reach
+    columns["total_reach"] = np.round(total_reach)
+    columns["unique_viewers"] = np.round(total_reach * rng.beta(6.0, 3.0, n))
+    columns["impression_rate"] = np.clip(np.exp(np.log(0.03) + 0.4 * virality + normal(0.4)), 0.0, 0.3)
+    columns["visibility_score"] = unit(0.5 * virality, 0.3 * (log_followers - 4.2))
+    columns["target_reach"] = np.choose(
+        np.digitize(log_followers, [4.0, 5.0, 6.0]), [10000.0, 50000.0, 250000.0, 1000000.0]
+    )
+
+    # Cost: acquisition cost falls as conversion rises
+    cost_per_click = np.exp(np.log(0.6) + normal(0.35))
+    columns["cost_per_acquisition"] = np.round(np.clip(cost_per_click / conversion_rate, 1.0, 2000.0), 2)
+    columns["cost_per_engagement"] = np.round(np.clip(np.exp(np.log(0.35) - 0.3 * engagement + normal(0.4)),
+                                                      0.01, 10.0), 3)
+    columns["cost_per_view"] = np.round(np.clip(np.exp(np.log(0.02) - 0.3 * virality + normal(0.4)),
+                                                0.001, 1.0), 4)
+    columns["roi_score"] = np.clip(np.exp(np.log(1.2) + 0.5 * commerce + normal(0.5)), 0.0, 20.0)
+    columns["target_cpa"] = np.full(n, 50.0)
+    columns["target_cpe"] = np.full(n, 0.5)
+    columns["target_cpv"] = np.full(n, 0.05)
+
+    ids = np.arange(index * n, (index + 1) * n)
+    population: Population = {
+        "creator_id": np.char.add("synthetic_", np.char.zfill(ids.astype(str), 8)),
+        "niche": np.array(niche_names)[niche_index],
+    }
+    population.update({name: columns[name].astype(np.float64) for name in METRIC_DEFAULTS})
+    return population
+
+
+def iter_chunks(n: int, seed: Optional[int] = 0) -> Iterator[Population]:
+    """
+    Generate a population chunk by chunk
+
+    Args:
+        n: Number of creators
+        seed: Random seed (same seed, same creators)
+
+    Yields:
+        Populations of at most CHUNK_SIZE creators: creator_id and niche string
+        arrays plus one float64 array per input metric
+    """
+    seed = 0 if seed is None else seed
+    for index in range(-(-n // CHUNK_SIZE)):
+        chunk = _chunk(seed, index)
+        rows = min(CHUNK_SIZE, n - index * CHUNK_SIZE)
+        yield {name: values[:rows] for name, values in chunk.items()} if rows < CHUNK_SIZE else chunk
+
+
+def generate_population(n: int, seed: Optional[int] = 0) -> Population:
+    """
+    Generate a whole population in memory
+
+    Args:
+        n: Number of creators
+        seed: Random seed (same seed, same creators)
+
+    Returns:
+        creator_id and niche arrays plus one float64 array per input metric
+    """
+    chunks = list(iter_chunks(n, seed))
+    if not chunks:
+        return {name: np.empty(0) for name in ("creator_id", "niche", *METRIC_DEFAULTS)}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def generate_columns(n: int, seed: Optional[int] = 0) -> Dict[str, np.ndarray]:
+    """
+    Generate metric columns for n creators (the input of BatchScorer.score_columns)
+
+    Args:
+        n: Number of creators
+        seed: Random seed (same seed, same data)
+
+    Returns:
+        Dictionary of metric name -> float64 array
+    """
+    population = generate_population(n, seed)
+    return {name: population[name] for name in METRIC_DEFAULTS}
+
+
+def _chunk_records(chunk: Population) -> List[Dict[str, Any]]:
+    """Convert a population chunk to records"""
+    columns = {name: values.tolist() for name, values in chunk.items()}
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def generate_records(n: int, seed: Optional[int] = 0) -> List[Dict[str, Any]]:
+    """
+    Generate creator metric records (API payloads) for n creators
+
+    Args:
+        n: Number of creators
+        seed: Random seed (same seed, same data)
+
+    Returns:
+        Records with creator_id, niche and every input metric
+    """
+    records: List[Dict[str, Any]] = []
+    for chunk in iter_chunks(n, seed):
+        records.extend(_chunk_records(chunk))
+    return records
+
+
+def write_population(path: str, n: int, output_format: str, seed: Optional[int] = 0) -> None:
+    """
+    Stream a population to a file chunk by chunk
+
+    Args:
+        path: Output file
+        n: Number of creators
+        output_format: One of FORMATS; npz holds the whole population in memory
+        seed: Random seed
+    """
+    if output_format == "npz":
+        np.savez(path, **generate_population(n, seed))
+    elif output_format == "csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["creator_id", "niche", *METRIC_DEFAULTS])
+            for chunk in iter_chunks(n, seed):
+                writer.writerows(zip(*(values.tolist() for values in chunk.values())))
+    elif output_format == "jsonl":
+        with open(path, "w") as f:
+            for chunk in iter_chunks(n, seed):
+                f.writelines(json.dumps(record) + "\n" for record in _chunk_records(chunk))
+    elif output_format == "parquet":
+        pyarrow = optional_import("pyarrow")
+        parquet = optional_import("pyarrow.parquet")
+        if pyarrow is None or parquet is None:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+        writer = None
+        try:
+            for chunk in iter_chunks(n, seed):
+                table = pyarrow.table(chunk)
+                if writer is None:
+                    writer = parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unknown format '{output_format}', expected one of {', '.join(FORMATS)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic creator population")
+    parser.add_argument("--count", type=int, required=True, help="Number of creators")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Output format")
+    parser.add_argument("--output", required=True, help="Output file")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    try:
+        write_population(args.output, args.count, args.format, args.seed)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {args.count:,} creators to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
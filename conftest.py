@@ -0,0 +1,54 @@
+"""
+Shared pytest fixtures
+
+The Task 1 and Task 2 suites run in process: api_client drives the ASGI app
+through Starlette's TestClient, so no server or network port is needed. Each
+pytest-xdist worker (pytest -n auto) builds the app once and keeps its
+history and job stores in a private temporary directory.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Settings are read when src.config.config is first imported, so the
+# environment is prepared here, before the test modules are collected
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+_STATE_DIR = tempfile.mkdtemp(prefix=f"tiktok-metrics-tests-{_WORKER}-")
+
+os.environ.setdefault("BASE_URL", "http://testserver")
+os.environ.setdefault("API_HOST", "127.0.0.1")
+os.environ.setdefault("API_PORT", "8000")
+os.environ.update({
+    "HISTORY_DB_PATH": os.path.join(_STATE_DIR, "history.sqlite3"),
+    "JOBS_DB_PATH": os.path.join(_STATE_DIR, "jobs.sqlite3"),
+    "TRACING_EXPORT_PATH": os.path.join(_STATE_DIR, "traces.json"),
+    "PROFILING_OUTPUT_DIR": os.path.join(_STATE_DIR, "profiles"),
+    "JOBS_MEMORY_REPORT_DIR": os.path.join(_STATE_DIR, "profiles", "memory"),
+})
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """
+    In-process client for the application, shared by the tests of one worker
+
+    The app is built and warmed up once per worker; the lifespan (history
+    writer, job workers) runs for the whole session.
+
+    Yields:
+        TestClient with the requests-style get/post API
+    """
+    from fastapi.testclient import TestClient
+
+    from app import create_app
+
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def pytest_unconfigure(config):
+    """Remove this process' state directory"""
+    shutil.rmtree(_STATE_DIR, ignore_errors=True)
@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for TikTok Metrics AI Agent
+
+Runs app_production:app in pre-forked uvicorn workers. Worker count and
+recycling are read from Settings (SERVER_* environment variables).
+
+    gunicorn -c gunicorn.conf.py app_production:app
+"""
+
+import os
+
+from src.config.config import settings
+
+
+def _available_cores() -> int:
+    """CPU cores this process may run on (respects container CPU affinity)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', settings.api_port)}"
+
+# The scoring pipeline is CPU-bound, so one async worker per core
+workers = settings.SERVER_WORKERS or _available_cores()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app (and run its warm-up) once in the master before forking
+preload_app = True
+
+# Worker recycling bounds the impact of slow leaks and fragmentation
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+
+timeout = settings.SERVER_TIMEOUT_SECONDS
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "debug" if settings.debug else "info"
+
+
+def post_fork(server, worker):
+    """Log each worker as it is forked from the preloaded master"""
+    server.log.info(f"Worker {worker.pid} forked from preloaded app (max_requests={max_requests})")
@@ -0,0 +1,22 @@
+"""
+HTTP layer helpers for TikTok Metrics AI Agent
+"""
+
+from .responses import CachedPayload, FastJSONResponse, PayloadCache, body_etag, dumps_json, loads_json
+from .http_caching import (
+    FingerprintedStaticFiles, StaticAssetFingerprints,
+    conditional_payload_response, is_not_modified
+)
+
+__all__ = [
+    "CachedPayload",
+    "FastJSONResponse",
+    "PayloadCache",
+    "body_etag",
+    "dumps_json",
+    "loads_json",
+    "FingerprintedStaticFiles",
+    "StaticAssetFingerprints",
+    "conditional_payload_response",
+    "is_not_modified"
+]
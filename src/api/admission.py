@@ -0,0 +1,241 @@
+"""
+Admission control and graceful load shedding for the scoring API
+"""
+
+import asyncio
+import heapq
+import itertools
+from typing import Any, Dict, Iterable, List, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+# Lower value = served first; critical routes bypass the limiter entirely
+PRIORITY_CLASSES: Dict[str, int] = {
+    "critical": 0,
+    "interactive": 1,
+    "standard": 2,
+    "batch": 3,
+}
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, priority-ordered wait queue
+
+    At most ``max_concurrency`` requests run at once. Further requests wait in a
+    queue ordered by priority class and arrival; a freed slot is handed to the
+    best waiter. When the queue is full, a newcomer evicts the worst waiter only
+    if it has strictly better priority, otherwise it is rejected immediately.
+    Waiters give up after ``queue_timeout`` seconds, which bounds tail latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float, max_degraded: int = 0):
+        """
+        Initialize the admission controller
+
+        Args:
+            max_concurrency: Maximum requests executing concurrently
+            max_queue: Maximum requests waiting for a slot
+            queue_timeout: Seconds a request may wait before being shed
+            max_degraded: Maximum degraded requests executing outside the limit
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_degraded = max_degraded
+
+        self._active = 0
+        self._degraded_active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.evicted = 0
+        self.degraded = 0
+
+    async def acquire(self, priority: int) -> bool:
+        """
+        Wait for an execution slot
+
+        Args:
+            priority: Priority class value (lower is more urgent)
+
+        Returns:
+            True if a slot was granted, False if the request should be shed
+        """
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            worst = max(self._waiters) if self._waiters else None
+            if worst is None or worst[0] <= priority:
+                self.rejected += 1
+                return False
+            self._remove_waiter(worst)
+            worst[2].set_result(False)
+            self.evicted += 1
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        self.queued += 1
+
+        try:
+            granted = await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(entry)
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            # A slot handed over just before cancellation must not leak
+            if future.done() and not future.cancelled() and future.result():
+                self.release()
+            else:
+                self._remove_waiter(entry)
+            raise
+
+        if granted:
+            self.admitted += 1
+        return granted
+
+    def release(self) -> None:
+        """Release a slot, handing it to the best waiting request if any"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._active -= 1
+
+    def try_degrade(self) -> bool:
+        """
+        Claim a slot for a degraded (cheaper) execution outside the limit
+
+        Returns:
+            True if the degraded budget allows the request
+        """
+        if self._degraded_active >= self.max_degraded:
+            return False
+        self._degraded_active += 1
+        self.degraded += 1
+        return True
+
+    def release_degraded(self) -> None:
+        """Release a degraded execution slot"""
+        self._degraded_active -= 1
+
+    def _remove_waiter(self, entry: Tuple[int, int, asyncio.Future]) -> None:
+        """Remove a waiter from the queue if still present"""
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get admission statistics
+
+        Returns:
+            Dictionary with current load and cumulative counters
+        """
+        return {
+            "active": self._active,
+            "degraded_active": self._degraded_active,
+            "queue_depth": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "evicted": self.evicted,
+            "degraded": self.degraded
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying admission control per route
+
+    Routes are mapped to priority classes by longest path prefix. Critical
+    routes skip the limiter. Shed requests to degradable routes run in a
+    degraded mode (``request.state.degraded``) while the degraded budget
+    lasts; everything else gets a fast 503 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        route_priorities: Dict[str, str],
+        degradable_routes: Iterable[str] = (),
+        default_priority: str = "standard",
+        retry_after_seconds: int = 1
+    ):
+        self.app = app
+        self.controller = controller
+        # Longest prefixes first so the most specific rule wins
+        self.route_priorities = sorted(
+            ((prefix, PRIORITY_CLASSES[name]) for prefix, name in route_priorities.items()),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self.degradable_routes = frozenset(degradable_routes)
+        self.default_priority = PRIORITY_CLASSES[default_priority]
+        self.retry_after_seconds = retry_after_seconds
+
+    def priority_for(self, path: str) -> int:
+        """
+        Resolve the priority class value for a request path
+
+        Args:
+            path: Request path
+
+        Returns:
+            Priority class value
+        """
+        for prefix, priority in self.route_priorities:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return priority
+        return self.default_priority
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        priority = self.priority_for(path)
+        if priority == PRIORITY_CLASSES["critical"]:
+            await self.app(scope, receive, send)
+            return
+
+        if await self.controller.acquire(priority):
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.controller.release()
+            return
+
+        if path in self.degradable_routes and self.controller.try_degrade():
+            scope.setdefault("state", {})["degraded"] = True
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.controller.release_degraded()
+            return
+
+        response = JSONResponse(
+            {"detail": "Service overloaded, please retry later"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after_seconds)}
+        )
+        await response(scope, receive, send)
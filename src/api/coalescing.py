@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing of identical concurrent requests
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict
+
+from .responses import dumps_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def payload_key(payload: Dict[str, Any], namespace: str = "") -> str:
+    """
+    Build a stable key for a request payload
+
+    Args:
+        payload: JSON-compatible request payload
+        namespace: Prefix separating routes or configuration versions
+
+    Returns:
+        Hex digest identifying the payload
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:  # pragma: no cover - exercised only without orjson installed
+        encoded = dumps_json({key: payload[key] for key in sorted(payload)})
+    return f"{namespace}:{hashlib.sha1(encoded).hexdigest()}"
+
+
+class SingleFlight:
+    """
+    Shares one in-flight computation between concurrent callers with the same key
+
+    The first caller for a key (the leader) starts the computation as a task;
+    callers arriving before it finishes await the same task and receive the
+    same result or exception. The task is shielded, so a leader whose client
+    disconnects does not cancel the work its followers are waiting on.
+    """
+
+    def __init__(self):
+        """Initialize an empty single-flight group"""
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Coalescing key
+            fn: Coroutine factory performing the computation
+
+        Returns:
+            Result of the shared computation
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        """Remove a finished task and record failures"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with leader, coalesced and failure counts
+        """
+        requests = self.leaders + self.coalesced
+        return {
+            "requests": requests,
+            "computations": self.leaders,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": len(self._inflight),
+            "coalesce_rate": self.coalesced / requests if requests else 0.0
+        }
@@ -0,0 +1,194 @@
+"""
+HTTP conditional caching: validators for config-derived payloads and fingerprinted static assets
+"""
+
+import hashlib
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from .responses import CachedPayload, FastJSONResponse
+
+
+# Static assets requested with a matching fingerprint never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Config-derived payloads may change on any weight update, so clients revalidate
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: ETag of the current representation
+
+    Returns:
+        True if any listed tag matches
+    """
+    if if_none_match.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == current:
+            return True
+    return False
+
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    Evaluate conditional request headers against the current validators
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+
+    Args:
+        request_headers: Incoming request headers
+        etag: ETag of the current representation
+        last_modified: Modification time as a UNIX timestamp, None if the
+            representation has no Last-Modified validator
+
+    Returns:
+        True if a 304 Not Modified response should be sent
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+
+    return False
+
+
+def conditional_payload_response(request: Request, payload: CachedPayload,
+                                 last_modified: Optional[float] = None) -> Response:
+    """
+    Serve a cached payload, answering conditional requests with 304
+
+    The ETag is the content hash. Last-Modified must come from a time every
+    worker serving the same body shares, such as the modification time of
+    the active scoring configuration, never from when a worker built it.
+
+    Args:
+        request: Incoming request
+        payload: Cached payload with its ETag
+        last_modified: UNIX time the payload's source last changed, None to
+            validate by ETag only
+
+    Returns:
+        304 response if the client copy is current, otherwise the JSON body
+    """
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": REVALIDATE_CACHE_CONTROL
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    if is_not_modified(request.headers, payload.etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(payload.body, headers=headers)
+
+
+class StaticAssetFingerprints:
+    """
+    Computes content fingerprints for files under the static directory
+
+    Digests are cached per file and recomputed only when the file's size or
+    mtime changes, so templates can call ``url()`` on every render.
+    """
+
+    def __init__(self, directory: str, url_prefix: str = "/static"):
+        """
+        Initialize the fingerprint registry
+
+        Args:
+            directory: Static files directory
+            url_prefix: URL path the directory is mounted at
+        """
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, path: str) -> Optional[str]:
+        """
+        Get the content fingerprint of a static file
+
+        Args:
+            path: File path relative to the static directory
+
+        Returns:
+            Short hex digest, or None if the file does not exist
+        """
+        full_path = os.path.join(self.directory, path.lstrip("/"))
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            return None
+
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+            return cached[2]
+
+        with open(full_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        with self._lock:
+            self._digests[path] = (stat_result.st_mtime_ns, stat_result.st_size, digest)
+        return digest
+
+    def url(self, path: str) -> str:
+        """
+        Build a fingerprinted URL for a static file
+
+        Args:
+            path: File path relative to the static directory
+
+        Returns:
+            URL with a ``v`` query parameter carrying the content digest
+        """
+        path = path.lstrip("/")
+        digest = self.digest(path)
+        if digest is None:
+            return f"{self.url_prefix}/{path}"
+        return f"{self.url_prefix}/{path}?v={digest}"
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    StaticFiles that marks fingerprinted requests as immutable
+
+    Requests whose ``v`` query parameter matches the current file digest get a
+    one-year immutable Cache-Control; all other requests must revalidate using
+    the ETag and Last-Modified headers StaticFiles already emits.
+    """
+
+    def __init__(self, *args, fingerprints: StaticAssetFingerprints, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fingerprints = fingerprints
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        requested_version = Request(scope).query_params.get("v")
+        relative_path = os.path.relpath(full_path, self.fingerprints.directory)
+        if requested_version and requested_version == self.fingerprints.digest(relative_path):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
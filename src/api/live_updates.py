@@ -0,0 +1,334 @@
+"""
+Live score updates pushed to subscribers as server-sent events
+"""
+
+import asyncio
+import itertools
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.logger.logger import logger
+from src.storage.history import HISTORY_COLUMNS, AnalysisHistoryStore, row_to_dict
+from .responses import dumps_json
+
+
+# (event id, encoded JSON payload)
+ScoreEvent = Tuple[int, bytes]
+
+
+def format_score_event(event: ScoreEvent) -> bytes:
+    """
+    Render a score update in the text/event-stream format
+
+    Args:
+        event: Event ID and encoded payload (compact JSON, no newlines)
+
+    Returns:
+        Encoded SSE message
+    """
+    event_id, body = event
+    return b"id: %d\nevent: score\ndata: %s\n\n" % (event_id, body)
+
+
+class ScoreSubscription:
+    """
+    Pending updates for one subscriber
+
+    Updates are keyed by creator ID, so a client that falls behind only ever
+    receives the latest score per creator: a newer update replaces a pending
+    one (coalesced). The number of pending creators is bounded; past the
+    bound the oldest pending update is dropped.
+    """
+
+    def __init__(self, creator_ids: Iterable[str], max_pending: int):
+        """
+        Initialize a subscription (must be created on the serving event loop)
+
+        Args:
+            creator_ids: Creator IDs to receive updates for
+            max_pending: Maximum undelivered updates held for this subscriber
+        """
+        self.creator_ids = frozenset(creator_ids)
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[str, ScoreEvent]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def offer(self, creator_id: str, event: ScoreEvent) -> None:
+        """
+        Queue an update without blocking; safe to call from any thread
+
+        Args:
+            creator_id: Creator the update belongs to
+            event: Event ID and encoded payload
+        """
+        with self._lock:
+            if creator_id in self._pending:
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[creator_id] = event
+
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def next_batch(self, timeout: float) -> List[ScoreEvent]:
+        """
+        Wait for pending updates and take all of them
+
+        Args:
+            timeout: Seconds to wait before returning an empty batch
+
+        Returns:
+            Pending updates in arrival order (empty on timeout)
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._wakeup.clear()
+
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+        self.delivered += len(batch)
+        return batch
+
+
+class ScoreUpdateBroker:
+    """
+    Fans finished analyses out to the subscriptions of their creator
+
+    Each update is encoded once and the same bytes are handed to every
+    subscriber. The latest update per creator is kept (LRU-bounded) and sent
+    to new subscribers immediately, so opening a dashboard shows the current
+    score without rescoring.
+
+    Analyses computed in this process are published directly. Those of other
+    worker processes reach the broker through the shared history store: a
+    background thread tails its latest analyses per creator (like the cohort
+    indexes do) and publishes the ones newer than the update already known
+    for the creator, so an analysis is never pushed twice by one worker.
+    """
+
+    def __init__(self, max_subscribers: int, max_pending: int, max_latest: int):
+        """
+        Initialize the broker
+
+        Args:
+            max_subscribers: Maximum concurrent subscriptions
+            max_pending: Maximum undelivered updates per subscription
+            max_latest: Maximum creators whose latest update is retained
+        """
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.max_latest = max_latest
+
+        self._subscribers: Dict[str, Set[ScoreSubscription]] = {}
+        self._subscriptions: Set[ScoreSubscription] = set()
+        # Creator -> (latest event, its analysis time)
+        self._latest: "OrderedDict[str, Tuple[ScoreEvent, float]]" = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.watermark = 0
+
+        self.published = 0
+        self.synced = 0
+        self.skipped = 0
+        self.rejected = 0
+        self._closed_delivered = 0
+        self._closed_coalesced = 0
+        self._closed_dropped = 0
+
+    def subscribe(self, creator_ids: Iterable[str]) -> Optional[ScoreSubscription]:
+        """
+        Subscribe to updates for a set of creators
+
+        Args:
+            creator_ids: Creator IDs to follow
+
+        Returns:
+            New subscription primed with the latest known updates, or None if
+            the subscriber limit is reached
+        """
+        subscription = ScoreSubscription(creator_ids, self.max_pending)
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            self._subscriptions.add(subscription)
+            for creator_id in subscription.creator_ids:
+                self._subscribers.setdefault(creator_id, set()).add(subscription)
+            latest = [(creator_id, self._latest[creator_id][0])
+                      for creator_id in subscription.creator_ids if creator_id in self._latest]
+            for creator_id, event in sorted(latest, key=lambda item: item[1][0]):
+                subscription.offer(creator_id, event)
+        return subscription
+
+    def unsubscribe(self, subscription: ScoreSubscription) -> None:
+        """
+        Remove a subscription
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.discard(subscription)
+            for creator_id in subscription.creator_ids:
+                subscribers = self._subscribers.get(creator_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[creator_id]
+            self._closed_delivered += subscription.delivered
+            self._closed_coalesced += subscription.coalesced
+            self._closed_dropped += subscription.dropped
+
+    def publish(self, creator_id: str, payload: Dict[str, Any], analyzed_at: float,
+                followed_only: bool = False) -> int:
+        """
+        Publish a finished analysis; safe to call from any thread
+
+        Analyses older than the latest one known for the creator are ignored,
+        the rule the history store applies to its latest analysis per creator.
+
+        Args:
+            creator_id: Creator the analysis belongs to
+            payload: JSON-compatible analysis payload
+            analyzed_at: Analysis time (epoch seconds) as stored in the history
+            followed_only: Only encode and retain the update if the creator has
+                subscribers (for batches); a retained older update is dropped
+
+        Returns:
+            Number of subscriptions the update was offered to
+        """
+        with self._lock:
+            if not self._is_newer(creator_id, analyzed_at):
+                return 0
+            if followed_only and creator_id not in self._subscribers:
+                self._latest.pop(creator_id, None)
+                return 0
+        body = dumps_json(payload)
+        with self._lock:
+            if not self._is_newer(creator_id, analyzed_at):
+                return 0
+            event = (next(self._sequence), body)
+            self._latest[creator_id] = (event, analyzed_at)
+            self._latest.move_to_end(creator_id)
+            if len(self._latest) > self.max_latest:
+                self._latest.popitem(last=False)
+            # Offered under the lock so a subscriber never sees updates out of order
+            subscribers = self._subscribers.get(creator_id, ())
+            for subscription in subscribers:
+                subscription.offer(creator_id, event)
+            self.published += 1
+            return len(subscribers)
+
+    def _is_newer(self, creator_id: str, analyzed_at: float) -> bool:
+        """Whether an analysis is newer than the retained one (call under the lock)"""
+        latest = self._latest.get(creator_id)
+        if latest is not None and latest[1] >= analyzed_at:
+            self.skipped += 1
+            return False
+        return True
+
+    def sync(self, store: AnalysisHistoryStore) -> int:
+        """
+        Publish the analyses stored since the last sync that this process has
+        not published itself, e.g. those of other workers
+
+        Args:
+            store: Analysis history store shared by the workers
+
+        Returns:
+            Number of updates offered to subscribers
+        """
+        rows = store.latest_changes(HISTORY_COLUMNS[1:], self.watermark)
+        offered = 0
+        for row in rows:
+            if self.publish(row["creator_id"], row_to_dict(row), row["analyzed_at"], followed_only=True):
+                offered += 1
+        if rows:
+            self.watermark = rows[-1]["id"]
+        self.synced += offered
+        return offered
+
+    def start(self, store: AnalysisHistoryStore, interval: float) -> None:
+        """
+        Start tailing the history store from its current end (no-op if running)
+
+        Args:
+            store: Analysis history store shared by the workers
+            interval: Seconds between syncs
+        """
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(store, interval), name="score-update-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop tailing the history store"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, store: AnalysisHistoryStore, interval: float) -> None:
+        """Sync every interval; analyses stored before start are not replayed"""
+        try:
+            self.watermark = max(self.watermark, store.last_id())
+        except sqlite3.Error as e:
+            logger.warning(f"Live updates could not read the history store: {e}")
+        while not self._stopping.wait(interval):
+            try:
+                self.sync(store)
+            except sqlite3.Error as e:
+                logger.warning(f"Live updates could not read the history store: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get live update statistics
+
+        Returns:
+            Dictionary with subscriber counts and delivery counters
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            followed_creators = len(self._subscribers)
+        return {
+            "subscribers": len(subscriptions),
+            "followed_creators": followed_creators,
+            "retained_latest": len(self._latest),
+            "published": self.published,
+            "synced_from_history": self.synced,
+            "skipped": self.skipped,
+            "history_watermark": self.watermark,
+            "tailing_history": self._thread is not None,
+            "rejected": self.rejected,
+            "delivered": self._closed_delivered + sum(s.delivered for s in subscriptions),
+            "coalesced": self._closed_coalesced + sum(s.coalesced for s in subscriptions),
+            "dropped": self._closed_dropped + sum(s.dropped for s in subscriptions)
+        }
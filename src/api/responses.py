@@ -0,0 +1,192 @@
+"""
+Fast JSON encoding and cached payloads for API responses
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from starlette.responses import Response
+
+from src.monitoring.metrics import stage_latency
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _encode_fallback(obj: Any) -> Any:
+    """
+    Convert values the JSON encoders do not handle natively
+
+    NumPy scalars and arrays both expose ``tolist()``, which lets us support
+    them without importing NumPy in the HTTP layer.
+    """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_json(content: Any) -> bytes:
+        """
+        Encode content as compact UTF-8 JSON
+
+        Args:
+            content: JSON-compatible content, may contain NumPy values
+
+        Returns:
+            Encoded JSON bytes
+        """
+        return orjson.dumps(content, default=_encode_fallback, option=_ORJSON_OPTIONS)
+else:  # pragma: no cover - exercised only without orjson installed
+    def dumps_json(content: Any) -> bytes:
+        """
+        Encode content as compact UTF-8 JSON
+
+        Args:
+            content: JSON-compatible content, may contain NumPy values
+
+        Returns:
+            Encoded JSON bytes
+        """
+        return json.dumps(
+            content,
+            default=_encode_fallback,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+
+def loads_json(data: Any) -> Any:
+    """
+    Decode JSON from bytes or str
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Decoded content
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)  # pragma: no cover - exercised only without orjson installed
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson
+
+    Pre-encoded ``bytes`` content is sent as-is, which is how cached payloads
+    skip serialization entirely.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        start = time.perf_counter()
+        body = dumps_json(content)
+        stage_latency.observe(time.perf_counter() - start, "serialization")
+        return body
+
+
+class CachedPayload(NamedTuple):
+    """Encoded payload together with its HTTP validator"""
+    version: Optional[str]
+    body: bytes
+    etag: str
+
+
+def body_etag(body: bytes) -> str:
+    """
+    Strong ETag of an encoded body
+
+    Derived from the bytes alone, so every worker serving the same body hands
+    out the same validator and any change to the body changes it.
+
+    Args:
+        body: Encoded response body
+
+    Returns:
+        Quoted ETag
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class PayloadCache:
+    """
+    Caches encoded payloads that are expensive to build
+
+    Entries built for a configuration version are rebuilt transparently the
+    first time they are requested under a new version; entries without a
+    version are built once per process.
+    """
+
+    def __init__(self):
+        """Initialize an empty payload cache"""
+        self._entries: Dict[str, CachedPayload] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: str, builder: Callable[[], Any], version: Optional[str] = None) -> CachedPayload:
+        """
+        Get the encoded payload for a key, building it on first use or a version change
+
+        Args:
+            key: Payload name
+            builder: Callable returning the JSON-compatible payload
+            version: Configuration version the payload depends on, None if
+                it does not depend on the configuration
+
+        Returns:
+            Cached payload with encoded body and ETag
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                body = dumps_json(builder())
+                entry = CachedPayload(version=version, body=body, etag=body_etag(body))
+                self._entries[key] = entry
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def clear(self) -> None:
+        """Drop all cached payloads"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -69,6 +69,12 @@ class Settings(BaseSettings):
         "shop_conversion_scorer"
     ]
     
+    # Scoring Configuration File (JSON overriding the weights and tiers above,
+    # normalization ranges and bottleneck thresholds; empty = built-in values only).
+    # Polled for changes and swapped in without restarting workers.
+    SCORING_CONFIG_PATH: str = ""
+    SCORING_CONFIG_POLL_SECONDS: float = 2.0
+    
     # Model Configuration
     MODEL_RETRAIN_FREQUENCY_DAYS: int = 30
     MIN_SAMPLES_FOR_TRAINING: int = 100
@@ -77,6 +83,97 @@ class Settings(BaseSettings):
     MAX_RECOMMENDATIONS: int = 3
     MIN_CONFIDENCE_THRESHOLD: float = 0.7
     
+    # Admission Control Configuration
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_MAX_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_MAX_DEGRADED: int = 16
+    
+    # Route prefix -> priority class (critical routes bypass the limiter)
+    ADMISSION_ROUTE_PRIORITIES: Dict[str, str] = {
+        "/health": "critical",
+        "/ready": "critical",
+        "/stats": "critical",
+        "/metrics": "critical",
+        "/static": "critical",
+        "/stream": "critical",  # Long-lived event streams must not hold execution slots
+        "/admin": "critical",
+        "/analyze": "interactive",
+        "/compare-algorithms": "interactive",
+        "/jobs": "batch",
+    }
+    
+    # Routes that fall back to a score-only response instead of a 503
+    ADMISSION_DEGRADABLE_ROUTES: List[str] = ["/analyze"]
+    
+    # Tracing Configuration (0.0 = only requests sent with "X-Trace-Sample: 1")
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORT_PATH: str = "traces/analyze_traces.json"
+    
+    # Admin Endpoints (sent as the X-Admin-Token header; empty = admin endpoints disabled)
+    ADMIN_TOKEN: str = ""
+    
+    # On-demand Profiling (sessions are started through /admin/profiling)
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_MAX_REPORTS: int = 20
+    
+    # Live Score Updates (server-sent events on /stream/scores)
+    SSE_MAX_SUBSCRIBERS: int = 1000
+    SSE_MAX_CREATORS_PER_SUBSCRIPTION: int = 50
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 50  # Pending updates per client before the oldest is dropped
+    SSE_LATEST_CACHE_SIZE: int = 10000  # Creators whose latest update is replayed to new subscribers
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_RETRY_MILLISECONDS: int = 3000
+    SSE_SYNC_INTERVAL_SECONDS: float = 1.0  # Polling of the shared history store for other workers' analyses
+    
+    # Batch Jobs (durable SQLite job store, see src/jobs)
+    JOBS_DB_PATH: str = "data/jobs.sqlite3"
+    JOBS_MAX_WORKERS: int = 2
+    JOBS_CHUNK_SIZE: int = 1000  # Records per checkpointed chunk
+    JOBS_MAX_ITEMS: int = 200000
+    JOBS_MAX_REPORTED_ERRORS: int = 100  # Invalid creators listed in a columnar submission's error report
+    JOBS_LEASE_SECONDS: float = 60.0  # A job not checkpointed for this long is taken over
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_MEMORY_PROFILING: bool = False  # Trace allocations per job stage (slows jobs down several times)
+    JOBS_MEMORY_REPORT_DIR: str = "profiles/memory"
+    
+    # Allocation budget: peak bytes per creator allowed in each job stage
+    MEMORY_BUDGET_BYTES_PER_CREATOR: Dict[str, float] = {
+        "ingest": 8192,
+        "scoring": 16384,
+        "recommendations": 16384,
+        "serialization": 16384,
+    }
+    
+    # Analysis History (SQLite, written behind in batches)
+    HISTORY_DB_PATH: str = "data/history.sqlite3"
+    HISTORY_BUFFER_SIZE: int = 50000  # Rows held in memory before new rows are dropped
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    COHORT_SYNC_INTERVAL_SECONDS: float = 1.0  # Maximum staleness of cohort indexes vs. the history store
+    
+    # Production Server Configuration (gunicorn.conf.py, pre-forked uvicorn workers)
+    SERVER_WORKERS: int = 0  # 0 = one worker per available CPU core
+    SERVER_MAX_REQUESTS: int = 10000  # Recycle a worker after this many requests (0 = never)
+    SERVER_MAX_REQUESTS_JITTER: int = 1000  # Random spread so workers do not recycle together
+    SERVER_TIMEOUT_SECONDS: int = 60
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    
+    @property
+    def weight_version(self) -> str:
+        """
+        Short fingerprint of the active scoring configuration (weights, tiers,
+        normalization ranges and bottleneck thresholds, see scoring_config.py)
+
+        Responses that depend only on the configuration are cached under this key,
+        so any change, including a hot reload of the configuration file,
+        automatically yields fresh payloads.
+        """
+        from src.config.scoring_config import scoring_config
+        return scoring_config.current.version
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -2,6 +2,7 @@
 Metric value ranges and normalization parameters for KPI scoring
 """
 
+import math
 from typing import Dict, Tuple
 
 
@@ -57,9 +58,219 @@ PERFORMANCE_THRESHOLDS = {
     "high": 0.8
 }
 
+# Normalization range of each metric whose scale is a tuning choice (rates on
+# a 0-1 scale and ranges bounded by per-creator targets are fixed). For the
+# cost metrics the range applies to target / cost. Overridable at runtime via
+# the scoring configuration file (see scoring_config.py).
+NORMALIZATION_RANGES: Dict[str, Tuple[float, float]] = {
+    "conversion_rate": (0.0, 0.1),
+    "shares_ratio": (0.0, 0.1),
+    "engagement_growth_rate": (-0.5, 2.0),
+    "follower_growth_rate": (-0.3, 1.0),
+    "views_growth_rate": (-0.5, 2.0),
+    "recommendation_rate": (0.0, 0.1),
+    "impression_rate": (0.0, 0.1),
+    "cost_per_acquisition": (0.0, 2.0),
+    "cost_per_engagement": (0.0, 2.0),
+    "cost_per_view": (0.0, 2.0),
+    "roi_score": (0.0, 5.0),
+}
+
+# Bottleneck detection in the recommendation pipeline: a metric past
+# "threshold" is a bottleneck, past "severe" a high-severity one. Metrics in
+# HIGHER_IS_WORSE are bottlenecks above their thresholds, the others below.
+BOTTLENECK_THRESHOLDS: Dict[str, Dict[str, float]] = {
+    "conversion_rate": {"threshold": 0.05, "severe": 0.02},
+    "cart_abandonment_rate": {"threshold": 0.6, "severe": 0.7},
+    "funnel_completion_rate": {"threshold": 0.3, "severe": 0.2},
+    "listing_quality": {"threshold": 0.5, "severe": 0.3},
+    "video_quality": {"threshold": 0.4, "severe": 0.2},
+    "interaction_balance": {"threshold": 0.5, "severe": 0.3},
+}
+
+HIGHER_IS_WORSE = frozenset({"cart_abandonment_rate"})
+
 # Cost estimates for improvement actions (in relative units)
 ACTION_COSTS = {
     "low_cost": 1.0,
     "medium_cost": 3.0,
     "high_cost": 5.0
 }
+
+# Default value of every raw input metric the scorers read (same defaults as
+# the scorers' data.get() calls; the API's CreatorMetrics model is built from it)
+METRIC_DEFAULTS: Dict[str, float] = {
+    # Sales Performance
+    "conversion_rate": 0.0,
+    "total_revenue": 0.0,
+    "avg_order_value": 0.0,
+    "target_revenue": 10000.0,
+    "target_aov": 50.0,
+    
+    # Shop Conversion
+    "funnel_completion_rate": 0.0,
+    "cart_abandonment_rate": 1.0,
+    "checkout_success_rate": 0.0,
+    
+    # TikTok Shop
+    "listing_quality": 0.0,
+    "product_velocity": 0.0,
+    "integration_seamlessness": 0.0,
+    
+    # Engagement
+    "likes_ratio": 0.0,
+    "comments_ratio": 0.0,
+    "shares_ratio": 0.0,
+    "retention_rate": 0.0,
+    "avg_watch_time": 0.0,
+    "video_duration": 30.0,
+    
+    # Engagement Growth
+    "engagement_growth_rate": 0.0,
+    "follower_growth_rate": 0.0,
+    "views_growth_rate": 0.0,
+    
+    # Discovery
+    "hashtag_performance": 0.0,
+    "search_visibility": 0.0,
+    "recommendation_rate": 0.0,
+    "viral_potential": 0.0,
+    
+    # Content Strategy
+    "video_quality": 0.0,
+    "content_freshness": 0.0,
+    "posting_consistency": 0.0,
+    "content_diversity": 0.0,
+    
+    # Audience Fit
+    "target_demographic_match": 0.0,
+    "audience_engagement_quality": 0.0,
+    "follower_quality_score": 0.0,
+    "audience_retention": 0.0,
+    
+    # Brand Fit
+    "brand_alignment": 0.0,
+    "trust_score": 0.0,
+    "authenticity_score": 0.0,
+    "brand_consistency": 0.0,
+    
+    # Trend Fit
+    "trend_alignment": 0.0,
+    "timing_score": 0.0,
+    "trend_relevance": 0.0,
+    
+    # Image Score
+    "image_quality": 0.0,
+    "lighting_score": 0.0,
+    "composition_score": 0.0,
+    "color_balance": 0.0,
+    
+    # Reach Visibility
+    "total_reach": 0.0,
+    "unique_viewers": 0.0,
+    "impression_rate": 0.0,
+    "visibility_score": 0.0,
+    "target_reach": 10000.0,
+    
+    # Cost Efficiency
+    "cost_per_acquisition": 100.0,
+    "cost_per_engagement": 1.0,
+    "cost_per_view": 0.1,
+    "roi_score": 0.0,
+    "target_cpa": 50.0,
+    "target_cpe": 0.5,
+    "target_cpv": 0.05,
+}
+
+# Accepted input range of each metric, in the API's CreatorMetrics model and
+# in bulk ingestion (see src/ingestion/validation.py): rates, ratios and 0-1
+# scores within [0, 1], amounts, counts, durations and costs non-negative,
+# growth rates no lower than -100%, and ROI any finite number (losses are
+# negative; the cost efficiency scorer clamps them to 0)
+_UNIT = (0.0, 1.0)
+_NON_NEGATIVE = (0.0, math.inf)
+_GROWTH = (-1.0, math.inf)
+_ANY = (-math.inf, math.inf)
+
+METRIC_BOUNDS: Dict[str, Tuple[float, float]] = {
+    # Sales Performance
+    "conversion_rate": _UNIT,
+    "total_revenue": _NON_NEGATIVE,
+    "avg_order_value": _NON_NEGATIVE,
+    "target_revenue": _NON_NEGATIVE,
+    "target_aov": _NON_NEGATIVE,
+    
+    # Shop Conversion
+    "funnel_completion_rate": _UNIT,
+    "cart_abandonment_rate": _UNIT,
+    "checkout_success_rate": _UNIT,
+    
+    # TikTok Shop
+    "listing_quality": _UNIT,
+    "product_velocity": _NON_NEGATIVE,
+    "integration_seamlessness": _UNIT,
+    
+    # Engagement
+    "likes_ratio": _UNIT,
+    "comments_ratio": _UNIT,
+    "shares_ratio": _UNIT,
+    "retention_rate": _UNIT,
+    "avg_watch_time": _NON_NEGATIVE,
+    "video_duration": _NON_NEGATIVE,
+    
+    # Engagement Growth
+    "engagement_growth_rate": _GROWTH,
+    "follower_growth_rate": _GROWTH,
+    "views_growth_rate": _GROWTH,
+    
+    # Discovery
+    "hashtag_performance": _UNIT,
+    "search_visibility": _UNIT,
+    "recommendation_rate": _UNIT,
+    "viral_potential": _UNIT,
+    
+    # Content Strategy
+    "video_quality": _UNIT,
+    "content_freshness": _UNIT,
+    "posting_consistency": _UNIT,
+    "content_diversity": _UNIT,
+    
+    # Audience Fit
+    "target_demographic_match": _UNIT,
+    "audience_engagement_quality": _UNIT,
+    "follower_quality_score": _UNIT,
+    "audience_retention": _UNIT,
+    
+    # Brand Fit
+    "brand_alignment": _UNIT,
+    "trust_score": _UNIT,
+    "authenticity_score": _UNIT,
+    "brand_consistency": _UNIT,
+    
+    # Trend Fit
+    "trend_alignment": _UNIT,
+    "timing_score": _UNIT,
+    "trend_relevance": _UNIT,
+    
+    # Image Score
+    "image_quality": _UNIT,
+    "lighting_score": _UNIT,
+    "composition_score": _UNIT,
+    "color_balance": _UNIT,
+    
+    # Reach Visibility
+    "total_reach": _NON_NEGATIVE,
+    "unique_viewers": _NON_NEGATIVE,
+    "impression_rate": _UNIT,
+    "visibility_score": _UNIT,
+    "target_reach": _NON_NEGATIVE,
+    
+    # Cost Efficiency
+    "cost_per_acquisition": _NON_NEGATIVE,
+    "cost_per_engagement": _NON_NEGATIVE,
+    "cost_per_view": _NON_NEGATIVE,
+    "roi_score": _ANY,
+    "target_cpa": _NON_NEGATIVE,
+    "target_cpe": _NON_NEGATIVE,
+    "target_cpv": _NON_NEGATIVE,
+}
@@ -0,0 +1,566 @@
+"""
+Hot-reloadable scoring configuration
+
+KPI weights, tiers, revenue KPIs, normalization ranges and bottleneck
+thresholds default to config.py and metric_value_ranges.py. A JSON file
+(SCORING_CONFIG_PATH) can override any section, and define named profiles
+that override it again for some tenants or niches:
+
+    {
+        "weights": {"sales_performance_scorer": 0.35, "cost_efficiency_scorer": 0.0},
+        "tiers": {"tier_1": [...], "tier_2": [...], "tier_3": [...]},
+        "revenue_kpis": [...],
+        "normalization_ranges": {"conversion_rate": [0.0, 0.08]},
+        "bottleneck_thresholds": {"video_quality": {"threshold": 0.5}},
+        "profiles": {
+            "beauty": {"weights": {...}, "bottleneck_thresholds": {...}}
+        },
+        "niche_profiles": {"skincare": "beauty"},
+        "tenant_profiles": {"acme": "beauty"}
+    }
+
+A profile applies to the niche of its own name, the niches and tenants
+mapped to it, and wins by tenant before niche. Every profile is compiled
+into its own ScoringConfig when the file is loaded, so selecting one per
+request is a dictionary lookup.
+
+A watcher thread polls the file's modification time, size and inode. A
+changed file is parsed, merged over the defaults, validated and compiled into
+a new ScoringConfig, which replaces the active one with a single reference
+assignment, so workers pick it up without a restart. An invalid file is
+logged and counted, and the active configuration stays in place.
+
+Readers take scoring_config.current (or scoring_config.select(data) for a
+creator's profile) once and use that object for the rest of the call; the
+scorers read scoring_config.active, set per thread with
+scoring_config.using(). Its version is a fingerprint of the content,
+profiles included; responses cached under settings.weight_version are
+rebuilt on the first request after a swap.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.config.config import settings
+from src.config.metric_value_ranges import BOTTLENECK_THRESHOLDS, HIGHER_IS_WORSE, NORMALIZATION_RANGES
+from src.logger.logger import logger
+from src.monitoring.metrics import errors
+
+
+TIERS: Sequence[str] = ("tier_1", "tier_2", "tier_3")
+
+# Sections a profile can override, and the sections of the whole file
+PROFILE_SECTIONS: Sequence[str] = (
+    "weights", "tiers", "revenue_kpis", "normalization_ranges", "bottleneck_thresholds"
+)
+SECTIONS: Sequence[str] = (*PROFILE_SECTIONS, "profiles", "niche_profiles", "tenant_profiles")
+
+# Name of the configuration that applies when no profile matches
+DEFAULT_PROFILE = "default"
+
+# Allowed difference between the sum of the weights and 1.0
+WEIGHT_SUM_TOLERANCE = 1e-6
+
+# Modification time of the built-in configuration: that of the modules it is read from
+_DEFAULTS_MODIFIED_AT = max(
+    os.path.getmtime(os.path.join(os.path.dirname(__file__), name))
+    for name in ("config.py", "metric_value_ranges.py")
+)
+
+
+class ScoringConfig:
+    """
+    Validated and compiled scoring configuration of one profile
+
+    The configuration loaded from the file is the "default" profile and
+    holds the other profiles. Instances are shared between threads and must
+    be treated as read-only.
+    """
+
+    __slots__ = ("name", "weights", "tiers", "tier_of", "tier_weights", "revenue_kpis", "normalization_ranges",
+                 "bottleneck_thresholds", "profiles", "niche_profiles", "tenant_profiles", "_by_niche",
+                 "_by_tenant", "version", "source", "modified_at", "loaded_at")
+
+    def __init__(self, data: Mapping[str, Any], name: str = DEFAULT_PROFILE, source: Optional[str] = None,
+                 modified_at: Optional[float] = None,
+                 profiles: Optional[Mapping[str, "ScoringConfig"]] = None,
+                 niche_profiles: Optional[Mapping[str, str]] = None,
+                 tenant_profiles: Optional[Mapping[str, str]] = None):
+        """
+        Compile validated configuration data (see compile_config)
+
+        Args:
+            data: Complete configuration, every profile section present
+            name: Profile name
+            source: File the configuration was loaded from, None for the defaults
+            modified_at: Modification time of the source (default: that of
+                the modules holding the built-in configuration)
+            profiles: Compiled named profiles (default profile only)
+            niche_profiles: Niche -> profile name, besides each profile's own niche
+            tenant_profiles: Tenant -> profile name
+        """
+        self.name = name
+        self.weights: Dict[str, float] = dict(data["weights"])
+        self.tiers: Dict[str, List[str]] = {tier: list(data["tiers"][tier]) for tier in TIERS}
+        self.tier_of: Dict[str, str] = {scorer: tier for tier in TIERS for scorer in self.tiers[tier]}
+        # Summed in scorer order, as the scalar and batch scorers accumulate them
+        self.tier_weights: Dict[str, float] = {tier: 0.0 for tier in TIERS}
+        for scorer, weight in self.weights.items():
+            self.tier_weights[self.tier_of[scorer]] += weight
+        self.revenue_kpis: List[str] = list(data["revenue_kpis"])
+        self.normalization_ranges: Dict[str, Tuple[float, float]] = {
+            metric: (bounds[0], bounds[1]) for metric, bounds in data["normalization_ranges"].items()
+        }
+        self.bottleneck_thresholds: Dict[str, Dict[str, float]] = {
+            metric: dict(entry) for metric, entry in data["bottleneck_thresholds"].items()
+        }
+
+        self.profiles: Dict[str, ScoringConfig] = dict(profiles or {})
+        self.niche_profiles: Dict[str, str] = dict(niche_profiles or {})
+        self.tenant_profiles: Dict[str, str] = dict(tenant_profiles or {})
+        self._by_niche: Dict[str, ScoringConfig] = {
+            **self.profiles, **{niche: self.profiles[profile] for niche, profile in self.niche_profiles.items()}
+        }
+        self._by_tenant: Dict[str, ScoringConfig] = {
+            tenant: self.profiles[profile] for tenant, profile in self.tenant_profiles.items()
+        }
+
+        self.version = hashlib.sha1(json.dumps(self.as_dict(), sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.source = source
+        # Shared by every worker serving this configuration, unlike loaded_at
+        self.modified_at = modified_at if modified_at is not None else _DEFAULTS_MODIFIED_AT
+        self.loaded_at = time.time()
+
+    def profile_for(self, tenant: Optional[str] = None, niche: Optional[str] = None) -> "ScoringConfig":
+        """
+        Select the profile for a request
+
+        Args:
+            tenant: Tenant identifier, if any
+            niche: Creator niche, if any
+
+        Returns:
+            The tenant's profile, else the niche's, else this configuration
+        """
+        return self._by_tenant.get(tenant) or self._by_niche.get(niche) or self
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Configuration sections in the file format"""
+        sections = {
+            "weights": self.weights,
+            "tiers": self.tiers,
+            "revenue_kpis": self.revenue_kpis,
+            "normalization_ranges": {metric: list(bounds) for metric, bounds in self.normalization_ranges.items()},
+            "bottleneck_thresholds": self.bottleneck_thresholds,
+        }
+        if self.profiles:
+            sections["profiles"] = {name: profile.as_dict() for name, profile in self.profiles.items()}
+            sections["niche_profiles"] = self.niche_profiles
+            sections["tenant_profiles"] = self.tenant_profiles
+        return sections
+
+
+def default_config_data() -> Dict[str, Any]:
+    """Built-in configuration: the settings' weights and tiers and the metric_value_ranges tables"""
+    return {
+        "weights": dict(settings.KPI_WEIGHTS),
+        "tiers": {
+            "tier_1": list(settings.TIER_1_KPIS),
+            "tier_2": list(settings.TIER_2_KPIS),
+            "tier_3": list(settings.TIER_3_KPIS),
+        },
+        "revenue_kpis": list(settings.REVENUE_KPIS),
+        "normalization_ranges": {metric: list(bounds) for metric, bounds in NORMALIZATION_RANGES.items()},
+        "bottleneck_thresholds": {metric: dict(entry) for metric, entry in BOTTLENECK_THRESHOLDS.items()},
+    }
+
+
+def _number(value: Any) -> Optional[float]:
+    """Value as a finite float, or None if it is not a finite number"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _scorer_list(value: Any, scorers: Mapping[str, float], label: str, problems: List[str]) -> List[str]:
+    """Validate a list of distinct scorer names"""
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        problems.append(f"{label}: expected a list of scorer names")
+        return []
+    unknown = [name for name in value if name not in scorers]
+    if unknown:
+        problems.append(f"{label}: unknown scorers {unknown}")
+    if len(set(value)) != len(value):
+        problems.append(f"{label}: duplicate scorers")
+    return value
+
+
+def _merge_sections(data: Dict[str, Any], overrides: Mapping[str, Any], prefix: str,
+                    problems: List[str]) -> Dict[str, Any]:
+    """
+    Merge and validate the profile sections of overrides into data (in place)
+
+    Args:
+        data: Complete configuration to start from
+        overrides: Sections to apply (any subset of PROFILE_SECTIONS)
+        prefix: Prefix of problem messages, e.g. "profiles.beauty."
+        problems: List collecting problems found
+
+    Returns:
+        data
+    """
+    # Weights: one finite, non-negative number per scorer, summing to 1
+    weights = overrides.get("weights", {})
+    if not isinstance(weights, Mapping):
+        problems.append(f"{prefix}weights: expected an object")
+        weights = {}
+    for name, value in weights.items():
+        weight = _number(value)
+        if name not in data["weights"]:
+            problems.append(f"{prefix}weights: unknown scorer {name!r}")
+        elif weight is None or weight < 0:
+            problems.append(f"{prefix}weights.{name}: expected a non-negative number, got {value!r}")
+        else:
+            data["weights"][name] = weight
+    total = sum(data["weights"].values())
+    if abs(total - 1.0) > WEIGHT_SUM_TOLERANCE:
+        problems.append(f"{prefix}weights: must sum to 1.0, got {total:.6f}")
+
+    # Tiers: every scorer in exactly one tier
+    tiers = overrides.get("tiers", {})
+    if not isinstance(tiers, Mapping):
+        problems.append(f"{prefix}tiers: expected an object")
+        tiers = {}
+    for tier, names in tiers.items():
+        if tier not in TIERS:
+            problems.append(f"{prefix}tiers: unknown tier {tier!r} (expected {list(TIERS)})")
+        else:
+            data["tiers"][tier] = _scorer_list(names, data["weights"], f"{prefix}tiers.{tier}", problems)
+    assigned = [name for tier in TIERS for name in data["tiers"][tier]]
+    duplicated = sorted({name for name in assigned if assigned.count(name) > 1})
+    unassigned = [name for name in data["weights"] if name not in assigned]
+    if duplicated:
+        problems.append(f"{prefix}tiers: scorers in more than one tier {duplicated}")
+    if unassigned:
+        problems.append(f"{prefix}tiers: scorers in no tier {unassigned}")
+
+    if "revenue_kpis" in overrides:
+        data["revenue_kpis"] = _scorer_list(overrides["revenue_kpis"], data["weights"], f"{prefix}revenue_kpis",
+                                            problems)
+    if not data["revenue_kpis"]:
+        problems.append(f"{prefix}revenue_kpis: at least one scorer is required")
+
+    # Normalization ranges: [min, max] with min < max
+    ranges = overrides.get("normalization_ranges", {})
+    if not isinstance(ranges, Mapping):
+        problems.append(f"{prefix}normalization_ranges: expected an object")
+        ranges = {}
+    for metric, value in ranges.items():
+        bounds = [_number(bound) for bound in value] if isinstance(value, list) and len(value) == 2 else None
+        if metric not in data["normalization_ranges"]:
+            problems.append(f"{prefix}normalization_ranges: unknown metric {metric!r}")
+        elif bounds is None or None in bounds or bounds[0] >= bounds[1]:
+            problems.append(
+                f"{prefix}normalization_ranges.{metric}: expected [min, max] with min < max, got {value!r}"
+            )
+        else:
+            data["normalization_ranges"][metric] = bounds
+
+    # Bottleneck thresholds: "severe" at least as far from healthy as "threshold"
+    thresholds = overrides.get("bottleneck_thresholds", {})
+    if not isinstance(thresholds, Mapping):
+        problems.append(f"{prefix}bottleneck_thresholds: expected an object")
+        thresholds = {}
+    for metric, entry in thresholds.items():
+        if metric not in data["bottleneck_thresholds"]:
+            problems.append(f"{prefix}bottleneck_thresholds: unknown metric {metric!r}")
+            continue
+        if not isinstance(entry, Mapping) or not entry or any(key not in ("threshold", "severe") for key in entry):
+            problems.append(
+                f"{prefix}bottleneck_thresholds.{metric}: expected an object with threshold and/or severe"
+            )
+            continue
+        for key, value in entry.items():
+            number = _number(value)
+            if number is None:
+                problems.append(
+                    f"{prefix}bottleneck_thresholds.{metric}.{key}: expected a number, got {value!r}"
+                )
+            else:
+                data["bottleneck_thresholds"][metric][key] = number
+    for metric, entry in data["bottleneck_thresholds"].items():
+        worse_than = entry["severe"] >= entry["threshold"] if metric in HIGHER_IS_WORSE else \
+            entry["severe"] <= entry["threshold"]
+        if not worse_than:
+            problems.append(f"{prefix}bottleneck_thresholds.{metric}: severe {entry['severe']} is less extreme than "
+                            f"threshold {entry['threshold']}")
+
+    return data
+
+
+def compile_config(overrides: Mapping[str, Any], source: Optional[str] = None,
+                   modified_at: Optional[float] = None) -> ScoringConfig:
+    """
+    Merge overrides over the built-in configuration, validate and compile them
+
+    Weights, normalization ranges and bottleneck thresholds are merged per
+    entry (thresholds per field), tiers per tier; revenue_kpis is replaced.
+    Profiles are merged the same way over the resulting configuration.
+
+    Args:
+        overrides: Parsed configuration file (any subset of SECTIONS)
+        source: File the overrides were read from
+        modified_at: Modification time of that file
+
+    Returns:
+        Compiled configuration, with its compiled profiles
+
+    Raises:
+        ValueError: Listing every problem found
+    """
+    if not isinstance(overrides, Mapping):
+        raise ValueError("Scoring configuration must be a JSON object")
+    problems: List[str] = []
+    unknown = [key for key in overrides if key not in SECTIONS]
+    if unknown:
+        problems.append(f"unknown sections {unknown} (expected {list(SECTIONS)})")
+    data = _merge_sections(default_config_data(), overrides, "", problems)
+
+    # Profiles: overrides of the configuration above, each validated on its own
+    profile_overrides = overrides.get("profiles", {})
+    if not isinstance(profile_overrides, Mapping):
+        problems.append("profiles: expected an object")
+        profile_overrides = {}
+    profile_data = {}
+    for name, sections in profile_overrides.items():
+        if not name or name == DEFAULT_PROFILE:
+            problems.append(f"profiles: invalid profile name {name!r}")
+        elif not isinstance(sections, Mapping):
+            problems.append(f"profiles.{name}: expected an object")
+        else:
+            unknown = [key for key in sections if key not in PROFILE_SECTIONS]
+            if unknown:
+                problems.append(f"profiles.{name}: unknown sections {unknown} (expected {list(PROFILE_SECTIONS)})")
+            profile_data[name] = _merge_sections(deepcopy(data), sections, f"profiles.{name}.", problems)
+
+    # Niche and tenant mappings to existing profiles
+    mappings = {}
+    for section in ("niche_profiles", "tenant_profiles"):
+        mapping = overrides.get(section, {})
+        if not isinstance(mapping, Mapping) or not all(isinstance(value, str) for value in mapping.values()):
+            problems.append(f"{section}: expected an object of profile names")
+            mapping = {}
+        unknown = sorted({value for value in mapping.values() if value not in profile_data})
+        if unknown:
+            problems.append(f"{section}: unknown profiles {unknown}")
+        mappings[section] = mapping
+
+    if problems:
+        raise ValueError("Invalid scoring configuration: " + "; ".join(problems))
+    profiles = {
+        name: ScoringConfig(sections, name=name, source=source, modified_at=modified_at)
+        for name, sections in profile_data.items()
+    }
+    return ScoringConfig(data, source=source, modified_at=modified_at, profiles=profiles, **mappings)
+
+
+class ScoringConfigManager:
+    """
+    Holds the active ScoringConfig and reloads it when the configuration file changes
+    """
+
+    def __init__(self):
+        """Start from the built-in configuration (no file watched until configured)"""
+        self.current: ScoringConfig = compile_config({})
+        self.path: Optional[str] = None
+        self.poll_interval = 2.0
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._reload_lock = threading.Lock()
+        self._local = threading.local()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.checks = 0
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def active(self) -> ScoringConfig:
+        """Profile being scored on this thread (see using()), else the current configuration"""
+        return getattr(self._local, "config", None) or self.current
+
+    def select(self, data: Mapping[str, Any]) -> ScoringConfig:
+        """
+        Profile for one creator's data
+
+        Inside using(), the bound profile is returned instead, so every step
+        of a request keeps the snapshot taken when it started, even if a
+        reload swaps the current configuration meanwhile.
+
+        Args:
+            data: Creator record; its tenant_id and niche select the profile
+
+        Returns:
+            The profile bound to this thread, else the tenant's profile, else
+            the niche's, else the current configuration
+        """
+        bound = getattr(self._local, "config", None)
+        if bound is not None:
+            return bound
+        return self.current.profile_for(data.get("tenant_id"), data.get("niche"))
+
+    @contextmanager
+    def using(self, config: ScoringConfig) -> Iterator[ScoringConfig]:
+        """
+        Make a profile the one scorers on this thread read their weights and ranges from
+
+        Args:
+            config: Profile selected for the data being scored
+
+        Yields:
+            The profile
+        """
+        previous = getattr(self._local, "config", None)
+        self._local.config = config
+        try:
+            yield config
+        finally:
+            self._local.config = previous
+
+    def configure(self, path: Optional[str], poll_interval: float) -> None:
+        """
+        Set the watched file and load it
+
+        Args:
+            path: JSON configuration file; empty or None keeps the built-in configuration
+            poll_interval: Seconds between modification checks
+
+        Raises:
+            ValueError: If the file exists but is invalid, so a broken file
+                stops startup instead of being ignored
+        """
+        self.path = path or None
+        self.poll_interval = poll_interval
+        self._signature = None
+        if self.path is not None and os.path.exists(self.path):
+            self.reload()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Modification time, size and inode of the file (None if missing)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def reload(self) -> ScoringConfig:
+        """
+        Load, validate and compile the file, then swap it in
+
+        Returns:
+            The new active configuration
+
+        Raises:
+            ValueError: If the file cannot be read or is invalid (the active
+                configuration is kept)
+        """
+        if self.path is None:
+            raise ValueError("No scoring configuration file configured")
+        with self._reload_lock:
+            signature = self._stat_signature()
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    overrides = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Cannot read scoring configuration {self.path}: {e}") from e
+            finally:
+                # A file that failed is not retried until it changes again
+                self._signature = signature
+            config = compile_config(overrides, source=self.path,
+                                    modified_at=signature[0] / 1e9 if signature else None)
+            previous, self.current = self.current, config
+            self.reloads += 1
+            self.last_error = None
+        if config.version != previous.version:
+            logger.info(f"Scoring configuration {config.version} loaded from {self.path} "
+                        f"(was {previous.version})")
+        return config
+
+    def check(self) -> bool:
+        """
+        Reload the file if its modification time, size or inode changed
+
+        Returns:
+            True if a new configuration was swapped in
+        """
+        if self.path is None:
+            return False
+        self.checks += 1
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            self.reload()
+        except ValueError as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.error(f"Scoring configuration not reloaded, keeping {self.current.version}: {e}")
+            errors.inc("scoring_config")
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start polling the file (no-op without a file or if already running)"""
+        if self.path is None or self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="scoring-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Check the file every poll interval"""
+        while not self._stopping.wait(self.poll_interval):
+            self.check()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get watcher statistics
+
+        Returns:
+            Dictionary with the active version and source, and check, reload and failure counts
+        """
+        return {
+            "version": self.current.version,
+            "profiles": sorted(self.current.profiles),
+            "source": self.current.source,
+            "modified_at": self.current.modified_at,
+            "loaded_at": self.current.loaded_at,
+            "watching": self._thread is not None,
+            "path": self.path,
+            "poll_interval_seconds": self.poll_interval,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+# Active scoring configuration of this process
+scoring_config = ScoringConfigManager()
@@ -0,0 +1,5 @@
+"""
+Ingestion module for TikTok Metrics AI Agent
+(Column-wise validation of bulk creator metrics and per-creator aggregation
+of raw TikTok video exports, for batch scoring)
+"""
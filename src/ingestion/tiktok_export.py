@@ -0,0 +1,235 @@
+"""
+Raw TikTok per-video exports, aggregated per creator for batch scoring
+
+Exports list one row per video with raw counts (views, likes, comments,
+shares, impressions, seconds watched) and the video's duration. The scorers
+expect creator-level ratios instead, so this stage:
+
+1. reads the export into NumPy columns (CSV with np.loadtxt, Parquet with
+   pyarrow when installed);
+2. groups the videos by creator with np.unique and sums every count per
+   creator with np.bincount;
+3. derives the scorer inputs from the sums:
+
+   - likes_ratio, comments_ratio, shares_ratio: per view;
+   - avg_watch_time: seconds watched per view;
+   - video_duration: duration of the videos, weighted by their views (the
+     plain mean for creators without views);
+   - retention_rate: share of the viewed durations actually watched,
+     capped at 1 when rewatches exceed them;
+   - impression_rate: interactions (likes, comments and shares) per
+     impression, the scale of its normalization range.
+
+Creators keep the order of their first video. The result is validated with
+validate_columns(), whose columns go straight to BatchScorer.score_columns;
+no step loops over videos in Python. Run from the repository root to score
+an export:
+
+    python -m src.ingestion.tiktok_export videos.csv --output scores.jsonl
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from typing import Dict, Mapping, Optional, Sequence, TextIO, Union
+
+import numpy as np
+
+from src.ingestion.validation import BulkValidation, validate_columns
+from src.utils.lazy_imports import optional_import
+
+
+# Raw count columns, summed per creator
+COUNT_FIELDS: Sequence[str] = ("views", "likes", "comments", "shares", "impressions", "watch_seconds")
+
+# Every numeric column an export must have
+NUMERIC_FIELDS: Sequence[str] = (*COUNT_FIELDS, "duration_seconds")
+
+# Creator-level text columns; niche and tenant_id are optional and taken from the creator's first video
+TEXT_FIELDS: Sequence[str] = ("creator_id", "niche", "tenant_id")
+
+# Export header (lowercase, non-alphanumerics as "_") -> column name
+COLUMN_ALIASES: Dict[str, str] = {
+    "creator_id": "creator_id", "creator": "creator_id", "author_id": "creator_id", "username": "creator_id",
+    "niche": "niche", "category": "niche",
+    "tenant_id": "tenant_id",
+    "views": "views", "video_views": "views", "play_count": "views",
+    "likes": "likes", "like_count": "likes",
+    "comments": "comments", "comment_count": "comments",
+    "shares": "shares", "share_count": "shares",
+    "impressions": "impressions",
+    "watch_seconds": "watch_seconds", "total_play_time": "watch_seconds", "total_watch_time": "watch_seconds",
+    "duration_seconds": "duration_seconds", "video_duration": "duration_seconds", "duration": "duration_seconds",
+}
+
+Source = Union[str, os.PathLike, TextIO]
+
+
+def _column_name(header: str) -> Optional[str]:
+    """Column name of an export header, None for columns this stage does not use"""
+    return COLUMN_ALIASES.get(re.sub(r"[^0-9a-z]+", "_", header.strip().lower()).strip("_"))
+
+
+def _read_csv(source: Source) -> Dict[str, np.ndarray]:
+    """Read the used columns of a CSV export"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            return _read_csv(f)
+
+    header = next(csv.reader([source.readline()]), [])
+    positions = {}
+    for position, title in enumerate(header):
+        name = _column_name(title)
+        if name is not None:
+            positions.setdefault(name, position)
+    missing = [name for name in ("creator_id", *NUMERIC_FIELDS) if name not in positions]
+    if missing:
+        raise ValueError(f"Export is missing columns {missing} (header: {header})")
+
+    # Both passes parse in C; the text columns are read apart from the numbers
+    lines = source.read().splitlines()
+    text = [name for name in TEXT_FIELDS if name in positions]
+    if not lines:
+        return {**{name: np.empty(0) for name in NUMERIC_FIELDS}, **{name: np.empty(0, dtype=str) for name in text}}
+    numeric = [positions[name] for name in NUMERIC_FIELDS]
+    try:
+        numbers = np.loadtxt(lines, delimiter=",", quotechar='"', usecols=numeric, dtype=np.float64, ndmin=2)
+        strings = np.loadtxt(lines, delimiter=",", quotechar='"', usecols=[positions[name] for name in text],
+                             dtype=str, ndmin=2)
+    except ValueError as e:
+        raise ValueError(f"Export has a short row or a non-numeric count or duration: {e}") from None
+
+    columns = {name: numbers[:, index] for index, name in enumerate(NUMERIC_FIELDS)}
+    columns.update({name: strings[:, index] for index, name in enumerate(text)})
+    return columns
+
+
+def _read_parquet(path: Union[str, os.PathLike]) -> Dict[str, np.ndarray]:
+    """Read the used columns of a Parquet export (needs pyarrow)"""
+    parquet = optional_import("pyarrow.parquet")
+    if parquet is None:
+        raise RuntimeError("Parquet exports need pyarrow: pip install pyarrow")
+    table = parquet.read_table(path)
+    columns = {}
+    for title, column in zip(table.column_names, table.columns):
+        name = _column_name(title)
+        if name is not None and name not in columns:
+            values = column.to_numpy()
+            columns[name] = values.astype(np.float64) if name in NUMERIC_FIELDS else values.astype(str)
+    missing = [name for name in ("creator_id", *NUMERIC_FIELDS) if name not in columns]
+    if missing:
+        raise ValueError(f"Export is missing columns {missing} (columns: {table.column_names})")
+    return columns
+
+
+def read_export(source: Source) -> Dict[str, np.ndarray]:
+    """
+    Read a per-video export
+
+    Args:
+        source: Path of a .csv or .parquet file, or an open CSV text stream
+
+    Returns:
+        Column name -> one value per video: the NUMERIC_FIELDS as float64,
+        creator_id and, if present, niche and tenant_id as strings
+
+    Raises:
+        ValueError: If required columns are missing, rows are short or
+            counts are not numbers
+    """
+    if isinstance(source, (str, os.PathLike)) and os.fspath(source).endswith(".parquet"):
+        return _read_parquet(source)
+    return _read_csv(source)
+
+
+def aggregate_by_creator(videos: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Aggregate per-video counts into creator-level scorer inputs
+
+    Args:
+        videos: Per-video columns (see read_export)
+
+    Returns:
+        Columns with one value per creator, in order of first appearance:
+        creator_id, niche and tenant_id when given, video_count, the summed
+        COUNT_FIELDS and the derived metrics (see the module docstring)
+    """
+    ids, first, inverse = np.unique(videos["creator_id"], return_index=True, return_inverse=True)
+    # Renumber the creators by first appearance
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    group = rank[inverse.reshape(-1)]
+    creators = ids.size
+
+    def total(values: np.ndarray) -> np.ndarray:
+        return np.bincount(group, weights=values, minlength=creators)
+
+    def per(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(numerator, denominator, out=np.zeros(creators), where=denominator != 0)
+
+    columns: Dict[str, np.ndarray] = {"creator_id": ids[order]}
+    for name in ("niche", "tenant_id"):
+        if name in videos:
+            columns[name] = np.asarray(videos[name])[first[order]]
+    columns["video_count"] = np.bincount(group, minlength=creators)
+    sums = {name: total(np.asarray(videos[name], dtype=np.float64)) for name in COUNT_FIELDS}
+    columns.update(sums)
+
+    views = sums["views"]
+    viewed_seconds = total(np.asarray(videos["views"], dtype=np.float64) * videos["duration_seconds"])
+    columns["likes_ratio"] = per(sums["likes"], views)
+    columns["comments_ratio"] = per(sums["comments"], views)
+    columns["shares_ratio"] = per(sums["shares"], views)
+    columns["avg_watch_time"] = per(sums["watch_seconds"], views)
+    columns["video_duration"] = np.where(views > 0, per(viewed_seconds, views),
+                                         per(total(videos["duration_seconds"]), columns["video_count"]))
+    columns["retention_rate"] = np.minimum(per(sums["watch_seconds"], viewed_seconds), 1.0)
+    columns["impression_rate"] = per(sums["likes"] + sums["comments"] + sums["shares"], sums["impressions"])
+    return columns
+
+
+def load_export(source: Source) -> BulkValidation:
+    """
+    Read, aggregate and validate an export, ready for batch scoring
+
+    Args:
+        source: Path of a .csv or .parquet file, or an open CSV text stream
+
+    Returns:
+        Validated creator metrics; columns() is the input of
+        BatchScorer.score_columns, records() that of a batch job
+    """
+    return validate_columns(aggregate_by_creator(read_export(source)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Score an export and write one JSON line per creator"""
+    parser = argparse.ArgumentParser(description="Score creators from a raw TikTok per-video export")
+    parser.add_argument("export", help="Per-video export (.csv or .parquet)")
+    parser.add_argument("--output", help="JSON Lines output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    from src.api.responses import dumps_json
+    from src.processors.batch_scorer import BatchScorer
+
+    validation = load_export(args.export)
+    for error in validation.errors(limit=20):
+        print(f"skipped row {error['row']} ({error['creator_id']}): {error['errors']}", file=sys.stderr)
+    records = validation.records()
+    results = BatchScorer().score_records(records)
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        output.writelines(dumps_json(result) + b"\n" for result in results)
+    finally:
+        if args.output:
+            output.close()
+    print(f"{len(results)} creators scored, {validation.invalid_count} invalid", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Bulk validation of creator metrics, one column at a time
+
+Validating a large batch as CreatorMetrics models builds one Pydantic model
+per creator. validate_columns() applies the ingestion rules to whole
+columns with NumPy instead:
+
+- values are coerced to float64 (numbers, numeric strings, booleans);
+- missing values (None, or a column left out) take the metric's default
+  from METRIC_DEFAULTS;
+- NaN and infinities are rejected;
+- values outside the metric's METRIC_BOUNDS range are rejected, e.g. rates
+  outside [0, 1] or negative amounts;
+- creator_id is required (None and empty IDs are missing).
+
+The result holds one dense float64 array with a row per metric and a column
+per creator, a mask of the valid creators and a per-creator error report.
+Typed NumPy columns are checked without creating Python objects; lists are
+converted by NumPy and only fall back to converting value by value when
+some values are not numbers.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.metric_value_ranges import METRIC_BOUNDS, METRIC_DEFAULTS
+
+
+# Order of the metric rows of BulkValidation.values
+METRIC_FIELDS: Sequence[str] = tuple(METRIC_DEFAULTS)
+
+# Non-metric columns passed through to the records (creator_id is required)
+IDENTITY_FIELDS: Sequence[str] = ("creator_id", "niche", "tenant_id", "timestamp")
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+# Problem: (rows, field, message)
+Problem = Tuple[np.ndarray, str, str]
+
+
+class BulkValidation:
+    """
+    Validated metric columns of a batch of creators
+    """
+
+    def __init__(self, values: np.ndarray, valid: np.ndarray, identity: Dict[str, np.ndarray],
+                 problems: List[Problem]):
+        """
+        Initialize the result (see validate_columns)
+
+        Args:
+            values: float64 array of shape (len(METRIC_FIELDS), creators)
+            valid: Boolean mask of the creators without errors
+            identity: Identity field -> object or string array, for the fields provided
+            problems: Rows failing each check, with the field and message
+        """
+        self.values = values
+        self.valid = valid
+        self.identity = identity
+        self._problems = problems
+
+    @property
+    def size(self) -> int:
+        """Number of creators validated"""
+        return self.valid.size
+
+    @property
+    def invalid_count(self) -> int:
+        """Number of creators with at least one error"""
+        return self.size - int(np.count_nonzero(self.valid))
+
+    def columns(self, valid_only: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Metric columns, the input of BatchScorer.score_columns
+
+        Args:
+            valid_only: Leave out the creators with errors (copies the values)
+
+        Returns:
+            Metric name -> float64 array (views of values unless valid_only)
+        """
+        values = self.values[:, self.valid] if valid_only and self.invalid_count else self.values
+        return dict(zip(METRIC_FIELDS, values))
+
+    def errors(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Per-creator error report
+
+        Args:
+            limit: Report at most this many creators (the first rows)
+
+        Returns:
+            One entry per invalid creator, in row order: its row, creator_id
+            and field -> error message
+        """
+        if not self._problems:
+            return []
+        rows = np.concatenate([problem[0] for problem in self._problems])
+        problem_index = np.repeat(np.arange(len(self._problems)), [problem[0].size for problem in self._problems])
+        order = np.argsort(rows, kind="stable")
+        ids = self.identity.get("creator_id")
+
+        report: List[Dict[str, Any]] = []
+        entry: Dict[str, Any] = {}
+        for row, index in zip(rows[order].tolist(), problem_index[order].tolist()):
+            if row != entry.get("row"):
+                if limit is not None and len(report) >= limit:
+                    break
+                entry = {"row": row, "creator_id": None if ids is None else ids.item(row), "errors": {}}
+                report.append(entry)
+            _, field, message = self._problems[index]
+            entry["errors"][field] = message
+        return report
+
+    def records(self, valid_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Creator records with every metric filled in, e.g. for a batch job
+
+        Args:
+            valid_only: Leave out the creators with errors
+
+        Returns:
+            One dictionary per creator: its identity fields and metrics
+        """
+        rows = np.flatnonzero(self.valid) if valid_only else np.arange(self.size)
+        identity = [values[rows].tolist() for values in self.identity.values()]
+        metrics = self.values[:, rows].tolist()
+        names = [*self.identity, *METRIC_FIELDS]
+        return [dict(zip(names, row)) for row in zip(*identity, *metrics)]
+
+
+def _length(field: str, values: Any) -> int:
+    """Number of values in a column, ValueError if it is not a sequence"""
+    if isinstance(values, (str, bytes, Mapping)) or (isinstance(values, np.ndarray) and values.ndim != 1):
+        raise ValueError(f"{field}: expected a list of values")
+    try:
+        return len(values)
+    except TypeError:
+        raise ValueError(f"{field}: expected a list of values") from None
+
+
+def _coerce(values: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert one column to float64
+
+    Args:
+        values: NumPy array or sequence of values
+
+    Returns:
+        (float64 values, rows of missing values, rows of values that are not numbers)
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        return values.astype(np.float64, copy=False), _NO_ROWS, _NO_ROWS
+
+    not_numbers = _NO_ROWS
+    try:
+        floats = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError, OverflowError):
+        # Some values are not numbers: convert value by value to find them
+        floats = np.empty(len(values))
+        bad = []
+        for row, value in enumerate(values):
+            try:
+                floats[row] = np.nan if value is None else float(value)
+            except (TypeError, ValueError, OverflowError):
+                floats[row] = 0.0
+                bad.append(row)
+        not_numbers = np.array(bad, dtype=np.intp)
+
+    # None converts to NaN: look at the original values of the NaN rows only
+    nan_rows = np.flatnonzero(np.isnan(floats))
+    if nan_rows.size:
+        is_none = np.fromiter((values[row] is None for row in nan_rows.tolist()), dtype=bool, count=nan_rows.size)
+        return floats, nan_rows[is_none], not_numbers
+    return floats, _NO_ROWS, not_numbers
+
+
+def validate_columns(columns: Mapping[str, Any]) -> BulkValidation:
+    """
+    Validate a batch of creators given as columns
+
+    Columns other than the metrics and IDENTITY_FIELDS are ignored, like
+    unknown fields of CreatorMetrics.
+
+    Args:
+        columns: Field name -> NumPy array or list with one value per creator
+
+    Returns:
+        Dense metric values with defaults filled in, the valid-row mask and
+        the error report
+
+    Raises:
+        ValueError: If a column is not a list of values or the columns
+            differ in length
+    """
+    lengths = {
+        field: _length(field, values) for field, values in columns.items()
+        if field in METRIC_BOUNDS or field in IDENTITY_FIELDS
+    }
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Columns differ in length: {lengths}")
+    size = next(iter(lengths.values()), 0)
+
+    values = np.empty((len(METRIC_FIELDS), size))
+    valid = np.ones(size, dtype=bool)
+    problems: List[Problem] = []
+
+    def flag(rows: np.ndarray, field: str, message: str) -> None:
+        if rows.size:
+            valid[rows] = False
+            problems.append((rows, field, message))
+
+    # NumPy string columns are kept as they are (they hold no None), anything else becomes an object array
+    identity = {
+        field: columns[field] if isinstance(columns[field], np.ndarray) and columns[field].dtype.kind in "US"
+        else np.asarray(columns[field], dtype=object)
+        for field in IDENTITY_FIELDS if field in columns
+    }
+    if "creator_id" not in identity:
+        flag(np.arange(size), "creator_id", "missing")
+    else:
+        # Empty IDs, e.g. export rows without a creator, would all merge into one creator ""
+        ids = identity["creator_id"]
+        missing = ids == ""
+        if ids.dtype == object:
+            missing |= ids == None  # noqa: E711 (elementwise)
+        flag(np.flatnonzero(missing), "creator_id", "missing")
+
+    for index, field in enumerate(METRIC_FIELDS):
+        row = values[index]
+        default = METRIC_DEFAULTS[field]
+        if field not in columns:
+            row.fill(default)
+            continue
+        row[:], missing, not_numbers = _coerce(columns[field])
+        row[missing] = default
+        flag(not_numbers, field, "not a number")
+
+        # One pass for the common case: every value finite and in range (NaN fails both comparisons)
+        low, high = METRIC_BOUNDS[field]
+        in_range = (row >= low) & (row <= high)
+        if np.isinf(high) or np.isinf(low):
+            in_range &= np.abs(row) < np.inf
+        if in_range.all():
+            continue
+        bad = np.flatnonzero(~in_range)
+        bad_values = row[bad]
+        finite = np.isfinite(bad_values)
+        flag(bad[~finite], field, "not finite (NaN or infinity)")
+        flag(bad[finite & (bad_values < low)], field, f"below the minimum {low:g}")
+        flag(bad[finite & (bad_values > high)], field, f"above the maximum {high:g}")
+
+    return BulkValidation(values, valid, identity, problems)
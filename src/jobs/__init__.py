@@ -0,0 +1,4 @@
+"""
+Batch jobs for TikTok Metrics AI Agent
+(Durable job store and background worker pool for large scoring runs)
+"""
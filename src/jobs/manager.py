@@ -0,0 +1,303 @@
+"""
+Background worker pool processing batch jobs chunk by chunk
+"""
+
+import json
+import os
+import socket
+import threading
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import perf_counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from src.logger.logger import logger
+from src.monitoring.memory import MemoryRecorder, format_report, memory_stage, recording
+from src.monitoring.metrics import errors, stage_latency
+from .store import JobStore
+
+
+ChunkProcessor = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Render a stored epoch timestamp"""
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+class JobManager:
+    """
+    Claims jobs from the store and runs them on a thread pool
+
+    A dispatcher thread claims jobs while workers are free, woken by new
+    submissions or a poll interval (which also picks up jobs left behind by
+    a stopped process). Each job runs its chunks in order and checkpoints
+    after every chunk, so stopping at any point loses at most the chunk in
+    progress.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        processors: Dict[str, ChunkProcessor],
+        max_workers: int,
+        lease_seconds: float,
+        poll_interval: float,
+        memory_report_dir: Optional[str] = None,
+        memory_budget: Optional[Mapping[str, float]] = None
+    ):
+        """
+        Initialize the job manager (idle until started)
+
+        Args:
+            store: Job store
+            processors: Job kind -> function turning input records into results
+            max_workers: Jobs processed concurrently
+            lease_seconds: Lease duration, renewed after every chunk
+            poll_interval: Seconds between checks for claimable jobs
+            memory_report_dir: If set, trace allocations per stage of every job and
+                write a memory report per job to this directory
+            memory_budget: Stage -> allowed peak bytes per creator in memory reports
+        """
+        self.store = store
+        self.processors = processors
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.memory_report_dir = Path(memory_report_dir) if memory_report_dir else None
+        self.memory_budget = dict(memory_budget or {})
+        self._started_tracemalloc = False
+
+        self.owner: Optional[str] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._active = 0
+
+        self.chunks_processed = 0
+        self.items_processed = 0
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.memory_reports = 0
+        self.memory_reports_over_budget = 0
+
+    @property
+    def kinds(self) -> Sequence[str]:
+        """Supported job kinds"""
+        return tuple(self.processors)
+
+    def start(self) -> None:
+        """Start the dispatcher and worker pool (no-op if already running)"""
+        if self._dispatcher is not None:
+            return
+        # Identity is taken at start, i.e. after a pre-forking server has forked
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if self.memory_report_dir is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+        logger.info(f"Job manager started ({self.max_workers} workers, owner {self.owner})")
+
+    def stop(self) -> None:
+        """Stop after the chunks in progress; unfinished jobs are released for resumption"""
+        if self._dispatcher is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        self._dispatcher = None
+        self._executor = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        logger.info("Job manager stopped")
+
+    def submit(self, kind: str, records: List[Dict[str, Any]], chunk_size: int) -> Dict[str, Any]:
+        """
+        Store a new job and wake the dispatcher
+
+        Args:
+            kind: Job kind, one of kinds
+            records: Input records
+            chunk_size: Records per checkpointed chunk
+
+        Returns:
+            Job description
+        """
+        if kind not in self.processors:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {', '.join(self.kinds)}")
+        job = self.store.create_job(kind, records, chunk_size)
+        self._wakeup.set()
+        logger.info(f"Job {job['job_id']} queued: {kind}, {job['total_items']} items in {job['total_chunks']} chunks")
+        return self.describe(job)
+
+    def _dispatch_loop(self) -> None:
+        """Claim jobs while workers are free"""
+        while not self._stopping.is_set():
+            try:
+                while self._active < self.max_workers and not self._stopping.is_set():
+                    job = self.store.claim_next(self.owner, self.lease_seconds)
+                    if job is None:
+                        break
+                    with self._lock:
+                        self._active += 1
+                    self._executor.submit(self._run_job, job)
+            except Exception as e:
+                logger.error(f"Job dispatcher error: {e}")
+                errors.inc("jobs")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _run_job(self, job: Dict[str, Any]) -> None:
+        """Process a claimed job's remaining chunks"""
+        recorder = MemoryRecorder(self.memory_budget) if self.memory_report_dir is not None else None
+        with recording(recorder):
+            self._process_job(job)
+        if recorder is not None and recorder.stages:
+            self._write_memory_report(job, recorder)
+
+    def _process_job(self, job: Dict[str, Any]) -> None:
+        """Process a claimed job's remaining chunks, marking memory stages"""
+        job_id = job["job_id"]
+        kind = job["kind"]
+        try:
+            processor = self.processors[kind]
+            for chunk_index in self.store.pending_chunks(job_id):
+                if self._stopping.is_set():
+                    self.store.release_job(job_id, self.owner)
+                    return
+
+                start = perf_counter()
+                with memory_stage("ingest") as stage:
+                    records = self.store.load_chunk(job_id, chunk_index)
+                    stage.count(len(records))
+                results = processor(records)
+                with memory_stage("serialization", len(results)):
+                    completed = self.store.complete_chunk(job_id, chunk_index, results, self.owner,
+                                                          self.lease_seconds)
+                if not completed:
+                    logger.info(f"Job {job_id} cancelled or taken over, stopping")
+                    return
+                stage_latency.observe(perf_counter() - start, f"job_{kind}_chunk")
+
+                with self._lock:
+                    self.chunks_processed += 1
+                    self.items_processed += len(records)
+
+            if self.store.finish_job(job_id, self.owner, "completed"):
+                with self._lock:
+                    self.jobs_completed += 1
+                logger.info(f"Job {job_id} completed")
+
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            errors.inc("jobs")
+            with self._lock:
+                self.jobs_failed += 1
+            self.store.finish_job(job_id, self.owner, "failed", str(e))
+
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._wakeup.set()
+
+    def _write_memory_report(self, job: Dict[str, Any], recorder: MemoryRecorder) -> None:
+        """Write a job's memory report next to the others and log budget overruns"""
+        report = {"job_id": job["job_id"], "kind": job["kind"], "created_at": datetime.now().isoformat(),
+                  **recorder.report()}
+        try:
+            self.memory_report_dir.mkdir(parents=True, exist_ok=True)
+            (self.memory_report_dir / f"{job['job_id']}.json").write_text(json.dumps(report, indent=2))
+        except OSError as e:
+            logger.error(f"Could not write memory report for job {job['job_id']}: {e}")
+            return
+        with self._lock:
+            self.memory_reports += 1
+            self.memory_reports_over_budget += not report["within_budget"]
+        if report["within_budget"]:
+            logger.info(f"Job {job['job_id']} memory report:\n{format_report(report)}")
+        else:
+            logger.warning(f"Job {job['job_id']} exceeded its memory budget in "
+                           f"{', '.join(report['over_budget'])}:\n{format_report(report)}")
+
+    def memory_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a job's memory report
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The report, or None if memory profiling is off or the job has none
+        """
+        if self.memory_report_dir is None or Path(job_id).name != job_id:
+            return None
+        try:
+            return json.loads((self.memory_report_dir / f"{job_id}.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def describe(job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the API description of a job row
+
+        Args:
+            job: Job row
+
+        Returns:
+            Job status, progress and links
+        """
+        job_id = job["job_id"]
+        total_items = job["total_items"]
+        return {
+            "job_id": job_id,
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": {
+                "processed_items": job["processed_items"],
+                "total_items": total_items,
+                "completed_chunks": job["completed_chunks"],
+                "total_chunks": job["total_chunks"],
+                "percent": round(100.0 * job["processed_items"] / total_items, 2) if total_items else 100.0
+            },
+            "attempts": job["attempts"],
+            "error": job["error"],
+            "created_at": _isoformat(job["created_at"]),
+            "started_at": _isoformat(job["started_at"]),
+            "finished_at": _isoformat(job["finished_at"]),
+            "links": {
+                "status": f"/jobs/{job_id}",
+                "results": f"/jobs/{job_id}/results"
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get job statistics for this process and the shared store
+
+        Returns:
+            Dictionary with worker activity and job counts per status
+        """
+        return {
+            "running": self._dispatcher is not None,
+            "workers": self.max_workers,
+            "active_jobs": self._active,
+            "chunks_processed": self.chunks_processed,
+            "items_processed": self.items_processed,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "memory_profiling": self.memory_report_dir is not None,
+            "memory_reports": self.memory_reports,
+            "memory_reports_over_budget": self.memory_reports_over_budget,
+            "jobs_by_status": self.store.count_by_status()
+        }
@@ -0,0 +1,335 @@
+"""
+Durable SQLite store for batch jobs, their input chunks and results
+"""
+
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from src.api.responses import dumps_json, loads_json
+from src.storage.sqlite import SQLiteDatabase
+
+
+JOB_STATUSES: Sequence[str] = ("queued", "running", "completed", "failed", "cancelled")
+ACTIVE_STATUSES: Sequence[str] = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    total_chunks INTEGER NOT NULL,
+    processed_items INTEGER NOT NULL DEFAULT 0,
+    completed_chunks INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_chunks (
+    job_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    item_count INTEGER NOT NULL,
+    input BLOB,
+    output BLOB,
+    completed_at REAL,
+    PRIMARY KEY (job_id, chunk_index)
+) WITHOUT ROWID;
+"""
+
+
+class JobStore:
+    """
+    Job state, chunked inputs and per-chunk results in one SQLite database
+
+    Inputs are split into chunks at submission. A chunk's results are written
+    in the same transaction that advances the job's progress, so a completed
+    chunk is never scored twice: after a restart, processing resumes at the
+    first chunk without results.
+
+    Jobs are claimed with a lease (owner + expiry) that is renewed as chunks
+    complete. Several processes can share the database; a job whose owner
+    stopped renewing its lease is taken over by another worker.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store; the database is created on first use
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._db = SQLiteDatabase(path, _SCHEMA)
+        self._connection = self._db.connection
+
+    def create_job(self, kind: str, records: Sequence[Dict[str, Any]], chunk_size: int) -> Dict[str, Any]:
+        """
+        Store a new job with its input split into chunks
+
+        Args:
+            kind: Job kind (name of the chunk processor)
+            records: Input records
+            chunk_size: Records per chunk
+
+        Returns:
+            Job row
+        """
+        job_id = uuid.uuid4().hex
+        chunk_size = max(1, chunk_size)
+        chunks = [
+            (job_id, index, len(records[start:start + chunk_size]), dumps_json(records[start:start + chunk_size]))
+            for index, start in enumerate(range(0, len(records), chunk_size))
+        ]
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, total_items, total_chunks, created_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, len(records), len(chunks), time.time())
+            )
+            conn.executemany(
+                "INSERT INTO job_chunks (job_id, chunk_index, item_count, input) VALUES (?, ?, ?, ?)",
+                chunks
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job row
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job row as a dictionary, or None if unknown
+        """
+        row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        List the most recently created jobs
+
+        Args:
+            limit: Maximum number of jobs
+
+        Returns:
+            Job rows, newest first
+        """
+        rows = self._connection().execute(
+            "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Count jobs per status
+
+        Returns:
+            Dictionary of status -> job count (every status present)
+        """
+        counts = {status: 0 for status in JOB_STATUSES}
+        for row in self._connection().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def claim_next(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest job that is queued or whose lease has expired
+
+        Args:
+            owner: Claiming worker's identity
+            lease_seconds: Lease duration
+
+        Returns:
+            Claimed job row, or None if nothing is claimable
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN ('queued', 'running') "
+                "AND (lease_until IS NULL OR lease_until < ?) ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', lease_owner = ?, lease_until = ?, "
+                    "started_at = COALESCE(started_at, ?), attempts = attempts + 1 WHERE job_id = ?",
+                    (owner, now + lease_seconds, now, row["job_id"])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get_job(row["job_id"]) if row is not None else None
+
+    def pending_chunks(self, job_id: str) -> List[int]:
+        """
+        Get the indexes of chunks without results
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Chunk indexes in order
+        """
+        rows = self._connection().execute(
+            "SELECT chunk_index FROM job_chunks WHERE job_id = ? AND output IS NULL ORDER BY chunk_index",
+            (job_id,)
+        ).fetchall()
+        return [row["chunk_index"] for row in rows]
+
+    def load_chunk(self, job_id: str, chunk_index: int) -> List[Dict[str, Any]]:
+        """
+        Load a chunk's input records
+
+        Args:
+            job_id: Job ID
+            chunk_index: Chunk index
+
+        Returns:
+            Input records
+        """
+        row = self._connection().execute(
+            "SELECT input FROM job_chunks WHERE job_id = ? AND chunk_index = ?", (job_id, chunk_index)
+        ).fetchone()
+        return loads_json(row["input"])
+
+    def complete_chunk(self, job_id: str, chunk_index: int, results: Sequence[Dict[str, Any]],
+                       owner: str, lease_seconds: float) -> bool:
+        """
+        Checkpoint a chunk's results and advance the job's progress atomically
+
+        Args:
+            job_id: Job ID
+            chunk_index: Chunk index
+            results: One result per input record
+            owner: Worker holding the lease
+            lease_seconds: Lease extension from now
+
+        Returns:
+            False if the job was cancelled or its lease was taken over
+        """
+        output = b"".join(dumps_json(result) + b"\n" for result in results)
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            owned = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                (now + lease_seconds, job_id, owner)
+            ).rowcount
+            if owned:
+                written = conn.execute(
+                    "UPDATE job_chunks SET output = ?, completed_at = ? "
+                    "WHERE job_id = ? AND chunk_index = ? AND output IS NULL",
+                    (output, now, job_id, chunk_index)
+                ).rowcount
+                if written:
+                    conn.execute(
+                        "UPDATE jobs SET processed_items = processed_items + ?, "
+                        "completed_chunks = completed_chunks + 1 WHERE job_id = ?",
+                        (len(results), job_id)
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(owned)
+
+    def finish_job(self, job_id: str, owner: str, status: str, error: Optional[str] = None) -> bool:
+        """
+        Mark a running job as finished and release its lease
+
+        Inputs of completed jobs are dropped; only results are kept.
+
+        Args:
+            job_id: Job ID
+            owner: Worker holding the lease
+            status: Final status ("completed" or "failed")
+            error: Error message for failed jobs
+
+        Returns:
+            False if the job was no longer owned by this worker
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                (status, error, time.time(), job_id, owner)
+            ).rowcount
+            if updated and status == "completed":
+                conn.execute("UPDATE job_chunks SET input = NULL WHERE job_id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(updated)
+
+    def release_job(self, job_id: str, owner: str) -> None:
+        """
+        Give up a running job's lease so any worker can resume it immediately
+
+        Args:
+            job_id: Job ID
+            owner: Worker holding the lease
+        """
+        self._connection().execute(
+            "UPDATE jobs SET lease_owner = NULL, lease_until = NULL "
+            "WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+            (job_id, owner)
+        )
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job; a running chunk finishes but is discarded
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the job was active and is now cancelled
+        """
+        updated = self._connection().execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ?, lease_owner = NULL, lease_until = NULL "
+            "WHERE job_id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        ).rowcount
+        return bool(updated)
+
+    def iter_results(self, job_id: str) -> Iterator[bytes]:
+        """
+        Iterate over a job's results as JSON Lines, one block per chunk
+
+        Each chunk is fetched with its own query, so the iterator may be
+        advanced from different threads (as StreamingResponse does).
+
+        Args:
+            job_id: Job ID
+
+        Yields:
+            Encoded result lines of consecutive chunks
+        """
+        job = self.get_job(job_id)
+        for chunk_index in range(job["total_chunks"] if job else 0):
+            row = self._connection().execute(
+                "SELECT output FROM job_chunks WHERE job_id = ? AND chunk_index = ?", (job_id, chunk_index)
+            ).fetchone()
+            if row is not None and row["output"] is not None:
+                yield row["output"]
@@ -0,0 +1,4 @@
+"""
+Monitoring module for TikTok Metrics AI Agent
+(Metrics and instrumentation for the scoring pipeline)
+"""
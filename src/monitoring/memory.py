@@ -0,0 +1,302 @@
+"""
+Per-stage memory accounting for batch jobs
+
+A MemoryRecorder measures each pipeline stage (ingest, scoring,
+recommendations, serialization) with tracemalloc:
+
+- the peak bytes allocated above the level at stage entry;
+- the bytes still held at stage exit;
+- the same two figures divided by the creators processed.
+
+The first calls of each stage also take tracemalloc snapshots at entry and
+exit, and the difference names the source lines that allocated the most.
+The report compares the peak bytes per creator of each stage with a budget
+and includes the process' peak RSS.
+
+Stages are marked with memory_stage(), which is a no-op unless the calling
+thread is recording. tracemalloc is process-wide, so allocations made by
+other threads during a stage are attributed to it; run one job worker for
+clean numbers.
+"""
+
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+_local = threading.local()
+
+# Allocations made by tracemalloc and this module while taking snapshots
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None where unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class _NoopStage:
+    """Stage context used when the current thread is not recording"""
+
+    def __enter__(self) -> "_NoopStage":
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, items: int) -> None:
+        """Ignored"""
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _StageContext:
+    """Measures one call of a stage"""
+
+    __slots__ = ("recorder", "name", "items", "snapshot", "start_bytes")
+
+    def __init__(self, recorder: "MemoryRecorder", name: str, items: int):
+        self.recorder = recorder
+        self.name = name
+        self.items = items
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def count(self, items: int) -> None:
+        """Set the number of creators processed, if not known at entry"""
+        self.items = items
+
+    def __enter__(self) -> "_StageContext":
+        if self.recorder.wants_snapshot(self.name):
+            self.snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        self.recorder.observe_peak(peak)
+        tracemalloc.reset_peak()
+        self.start_bytes = current
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        current, peak = tracemalloc.get_traced_memory()
+        top = None
+        if self.snapshot is not None:
+            top = self.recorder.top_allocations(tracemalloc.take_snapshot(), self.snapshot)
+        self.recorder.record(self.name, self.items, peak - self.start_bytes, current - self.start_bytes, peak, top)
+        return False
+
+
+class MemoryRecorder:
+    """
+    Accumulates per-stage allocation statistics and builds a budget report
+    """
+
+    def __init__(self, budget: Optional[Mapping[str, float]] = None, snapshot_calls: int = 1, top: int = 10):
+        """
+        Initialize an empty recorder
+
+        Args:
+            budget: Stage -> allowed peak bytes per creator
+            snapshot_calls: Calls per stage that take tracemalloc snapshots
+            top: Allocation sites listed per stage
+        """
+        self.budget = dict(budget or {})
+        self.snapshot_calls = snapshot_calls
+        self.top = top
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.peak_traced = 0
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, items: int = 0) -> _StageContext:
+        """
+        Context manager measuring one call of a stage
+
+        Args:
+            name: Stage name
+            items: Creators processed by the call (or set later with count())
+
+        Returns:
+            Stage context
+        """
+        return _StageContext(self, name, items)
+
+    def wants_snapshot(self, name: str) -> bool:
+        """Whether the next call of a stage takes snapshots"""
+        stage = self.stages.get(name)
+        return (stage["snapshots"] if stage else 0) < self.snapshot_calls
+
+    def observe_peak(self, peak: int) -> None:
+        """Keep the highest traced memory seen (reset_peak clears tracemalloc's own)"""
+        self.peak_traced = max(self.peak_traced, peak)
+
+    def top_allocations(self, after: tracemalloc.Snapshot, before: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """Source lines whose allocations grew the most between two snapshots"""
+        differences = after.filter_traces(_SNAPSHOT_FILTERS).compare_to(
+            before.filter_traces(_SNAPSHOT_FILTERS), "lineno"
+        )
+        root = os.getcwd() + os.sep
+        return [
+            {
+                "location": f"{difference.traceback[0].filename.replace(root, '')}:{difference.traceback[0].lineno}",
+                "size_diff_bytes": difference.size_diff,
+                "count_diff": difference.count_diff,
+            }
+            for difference in differences[:self.top] if difference.size_diff > 0
+        ]
+
+    def record(self, name: str, items: int, peak: int, retained: int, traced_peak: int,
+               top: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        Add one stage call
+
+        Args:
+            name: Stage name
+            items: Creators processed
+            peak: Peak bytes allocated above the stage entry level
+            retained: Bytes still allocated at exit, relative to entry
+            traced_peak: Absolute traced peak during the call
+            top: Allocation sites from snapshots, if taken
+        """
+        with self._lock:
+            self.observe_peak(traced_peak)
+            stage = self.stages.setdefault(name, {
+                "calls": 0, "items": 0, "peak_bytes": 0, "peak_bytes_per_creator": 0.0,
+                "retained_bytes": 0, "rss_bytes": None, "snapshots": 0, "top_allocations": []
+            })
+            stage["calls"] += 1
+            stage["items"] += items
+            stage["peak_bytes"] = max(stage["peak_bytes"], peak)
+            if items:
+                stage["peak_bytes_per_creator"] = max(stage["peak_bytes_per_creator"], peak / items)
+            stage["retained_bytes"] += retained
+            rss = rss_bytes()
+            if rss is not None:
+                stage["rss_bytes"] = max(stage["rss_bytes"] or 0, rss)
+            if top is not None:
+                stage["snapshots"] += 1
+                # Keep the sites of the snapshotted call with the highest peak
+                if not stage["top_allocations"] or peak >= stage.get("_snapshot_peak", 0):
+                    stage["top_allocations"] = top
+                    stage["_snapshot_peak"] = peak
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the memory report
+
+        Returns:
+            Per-stage statistics with their budget, the peak traced memory and
+            peak RSS, and the stages over budget
+        """
+        with self._lock:
+            stages = {}
+            over_budget = []
+            for name, stage in self.stages.items():
+                entry = {key: value for key, value in stage.items() if not key.startswith("_")}
+                entry["retained_bytes_per_creator"] = stage["retained_bytes"] / stage["items"] if stage["items"] else 0.0
+                budget = self.budget.get(name)
+                entry["budget_bytes_per_creator"] = budget
+                entry["within_budget"] = budget is None or stage["peak_bytes_per_creator"] <= budget
+                if not entry["within_budget"]:
+                    over_budget.append(name)
+                stages[name] = entry
+            return {
+                "stages": stages,
+                "peak_traced_bytes": self.peak_traced,
+                "peak_rss_bytes": peak_rss_bytes(),
+                "over_budget": over_budget,
+                "within_budget": not over_budget,
+            }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Render a memory report as a text table
+
+    Args:
+        report: MemoryRecorder.report() output
+
+    Returns:
+        Table of stages followed by their top allocation sites
+    """
+    lines = [
+        f"{'stage':<18}{'calls':>7}{'creators':>10}{'peak MB':>10}{'peak B/creator':>16}"
+        f"{'retained B/creator':>20}{'budget B/creator':>18}  status"
+    ]
+    for name, stage in report["stages"].items():
+        budget = stage["budget_bytes_per_creator"]
+        lines.append(
+            f"{name:<18}{stage['calls']:>7}{stage['items']:>10}{stage['peak_bytes'] / 2 ** 20:>10.2f}"
+            f"{stage['peak_bytes_per_creator']:>16,.0f}{stage['retained_bytes_per_creator']:>20,.0f}"
+            f"{'-' if budget is None else f'{budget:,.0f}':>18}  {'ok' if stage['within_budget'] else 'OVER BUDGET'}"
+        )
+    peak_rss = report["peak_rss_bytes"]
+    lines.append(
+        f"\npeak traced {report['peak_traced_bytes'] / 2 ** 20:.1f} MB, "
+        f"peak RSS {'n/a' if peak_rss is None else f'{peak_rss / 2 ** 20:.1f} MB'}"
+    )
+    for name, stage in report["stages"].items():
+        if stage["top_allocations"]:
+            lines.append(f"\n{name}: top allocation sites")
+            lines.extend(
+                f"  {site['size_diff_bytes'] / 1024:>10.1f} KiB {site['count_diff']:>8} blocks  {site['location']}"
+                for site in stage["top_allocations"]
+            )
+    return "\n".join(lines)
+
+
+@contextmanager
+def recording(recorder: Optional[MemoryRecorder]) -> Iterator[Optional[MemoryRecorder]]:
+    """
+    Make a recorder the current thread's target for memory_stage()
+
+    Args:
+        recorder: Recorder, or None to record nothing
+
+    Yields:
+        The recorder
+    """
+    previous = getattr(_local, "recorder", None)
+    _local.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _local.recorder = previous
+
+
+def memory_stage(name: str, items: int = 0):
+    """
+    Context manager measuring a stage if the current thread is recording
+
+    Args:
+        name: Stage name (ingest, scoring, recommendations, serialization)
+        items: Creators processed (or set later with count())
+
+    Returns:
+        Stage context, or a no-op one when not recording
+    """
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None or not tracemalloc.is_tracing():
+        return _NOOP_STAGE
+    return recorder.stage(name, items)
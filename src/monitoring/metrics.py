@@ -0,0 +1,347 @@
+"""
+Prometheus-format metrics for TikTok Metrics AI Agent
+
+A small dependency-free registry of counters, gauges and histograms. Observing
+a value costs a dictionary lookup, a bisect and a lock acquisition, which keeps
+per-stage instrumentation well under a microsecond.
+"""
+
+import functools
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Latency buckets in seconds, from 10us (single scorer) to 10s (whole request)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\"", '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding metric metadata"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        """Render the metric in the text exposition format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """
+        Increment the counter
+
+        Args:
+            *label_values: Values for the counter's labels, in order
+            amount: Increment amount
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Get the current value for a label set"""
+        return self._values.get(label_values, 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class CallbackMetric(_Metric):
+    """
+    Metric whose samples are read from a callback at scrape time
+
+    Used to export counters and gauges that components already keep
+    (cache hits, queue depth) without double bookkeeping on the hot path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+        metric_type: str = "gauge"
+    ):
+        super().__init__(name, documentation, label_names)
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def _render_samples(self) -> List[str]:
+        try:
+            samples = self.callback()
+        except Exception:
+            return []
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in sorted(samples.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum]
+        self._states: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record an observation
+
+        Args:
+            value: Observed value (seconds for latency histograms)
+            *label_values: Values for the histogram's labels, in order
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._states.get(label_values)
+            if state is None:
+                state = [[0] * (len(self.buckets) + 1), 0.0]
+                self._states[label_values] = state
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *label_values: str) -> int:
+        """Get the number of observations for a label set"""
+        state = self._states.get(label_values)
+        return sum(state[0]) if state else 0
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(state[0]), state[1])) for labels, state in self._states.items())
+
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics rendered together on scrape
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """Create (or get) a counter"""
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Create (or get) a histogram"""
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+        metric_type: str = "gauge"
+    ) -> CallbackMetric:
+        """Register a metric read from a callback at scrape time, replacing any previous one"""
+        metric = CallbackMetric(name, documentation, label_names, callback, metric_type)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and pipeline metrics
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "tiktok_http_requests_total",
+    "HTTP requests by method, route and status code",
+    ["method", "route", "status"]
+)
+http_request_latency = registry.histogram(
+    "tiktok_http_request_duration_seconds",
+    "HTTP request latency by method and route",
+    ["method", "route"]
+)
+stage_latency = registry.histogram(
+    "tiktok_stage_duration_seconds",
+    "Latency of pipeline stages (aggregation, bottleneck detection, ranking, serialization)",
+    ["stage"]
+)
+scorer_latency = registry.histogram(
+    "tiktok_scorer_duration_seconds",
+    "Latency of each scorer's calculate_score",
+    ["scorer"]
+)
+errors = registry.counter(
+    "tiktok_errors_total",
+    "Errors by component, including scorer exceptions swallowed as a 0.0 score",
+    ["component"]
+)
+
+
+def timed_stage(stage: str) -> Callable:
+    """
+    Decorator recording a function's latency under a pipeline stage
+
+    Args:
+        stage: Stage label value
+
+    Returns:
+        Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stage_latency.observe(perf_counter() - start, stage)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and recording latency per route
+
+    The route label is the matched route's path template (e.g. ``/jobs/{job_id}``)
+    so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, mounts: Iterable[str] = ()):
+        self.app = app
+        self.mounts = tuple(mounts)
+
+    def _route_label(self, scope: Dict[str, Any], path: str) -> str:
+        """
+        Route template of the request, its mount prefix, or "unmatched"
+
+        path is the request path saved before routing: a Mount rewrites
+        scope["path"] relative to its prefix (/static/js/app.js becomes
+        /js/app.js).
+        """
+        route = scope.get("route")
+        if route is not None and getattr(route, "path", None):
+            return route.path
+        for mount in self.mounts:
+            if path.startswith(mount):
+                return mount
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        path = scope.get("path", "")
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            route = self._route_label(scope, path)
+            method = scope.get("method", "")
+            http_request_latency.observe(perf_counter() - start, method, route)
+            http_requests.inc(method, route, str(status_code or 500))
+            if status_code is None or status_code >= 500:
+                errors.inc("http")
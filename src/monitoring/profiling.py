@@ -0,0 +1,405 @@
+"""
+On-demand cProfile sessions over live requests
+
+Profiling is off by default. Functions wrapped with @profiled then cost one
+attribute check per call. An administrator starts a session that profiles
+either the next N calls or one sampled call per interval. Each sampled call
+runs under its own cProfile.Profile in the thread that executes it, so
+threadpool work is captured. Per-call stats are merged into one aggregate.
+When the session ends, the aggregate is written to disk three ways:
+
+- a .prof file (pstats format, for snakeviz or python -m pstats);
+- a text report with the hottest functions overall and under src/processors/;
+- a JSON summary.
+
+Sessions are per process: under a pre-forked server, each worker profiles
+only the requests it serves.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Functions under this path prefix are listed separately in reports
+HOT_PATH_PREFIX = os.path.join("src", "processors") + os.sep
+_HOT_PATH_PATTERN = r"src[/\\]processors[/\\]"  # The same prefix as a pstats restriction
+
+REPORT_FORMATS = {"prof": "application/octet-stream", "txt": "text/plain", "json": "application/json"}
+
+FunctionKey = Tuple[str, int, str]
+
+
+def _function_label(key: FunctionKey, root: str) -> str:
+    """Render a pstats function key as path:line(name), relative to root"""
+    filename, line, name = key
+    if filename.startswith(root):
+        filename = filename[len(root):]
+    return f"{filename}:{line}({name})"
+
+
+class ProfilingSession:
+    """One profiling session and its aggregated stats"""
+
+    def __init__(self, requests: Optional[int], interval: Optional[float], duration: float,
+                 endpoints: Optional[Sequence[str]]):
+        self.session_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.requests = requests
+        self.interval = interval
+        self.endpoints = frozenset(endpoints) if endpoints else None
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + duration
+        self.next_sample = time.monotonic()
+        self.remaining = requests
+        self.in_progress = 0
+        self.sampled = 0
+        self.calls: Dict[str, int] = {}
+        self.stats: Optional[pstats.Stats] = None
+        self.timer: Optional[threading.Timer] = None
+
+    def describe(self) -> Dict[str, Any]:
+        """Session settings and progress"""
+        return {
+            "session_id": self.session_id,
+            "mode": "requests" if self.requests is not None else "interval",
+            "requests": self.requests,
+            "interval_seconds": self.interval,
+            "endpoints": sorted(self.endpoints) if self.endpoints else None,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "seconds_left": max(0.0, self.deadline - time.monotonic()),
+            "sampled": self.sampled,
+            "calls": dict(self.calls),
+        }
+
+
+class RequestProfiler:
+    """
+    Profiles sampled calls of @profiled functions while a session is active
+    """
+
+    def __init__(self, output_dir: str = "profiles", max_reports: int = 20, top: int = 40):
+        """
+        Initialize an idle profiler
+
+        Args:
+            output_dir: Directory reports are written to
+            max_reports: Reports kept on disk (oldest are deleted)
+            top: Functions listed per report section
+        """
+        self.output_dir = Path(output_dir)
+        self.max_reports = max_reports
+        self.top = top
+        self.root = os.getcwd() + os.sep
+        self.active = False  # Read without the lock on every profiled call
+        self.session: Optional[ProfilingSession] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.sessions = 0
+
+    def configure(self, output_dir: str, max_reports: int) -> None:
+        """
+        Set where reports are written and how many are kept
+
+        Args:
+            output_dir: Directory reports are written to
+            max_reports: Reports kept on disk
+        """
+        self.output_dir = Path(output_dir)
+        self.max_reports = max_reports
+
+    def start(self, requests: Optional[int] = None, interval: Optional[float] = None, duration: float = 300.0,
+              endpoints: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Start a profiling session
+
+        Args:
+            requests: Profile the next N calls
+            interval: Or profile one call per this many seconds
+            duration: End the session after this many seconds even if N calls were not seen
+            endpoints: Only sample calls with these names (None: all profiled functions)
+
+        Returns:
+            Session description
+
+        Raises:
+            ValueError: If the arguments are invalid or a session is already active
+        """
+        if (requests is None) == (interval is None):
+            raise ValueError("Set exactly one of requests or interval_seconds")
+        if requests is not None and requests < 1:
+            raise ValueError("requests must be at least 1")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval_seconds must be positive")
+        if duration <= 0:
+            raise ValueError("duration_seconds must be positive")
+        self._expire()
+        with self._lock:
+            if self.session is not None:
+                raise ValueError(f"Profiling session {self.session.session_id} is already active")
+            session = self.session = ProfilingSession(requests, interval, duration, endpoints)
+            self.sessions += 1
+            self.active = True
+            # Ends the session at its deadline even if no sampled call or status request notices it
+            session.timer = threading.Timer(duration, self._end, args=(session,))
+            session.timer.name = f"profiling-{session.session_id}"
+            session.timer.daemon = True
+            session.timer.start()
+            return session.describe()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        End the active session and write its report
+
+        Returns:
+            Report description, or None if no session was active
+        """
+        return self._end(self.session)
+
+    def _end(self, session: Optional[ProfilingSession]) -> Optional[Dict[str, Any]]:
+        """End a session and write its report, unless it already ended"""
+        with self._lock:
+            if session is None or self.session is not session:
+                return None
+            self.session = None
+            self.active = False
+        if session.timer is not None:
+            session.timer.cancel()
+        return self._write_report(session)
+
+    def _expire(self) -> None:
+        """Finish the active session if its deadline passed"""
+        session = self.session
+        if session is not None and time.monotonic() >= session.deadline:
+            self._end(session)
+
+    def _sample(self, name: str) -> Optional[ProfilingSession]:
+        """Decide whether this call is profiled"""
+        session = self.session
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now >= session.deadline:
+            self._end(session)
+            return None
+        if session.endpoints is not None and name not in session.endpoints:
+            return None
+        with self._lock:
+            if self.session is not session:
+                return None
+            if session.remaining is not None:
+                if session.remaining <= 0:
+                    return None
+                session.remaining -= 1
+            elif now < session.next_sample:
+                return None
+            else:
+                session.next_sample = now + session.interval
+            session.in_progress += 1
+            return session
+
+    def call(self, name: str, fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """
+        Run a call, profiling it if the active session samples it
+
+        Args:
+            name: Call name sessions filter on (e.g. the endpoint)
+            fn: Function
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            The function's result
+        """
+        # Calls nested in a profiled call are part of its profile already
+        if getattr(self._local, "profiling", False):
+            return fn(*args, **kwargs)
+        session = self._sample(name)
+        if session is None:
+            return fn(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        self._local.profiling = True
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler or tracer owns this thread; run unprofiled
+            self._local.profiling = False
+            self._finish_call(session, name, None)
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            self._local.profiling = False
+            self._finish_call(session, name, profile)
+
+    def _finish_call(self, session: ProfilingSession, name: str, profile: Optional[cProfile.Profile]) -> None:
+        """Merge one call's profile into its session, ending the session after its last call"""
+        with self._lock:
+            # Calls finishing after the session ended are dropped; its report is already being written
+            if profile is not None and self.session is session:
+                if session.stats is None:
+                    session.stats = pstats.Stats(profile)
+                else:
+                    session.stats.add(profile)
+                session.sampled += 1
+                session.calls[name] = session.calls.get(name, 0) + 1
+            session.in_progress -= 1
+            done = session.remaining == 0 and session.in_progress == 0
+        if done:
+            self._end(session)
+
+    def _hottest(self, stats: pstats.Stats, sort_index: int, prefix: str = "") -> List[Dict[str, Any]]:
+        """Top functions by own (2) or cumulative (3) time, optionally under a path prefix"""
+        rows = [
+            (key, value) for key, value in stats.stats.items()
+            if not prefix or key[0].startswith(self.root + prefix) or key[0].startswith(prefix)
+        ]
+        rows.sort(key=lambda item: item[1][sort_index], reverse=True)
+        return [
+            {
+                "function": _function_label(key, self.root),
+                "calls": nc,
+                "primitive_calls": cc,
+                "own_seconds": tt,
+                "cumulative_seconds": ct,
+                "own_per_call_us": tt / nc * 1e6 if nc else 0.0,
+            }
+            for key, (cc, nc, tt, ct, _) in rows[:self.top]
+        ]
+
+    def _write_report(self, session: ProfilingSession) -> Dict[str, Any]:
+        """Write a finished session's .prof, text and JSON reports"""
+        summary = {**session.describe(), "ended_at": datetime.now().isoformat()}
+        summary.pop("seconds_left")
+        stats = session.stats
+        if stats is not None:
+            summary["total_seconds"] = stats.total_tt
+            summary["hot_path"] = self._hottest(stats, 3, HOT_PATH_PREFIX)
+            summary["by_own_time"] = self._hottest(stats, 2)
+            summary["by_cumulative_time"] = self._hottest(stats, 3)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / session.session_id
+        if stats is not None:
+            stats.dump_stats(f"{base}.prof")
+            text = StringIO()
+            stats.stream = text
+            text.write(f"Profiling session {session.session_id}: {session.sampled} sampled call(s) "
+                       f"{json.dumps(session.calls)}\n\n")
+            text.write(f"=== {HOT_PATH_PREFIX} by cumulative time ===\n")
+            stats.sort_stats("cumulative").print_stats(_HOT_PATH_PATTERN, self.top)
+            text.write("=== All functions by own time ===\n")
+            stats.sort_stats("tottime").print_stats(self.top)
+            text.write("=== Callers of the hottest src/processors functions ===\n")
+            stats.sort_stats("cumulative").print_callers(_HOT_PATH_PATTERN, 10)
+            Path(f"{base}.txt").write_text(text.getvalue().replace(self.root, ""), encoding="utf-8")
+        Path(f"{base}.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        self._prune()
+        return summary
+
+    def _prune(self) -> None:
+        """Delete the oldest reports beyond max_reports"""
+        summaries = sorted(self.output_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in summaries[:max(0, len(summaries) - self.max_reports)]:
+            for extension in REPORT_FORMATS:
+                path.with_suffix(f".{extension}").unlink(missing_ok=True)
+
+    def reports(self) -> List[Dict[str, Any]]:
+        """
+        List reports on disk, newest first
+
+        Returns:
+            Report IDs with their end time, sampled calls and available formats
+        """
+        if not self.output_dir.is_dir():
+            return []
+        reports = []
+        for path in sorted(self.output_dir.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True):
+            try:
+                summary = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            reports.append({
+                "report_id": path.stem,
+                "ended_at": summary.get("ended_at"),
+                "sampled": summary.get("sampled"),
+                "formats": [extension for extension in REPORT_FORMATS if path.with_suffix(f".{extension}").exists()],
+            })
+        return reports
+
+    def report_path(self, report_id: str, extension: str) -> Optional[Path]:
+        """
+        Path of a report file
+
+        Args:
+            report_id: Report (session) ID
+            extension: One of REPORT_FORMATS
+
+        Returns:
+            Existing file path, or None if there is no such report
+        """
+        if extension not in REPORT_FORMATS or Path(report_id).name != report_id or report_id.startswith("."):
+            return None
+        path = self.output_dir / f"{report_id}.{extension}"
+        return path if path.is_file() else None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the active session, if any, and the reports on disk
+
+        Returns:
+            Dictionary with the active session and report list
+        """
+        self._expire()
+        session = self.session
+        return {
+            "active": session.describe() if session is not None else None,
+            "reports": self.reports(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get profiler statistics
+
+        Returns:
+            Dictionary with the active session ID and sessions started
+        """
+        session = self.session
+        return {
+            "active_session": session.session_id if session is not None else None,
+            "sampled": session.sampled if session is not None else 0,
+            "sessions": self.sessions,
+        }
+
+
+# Global profiler, configured by the application at startup
+profiler = RequestProfiler()
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator profiling sampled calls of a function while a session is active
+
+    Args:
+        name: Call name sessions can filter on (e.g. "analyze")
+
+    Returns:
+        Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.active:
+                return fn(*args, **kwargs)
+            return profiler.call(name, fn, args, kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,319 @@
+"""
+Lightweight request tracing for the scoring pipeline
+
+Spans are kept in a context variable, so they follow a request into the
+threadpool. Unsampled requests only pay for a context variable lookup per
+instrumented call. Sampled traces are appended to a local file in the Chrome
+Trace Event Format, which opens directly in Perfetto (ui.perfetto.dev) or
+chrome://tracing.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.logger.logger import logger
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "thread_id", "attributes")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.thread_id = threading.get_ident()
+        self.attributes = attributes
+
+    def finish(self) -> None:
+        """Record the span end time and attach it to its trace"""
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+
+class Trace:
+    """All spans recorded for one sampled request"""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+
+
+_active_span: ContextVar[Optional[Span]] = ContextVar("active_span", default=None)
+
+
+class _NoopSpan:
+    """Context manager used when the current request is not being traced"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _SpanContext:
+    """Context manager recording a child span of the active span"""
+
+    __slots__ = ("parent", "name", "attributes", "span", "token")
+
+    def __init__(self, parent: Span, name: str, attributes: Dict[str, Any]):
+        self.parent = parent
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = Span(self.parent.trace, self.name, self.parent.span_id, self.attributes)
+        self.token = _active_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.attributes["error"] = repr(exc)
+        self.span.finish()
+        _active_span.reset(self.token)
+        return False
+
+
+class ChromeTraceExporter:
+    """
+    Appends spans to a file in the Chrome Trace Event Format
+
+    The file is a JSON array of complete ("X") events; the format allows the
+    closing bracket to be omitted, which lets traces be appended indefinitely.
+    export() only serializes and queues a trace; a background thread appends
+    the queued traces to the file, so requests never wait for file I/O.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter
+
+        Args:
+            path: Output file path
+        """
+        self.path = Path(path)
+        self._queue: "queue.Queue[List[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.exported_traces = 0
+        self.failed_traces = 0
+
+    def export(self, trace: Trace) -> None:
+        """
+        Queue all spans of a trace for the writer thread
+
+        Args:
+            trace: Finished trace
+        """
+        pid = os.getpid()
+        lines = []
+        for span in trace.spans:
+            args = {"trace_id": trace.trace_id, "span_id": span.span_id, "parent_id": span.parent_id}
+            args.update(span.attributes)
+            lines.append(json.dumps({
+                "name": span.name,
+                "cat": "tiktok_metrics",
+                "ph": "X",
+                "ts": span.start_ns / 1000.0,
+                "dur": (span.end_ns - span.start_ns) / 1000.0,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args
+            }, default=str))
+
+        self._ensure_writer()
+        self._queue.put(lines)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued trace has been written
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            False if traces were still queued when the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread on first use"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Writer loop: append every queued trace, batching those queued together"""
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+                self.exported_traces += len(batch)
+            except OSError as e:
+                self.failed_traces += len(batch)
+                logger.warning(f"Could not write traces to {self.path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[List[str]]) -> None:
+        """Append serialized traces to the output file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        with open(self.path, "a", encoding="utf-8") as f:
+            if is_new:
+                f.write("[\n")
+            f.write("".join(",\n".join(lines) + ",\n" for lines in batch))
+
+
+class Tracer:
+    """
+    Creates traces for sampled requests and spans within them
+    """
+
+    def __init__(self, sample_rate: float = 0.0, export_path: Optional[str] = None):
+        """
+        Initialize the tracer (disabled until configured with a sample rate)
+
+        Args:
+            sample_rate: Fraction of requests to trace (0.0 - 1.0)
+            export_path: File traces are appended to
+        """
+        self.sample_rate = 0.0
+        self.exporter: Optional[ChromeTraceExporter] = None
+        self.configure(sample_rate, export_path)
+
+    def configure(self, sample_rate: float, export_path: Optional[str]) -> None:
+        """
+        Set the sampling rate and export destination
+
+        Args:
+            sample_rate: Fraction of requests to trace (0.0 - 1.0)
+            export_path: File traces are appended to; tracing is off without one
+        """
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.flush()
+        self.exporter = ChromeTraceExporter(export_path) if export_path else None
+
+    def flush(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Write the traces still queued by the exporter
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        if self.exporter is not None:
+            self.exporter.flush(timeout)
+
+    @staticmethod
+    def new_trace_id() -> str:
+        """Generate a W3C-sized (16 byte) trace ID"""
+        return os.urandom(16).hex()
+
+    @contextmanager
+    def start_trace(self, name: str, trace_id: Optional[str] = None, force_sample: bool = False,
+                    **attributes: Any) -> Iterator[str]:
+        """
+        Start a trace for a request; every request gets a trace ID, but spans
+        are only recorded and exported if the request is sampled
+
+        Args:
+            name: Root span name
+            trace_id: Existing trace ID to continue, generated if None
+            force_sample: Record this trace regardless of the sample rate
+            **attributes: Root span attributes
+
+        Yields:
+            Trace ID
+        """
+        trace_id = trace_id or self.new_trace_id()
+        sampled = self.exporter is not None and (force_sample or random.random() < self.sample_rate)
+        if not sampled:
+            yield trace_id
+            return
+
+        trace = Trace(trace_id)
+        root = Span(trace, name, None, attributes)
+        token = _active_span.set(root)
+        try:
+            yield trace_id
+        finally:
+            root.finish()
+            _active_span.reset(token)
+            self.exporter.export(trace)
+
+    def span(self, name: str, **attributes: Any):
+        """
+        Context manager for a child span of the active span
+
+        Args:
+            name: Span name
+            **attributes: Span attributes
+
+        Returns:
+            Span context manager, or a no-op one if the request is not traced
+        """
+        parent = _active_span.get()
+        if parent is None:
+            return _NOOP_SPAN
+        return _SpanContext(parent, name, attributes)
+
+
+# Global tracer, configured by the application at startup
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator recording a span around a function when its request is traced
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _active_span.get()
+            if parent is None:
+                return fn(*args, **kwargs)
+            with _SpanContext(parent, name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
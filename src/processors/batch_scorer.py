@@ -0,0 +1,476 @@
+"""
+Batch Scorer - Vectorized OverallScore algorithm for many creators at once
+
+Reproduces the scalar scorers and KPIOrchestrator.calculate_overall_score on
+NumPy column arrays. Every formula keeps the scalar operation order, and the
+clamps use fmin/fmax/minimum/maximum variants that treat NaN exactly like
+Python's min()/max(), so batch results are bit-identical to the scalar path.
+
+Creators of different tenants or niches may be scored with different profiles
+of the scoring configuration: score_profiles() sorts the rows by profile,
+scores each group with its own weights and ranges, and writes the results
+back in the original row order.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.metric_value_ranges import METRIC_DEFAULTS
+from src.config.scoring_config import ScoringConfig, scoring_config
+
+
+# Same order as KPIOrchestrator.scorers; floating point sums follow it
+SCORER_NAMES: Sequence[str] = (
+    "sales_performance_scorer",
+    "shop_conversion_scorer",
+    "tiktok_shop_scorer",
+    "engagement_scorer",
+    "engagement_growth_scorer",
+    "discovery_scorer",
+    "content_strategy_scorer",
+    "audience_fit_scorer",
+    "brand_fit_scorer",
+    "trend_fit_scorer",
+    "image_score_scorer",
+    "reach_visibility_scorer",
+    "cost_efficiency_scorer",
+)
+
+TIERS: Sequence[str] = ("tier_1", "tier_2", "tier_3")
+
+# Performance level codes used in batch results (see BaseScorer.get_performance_level)
+PERFORMANCE_LEVELS: Sequence[str] = ("low", "medium", "high")
+
+Columns = Mapping[str, np.ndarray]
+
+
+def records_to_columns(records: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert creator metric records to float64 column arrays
+
+    Missing or None values take the metric's default from METRIC_DEFAULTS.
+
+    Args:
+        records: Creator metric dictionaries
+
+    Returns:
+        Dictionary of metric name -> array with one value per record
+    """
+    count = len(records)
+    columns = {}
+    for field, default in METRIC_DEFAULTS.items():
+        values = (record.get(field) for record in records)
+        columns[field] = np.fromiter(
+            (default if value is None else value for value in values), dtype=np.float64, count=count
+        )
+    return columns
+
+
+def profile_codes(records: Sequence[Mapping[str, Any]],
+                  config: Optional[ScoringConfig] = None) -> Tuple[np.ndarray, List[ScoringConfig]]:
+    """
+    Select the scoring profile of every record
+
+    Args:
+        records: Creator metric dictionaries; tenant_id and niche select the profile
+        config: Scoring configuration (default: the current one)
+
+    Returns:
+        (profile index per record, profiles), as expected by BatchScorer.score_profiles
+    """
+    config = config or scoring_config.current
+    profiles: List[ScoringConfig] = []
+    index_of: Dict[int, int] = {}
+    # Few distinct (tenant, niche) pairs repeat across many records
+    code_of: Dict[Tuple[Any, Any], int] = {}
+    codes = np.empty(len(records), dtype=np.intp)
+    for i, record in enumerate(records):
+        key = (record.get("tenant_id"), record.get("niche"))
+        code = code_of.get(key)
+        if code is None:
+            profile = config.profile_for(*key)
+            code = code_of[key] = index_of.setdefault(id(profile), len(profiles))
+            if code == len(profiles):
+                profiles.append(profile)
+        codes[i] = code
+    return codes, profiles
+
+
+def _scatter(target: Dict[str, Any], group: Mapping[str, Any], rows: np.ndarray, size: int) -> None:
+    """Copy one profile group's results into the full-size result at its rows"""
+    for key, value in group.items():
+        if isinstance(value, Mapping):
+            _scatter(target.setdefault(key, {}), value, rows, size)
+            continue
+        if key not in target:
+            # Per-call scalars (tier weights) become per-row arrays
+            target[key] = np.empty(size, dtype=np.asarray(value).dtype)
+        target[key][rows] = value
+
+
+def normalize_scores(values: np.ndarray, min_val: Any, max_val: Any) -> np.ndarray:
+    """
+    Vectorized BaseScorer.normalize_score (callers silence NumPy warnings
+    for empty ranges and non-finite values)
+
+    Args:
+        values: Raw values
+        min_val: Minimum possible value (scalar or per-row array)
+        max_val: Maximum possible value (scalar or per-row array)
+
+    Returns:
+        Scores clamped to 0-1, 0.5 where the range is empty
+    """
+    normalized = np.fmax(0.0, np.fmin(1.0, (values - min_val) / (max_val - min_val)))
+    return np.where(np.equal(max_val, min_val), 0.5, normalized)
+
+
+def performance_level_codes(scores: np.ndarray) -> np.ndarray:
+    """
+    Vectorized BaseScorer.get_performance_level
+
+    Args:
+        scores: Normalized scores
+
+    Returns:
+        Codes indexing PERFORMANCE_LEVELS (0 = low, 1 = medium, 2 = high)
+    """
+    codes = np.full(scores.shape, 2, dtype=np.uint8)
+    codes[scores < 0.6] = 1
+    codes[scores < 0.3] = 0
+    return codes
+
+
+class BatchScorer:
+    """
+    Scores column arrays of creator metrics with the optimized weighted algorithm
+    """
+
+    def __init__(self, weights: Optional[Mapping[str, float]] = None,
+                 tiers: Optional[Mapping[str, Iterable[str]]] = None):
+        """
+        Initialize the batch scorer
+
+        Args:
+            weights: Fixed scorer weights; by default those of the active
+                scoring configuration, read on every call
+            tiers: Fixed tier name -> scorer names; by default the active
+                scoring configuration's
+        """
+        self.weights = dict(weights) if weights is not None else None
+        self.tiers = {tier: list(tiers.get(tier, [])) for tier in TIERS} if tiers is not None else None
+        self._components = {
+            "sales_performance_scorer": self._sales_performance,
+            "shop_conversion_scorer": self._shop_conversion,
+            "tiktok_shop_scorer": self._tiktok_shop,
+            "engagement_scorer": self._engagement,
+            "engagement_growth_scorer": self._engagement_growth,
+            "discovery_scorer": self._discovery,
+            "content_strategy_scorer": self._content_strategy,
+            "audience_fit_scorer": self._audience_fit,
+            "brand_fit_scorer": self._brand_fit,
+            "trend_fit_scorer": self._trend_fit,
+            "image_score_scorer": self._image_score,
+            "reach_visibility_scorer": self._reach_visibility,
+            "cost_efficiency_scorer": self._cost_efficiency,
+        }
+
+    def score_columns(self, columns: Columns, include_components: bool = False,
+                      config: Optional[ScoringConfig] = None) -> Dict[str, Any]:
+        """
+        Calculate the OverallScore and breakdown for every row
+
+        Args:
+            columns: Metric name -> float64 array; missing metrics use their defaults
+            include_components: Also return the component score arrays per scorer
+            config: Scoring configuration or profile (default: the current configuration)
+
+        Returns:
+            Dictionary of arrays mirroring KPIOrchestrator.calculate_overall_score
+        """
+        column = self._column_getter(columns)
+        size = len(next(iter(columns.values()))) if columns else 0
+        # One configuration for the whole call, even if a reload swaps it meanwhile
+        config = config or scoring_config.current
+        weights = self.weights if self.weights is not None else config.weights
+        tiers = self.tiers if self.tiers is not None else config.tiers
+
+        scores: Dict[str, np.ndarray] = {}
+        weighted_scores: Dict[str, np.ndarray] = {}
+        components: Dict[str, Dict[str, np.ndarray]] = {}
+        tier_scores = {tier: 0.0 for tier in TIERS}
+        tier_weights = {tier: 0.0 for tier in TIERS}
+
+        for name in SCORER_NAMES:
+            # Branches of np.where() are evaluated for every row, including the
+            # zero and non-finite rows the scalar code guards against
+            with np.errstate(all="ignore"):
+                score, parts = self._components[name](column, config.normalization_ranges)
+            weight = weights[name]
+            scores[name] = score
+            weighted_scores[name] = score * weight
+            if include_components:
+                components[name] = parts
+
+            for tier in TIERS:
+                if name in tiers[tier]:
+                    tier_scores[tier] = tier_scores[tier] + weighted_scores[name]
+                    tier_weights[tier] += weight
+                    break
+
+        overall_score = 0
+        for name in SCORER_NAMES:
+            overall_score = overall_score + weighted_scores[name]
+
+        tier_averages = {
+            tier: tier_scores[tier] / tier_weights[tier] if tier_weights[tier] > 0 else np.zeros(size)
+            for tier in TIERS
+        }
+
+        result = {
+            "overall_score": overall_score,
+            "revenue_focus_score": tier_averages["tier_1"],
+            "tier_scores": tier_averages,
+            "tier_weights": tier_weights,
+            "individual_scores": scores,
+            "weighted_scores": weighted_scores,
+            "performance_levels": {name: performance_level_codes(score) for name, score in scores.items()},
+        }
+        if include_components:
+            result["components"] = components
+        return result
+
+    def score_profiles(self, columns: Columns, codes: np.ndarray, profiles: Sequence[ScoringConfig],
+                       include_components: bool = False) -> Dict[str, Any]:
+        """
+        Calculate the OverallScore and breakdown for rows scored with different profiles
+
+        Rows are grouped by profile with a stable sort, each group is scored
+        column-wise with its profile, and the results are scattered back to
+        the original row order. Tier weights become per-row arrays.
+
+        Args:
+            columns: Metric name -> float64 array; missing metrics use their defaults
+            codes: Index into profiles for every row (see profile_codes)
+            profiles: Scoring profiles
+            include_components: Also return the component score arrays per scorer
+
+        Returns:
+            Dictionary of arrays mirroring score_columns(), in row order
+        """
+        if len(profiles) == 1:
+            return self.score_columns(columns, include_components, profiles[0])
+
+        size = len(codes)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(profiles)))))
+        result: Dict[str, Any] = {}
+        for code, profile in enumerate(profiles):
+            rows = order[bounds[code]:bounds[code + 1]]
+            if rows.size == 0:
+                continue
+            group = self.score_columns({name: values[rows] for name, values in columns.items()},
+                                       include_components, profile)
+            _scatter(result, group, rows, size)
+        return result
+
+    def score_scorer(self, name: str, columns: Columns) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Calculate a single scorer for every row
+
+        Args:
+            name: Scorer name, one of SCORER_NAMES
+            columns: Metric name -> float64 array; missing metrics use their defaults
+
+        Returns:
+            (scores, component name -> component scores)
+        """
+        with np.errstate(all="ignore"):
+            return self._components[name](self._column_getter(columns), scoring_config.current.normalization_ranges)
+
+    @staticmethod
+    def _column_getter(columns: Columns):
+        """Metric name -> column, falling back to a column of the metric's default"""
+        size = len(next(iter(columns.values()))) if columns else 0
+        return lambda name: columns[name] if name in columns else np.full(size, METRIC_DEFAULTS[name])
+
+    def score_records(self, records: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score creator metric records and return one result dictionary per record
+
+        Args:
+            records: Creator metric dictionaries (with creator_id)
+
+        Returns:
+            Per-creator scores, tier averages, performance levels and the
+            scoring profile used
+        """
+        if not records:
+            return []
+        codes, profiles = profile_codes(records)
+        result = self.score_profiles(records_to_columns(records), codes, profiles)
+        names = [profile.name for profile in profiles]
+        codes = codes.tolist()
+
+        overall = result["overall_score"].tolist()
+        revenue = result["revenue_focus_score"].tolist()
+        tiers = {tier: values.tolist() for tier, values in result["tier_scores"].items()}
+        scores = {name: values.tolist() for name, values in result["individual_scores"].items()}
+        levels = {name: codes.tolist() for name, codes in result["performance_levels"].items()}
+
+        return [
+            {
+                "creator_id": record.get("creator_id"),
+                "niche": record.get("niche"),
+                "overall_score": overall[i],
+                "revenue_focus_score": revenue[i],
+                "scoring_profile": names[codes[i]],
+                "tier_scores": {tier: values[i] for tier, values in tiers.items()},
+                "individual_scores": {name: values[i] for name, values in scores.items()},
+                "performance_levels": {name: PERFORMANCE_LEVELS[codes[i]] for name, codes in levels.items()},
+            }
+            for i, record in enumerate(records)
+        ]
+
+    # Scorers: each returns (score, component scores) for all rows, given the
+    # metric column getter and the configured normalization ranges
+
+    @staticmethod
+    def _sales_performance(column, ranges):
+        conversion_score = normalize_scores(column("conversion_rate"), *ranges["conversion_rate"])
+        revenue_score = normalize_scores(column("total_revenue"), 0.0, column("target_revenue"))
+        aov_score = normalize_scores(column("avg_order_value"), 0.0, column("target_aov"))
+        score = conversion_score * 0.4 + revenue_score * 0.4 + aov_score * 0.2
+        return score, {"conversion_score": conversion_score, "revenue_score": revenue_score, "aov_score": aov_score}
+
+    @staticmethod
+    def _shop_conversion(column, ranges):
+        funnel_score = normalize_scores(column("funnel_completion_rate"), 0.0, 1.0)
+        abandonment_score = normalize_scores(1.0 - column("cart_abandonment_rate"), 0.0, 1.0)
+        checkout_score = normalize_scores(column("checkout_success_rate"), 0.0, 1.0)
+        score = funnel_score * 0.5 + abandonment_score * 0.3 + checkout_score * 0.2
+        return score, {"funnel_score": funnel_score, "abandonment_score": abandonment_score,
+                       "checkout_score": checkout_score}
+
+    @staticmethod
+    def _tiktok_shop(column, ranges):
+        listing_score = normalize_scores(column("listing_quality"), 0.0, 1.0)
+        velocity_score = normalize_scores(column("product_velocity"), 0.0, 1.0)
+        integration_score = normalize_scores(column("integration_seamlessness"), 0.0, 1.0)
+        score = listing_score * 0.4 + velocity_score * 0.35 + integration_score * 0.25
+        return score, {"listing_score": listing_score, "velocity_score": velocity_score,
+                       "integration_score": integration_score}
+
+    @staticmethod
+    def _engagement(column, ranges):
+        likes = column("likes_ratio")
+        comments = column("comments_ratio")
+        shares = column("shares_ratio")
+        video_duration = column("video_duration")
+
+        total_interactions = likes + comments + shares
+        balance = 1.0 - (
+            np.abs(likes / total_interactions - 0.7) +
+            np.abs(comments / total_interactions - 0.2) +
+            np.abs(shares / total_interactions - 0.1)
+        ) / 2.0
+        completion = np.minimum(column("avg_watch_time") / video_duration, 1.0)
+        interaction_balance = np.where(total_interactions == 0, 0.0, np.fmax(0.0, balance))
+        retention_score = normalize_scores(column("retention_rate"), 0.0, 1.0)
+        sharing_score = normalize_scores(shares, *ranges["shares_ratio"])
+        watch_completion = np.where(video_duration > 0, completion, 0.0)
+
+        score = interaction_balance * 0.4 + retention_score * 0.25 + sharing_score * 0.25 + watch_completion * 0.1
+        return score, {"interaction_balance": interaction_balance, "retention_score": retention_score,
+                       "sharing_score": sharing_score, "watch_completion": watch_completion}
+
+    @staticmethod
+    def _engagement_growth(column, ranges):
+        engagement_growth = normalize_scores(column("engagement_growth_rate"), *ranges["engagement_growth_rate"])
+        follower_growth = normalize_scores(column("follower_growth_rate"), *ranges["follower_growth_rate"])
+        views_growth = normalize_scores(column("views_growth_rate"), *ranges["views_growth_rate"])
+        score = engagement_growth * 0.5 + follower_growth * 0.3 + views_growth * 0.2
+        return score, {"engagement_growth": engagement_growth, "follower_growth": follower_growth,
+                       "views_growth": views_growth}
+
+    @staticmethod
+    def _discovery(column, ranges):
+        hashtag_score = normalize_scores(column("hashtag_performance"), 0.0, 1.0)
+        search_score = normalize_scores(column("search_visibility"), 0.0, 1.0)
+        recommendation_score = normalize_scores(column("recommendation_rate"), *ranges["recommendation_rate"])
+        viral_score = normalize_scores(column("viral_potential"), 0.0, 1.0)
+        score = hashtag_score * 0.3 + search_score * 0.3 + recommendation_score * 0.2 + viral_score * 0.2
+        return score, {"hashtag_score": hashtag_score, "search_score": search_score,
+                       "recommendation_score": recommendation_score, "viral_score": viral_score}
+
+    @staticmethod
+    def _content_strategy(column, ranges):
+        quality_score = normalize_scores(column("video_quality"), 0.0, 1.0)
+        freshness_score = normalize_scores(column("content_freshness"), 0.0, 1.0)
+        consistency_score = normalize_scores(column("posting_consistency"), 0.0, 1.0)
+        diversity_score = normalize_scores(column("content_diversity"), 0.0, 1.0)
+        score = quality_score * 0.4 + freshness_score * 0.25 + consistency_score * 0.2 + diversity_score * 0.15
+        return score, {"video_quality": quality_score, "content_freshness": freshness_score,
+                       "posting_consistency": consistency_score, "content_diversity": diversity_score}
+
+    @staticmethod
+    def _audience_fit(column, ranges):
+        demographic_score = normalize_scores(column("target_demographic_match"), 0.0, 1.0)
+        engagement_quality_score = normalize_scores(column("audience_engagement_quality"), 0.0, 1.0)
+        follower_quality = normalize_scores(column("follower_quality_score"), 0.0, 1.0)
+        retention_score = normalize_scores(column("audience_retention"), 0.0, 1.0)
+        score = demographic_score * 0.3 + engagement_quality_score * 0.3 + follower_quality * 0.2 + retention_score * 0.2
+        return score, {"demographic_score": demographic_score, "engagement_quality_score": engagement_quality_score,
+                       "follower_quality": follower_quality, "retention_score": retention_score}
+
+    @staticmethod
+    def _brand_fit(column, ranges):
+        alignment_score = normalize_scores(column("brand_alignment"), 0.0, 1.0)
+        trust = normalize_scores(column("trust_score"), 0.0, 1.0)
+        authenticity = normalize_scores(column("authenticity_score"), 0.0, 1.0)
+        consistency = normalize_scores(column("brand_consistency"), 0.0, 1.0)
+        score = alignment_score * 0.3 + trust * 0.3 + authenticity * 0.2 + consistency * 0.2
+        return score, {"alignment_score": alignment_score, "trust": trust,
+                       "authenticity": authenticity, "consistency": consistency}
+
+    @staticmethod
+    def _trend_fit(column, ranges):
+        alignment_score = normalize_scores(column("trend_alignment"), 0.0, 1.0)
+        timing = normalize_scores(column("timing_score"), 0.0, 1.0)
+        viral = normalize_scores(column("viral_potential"), 0.0, 1.0)
+        relevance = normalize_scores(column("trend_relevance"), 0.0, 1.0)
+        score = alignment_score * 0.3 + timing * 0.3 + viral * 0.2 + relevance * 0.2
+        return score, {"alignment_score": alignment_score, "timing": timing, "viral": viral, "relevance": relevance}
+
+    @staticmethod
+    def _image_score(column, ranges):
+        quality = normalize_scores(column("image_quality"), 0.0, 1.0)
+        lighting = normalize_scores(column("lighting_score"), 0.0, 1.0)
+        composition = normalize_scores(column("composition_score"), 0.0, 1.0)
+        color = normalize_scores(column("color_balance"), 0.0, 1.0)
+        score = quality * 0.4 + lighting * 0.3 + composition * 0.2 + color * 0.1
+        return score, {"quality": quality, "lighting": lighting, "composition": composition, "color": color}
+
+    @staticmethod
+    def _reach_visibility(column, ranges):
+        target_reach = column("target_reach")
+        reach_score = normalize_scores(column("total_reach"), 0.0, target_reach)
+        unique_score = normalize_scores(column("unique_viewers"), 0.0, target_reach)
+        impression = normalize_scores(column("impression_rate"), *ranges["impression_rate"])
+        visibility = normalize_scores(column("visibility_score"), 0.0, 1.0)
+        score = reach_score * 0.3 + unique_score * 0.3 + impression * 0.2 + visibility * 0.2
+        return score, {"reach_score": reach_score, "unique_score": unique_score,
+                       "impression": impression, "visibility": visibility}
+
+    @staticmethod
+    def _cost_efficiency(column, ranges):
+        cpa_ratio = column("target_cpa") / np.maximum(column("cost_per_acquisition"), 0.01)
+        cpe_ratio = column("target_cpe") / np.maximum(column("cost_per_engagement"), 0.01)
+        cpv_ratio = column("target_cpv") / np.maximum(column("cost_per_view"), 0.001)
+        cpa_score = normalize_scores(cpa_ratio, *ranges["cost_per_acquisition"])
+        cpe_score = normalize_scores(cpe_ratio, *ranges["cost_per_engagement"])
+        cpv_score = normalize_scores(cpv_ratio, *ranges["cost_per_view"])
+        roi = normalize_scores(column("roi_score"), *ranges["roi_score"])
+        score = cpa_score * 0.4 + cpe_score * 0.3 + cpv_score * 0.2 + roi * 0.1
+        return score, {"cpa_score": cpa_score, "cpe_score": cpe_score, "cpv_score": cpv_score, "roi": roi}
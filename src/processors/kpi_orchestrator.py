@@ -3,9 +3,10 @@ KPI Orchestrator - Implements the optimized OverallScore algorithm
 """
 
 from typing import Dict, Any, List, Tuple
-import numpy as np
-from src.config.config import settings
+from src.config.scoring_config import scoring_config
 from src.logger.logger import logger
+from src.monitoring.metrics import errors, timed_stage
+from src.monitoring.tracing import traced
 from src.processors.scorers import (
     SalesPerformanceScorer, ShopConversionScorer, TikTokShopScorer,
     EngagementScorer, EngagementGrowthScorer, DiscoveryScorer,
@@ -23,25 +24,28 @@ class KPIOrchestrator:
         """Initialize the KPI orchestrator with all scorers"""
         self.logger = logger
         
-        # Initialize all scorers with their optimized weights
+        # Initialize all scorers; their weights follow the active scoring configuration
+        weights = scoring_config.current.weights
         self.scorers = {
-            "sales_performance_scorer": SalesPerformanceScorer(settings.KPI_WEIGHTS["sales_performance_scorer"]),
-            "shop_conversion_scorer": ShopConversionScorer(settings.KPI_WEIGHTS["shop_conversion_scorer"]),
-            "tiktok_shop_scorer": TikTokShopScorer(settings.KPI_WEIGHTS["tiktok_shop_scorer"]),
-            "engagement_scorer": EngagementScorer(settings.KPI_WEIGHTS["engagement_scorer"]),
-            "engagement_growth_scorer": EngagementGrowthScorer(settings.KPI_WEIGHTS["engagement_growth_scorer"]),
-            "discovery_scorer": DiscoveryScorer(settings.KPI_WEIGHTS["discovery_scorer"]),
-            "content_strategy_scorer": ContentStrategyScorer(settings.KPI_WEIGHTS["content_strategy_scorer"]),
-            "audience_fit_scorer": AudienceFitScorer(settings.KPI_WEIGHTS["audience_fit_scorer"]),
-            "brand_fit_scorer": BrandFitScorer(settings.KPI_WEIGHTS["brand_fit_scorer"]),
-            "trend_fit_scorer": TrendFitScorer(settings.KPI_WEIGHTS["trend_fit_scorer"]),
-            "image_score_scorer": ImageScoreScorer(settings.KPI_WEIGHTS["image_score_scorer"]),
-            "reach_visibility_scorer": ReachVisibilityScorer(settings.KPI_WEIGHTS["reach_visibility_scorer"]),
-            "cost_efficiency_scorer": CostEfficiencyScorer(settings.KPI_WEIGHTS["cost_efficiency_scorer"]),
+            "sales_performance_scorer": SalesPerformanceScorer(weights["sales_performance_scorer"]),
+            "shop_conversion_scorer": ShopConversionScorer(weights["shop_conversion_scorer"]),
+            "tiktok_shop_scorer": TikTokShopScorer(weights["tiktok_shop_scorer"]),
+            "engagement_scorer": EngagementScorer(weights["engagement_scorer"]),
+            "engagement_growth_scorer": EngagementGrowthScorer(weights["engagement_growth_scorer"]),
+            "discovery_scorer": DiscoveryScorer(weights["discovery_scorer"]),
+            "content_strategy_scorer": ContentStrategyScorer(weights["content_strategy_scorer"]),
+            "audience_fit_scorer": AudienceFitScorer(weights["audience_fit_scorer"]),
+            "brand_fit_scorer": BrandFitScorer(weights["brand_fit_scorer"]),
+            "trend_fit_scorer": TrendFitScorer(weights["trend_fit_scorer"]),
+            "image_score_scorer": ImageScoreScorer(weights["image_score_scorer"]),
+            "reach_visibility_scorer": ReachVisibilityScorer(weights["reach_visibility_scorer"]),
+            "cost_efficiency_scorer": CostEfficiencyScorer(weights["cost_efficiency_scorer"]),
         }
         
         self.logger.info("KPI Orchestrator initialized with optimized weights")
     
+    @timed_stage("orchestrator_aggregation")
+    @traced("KPIOrchestrator.calculate_overall_score")
     def calculate_overall_score(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Calculate the optimized OverallScore using the new weighted algorithm
@@ -53,6 +57,10 @@ class KPIOrchestrator:
             Dictionary containing overall score and detailed breakdown
         """
         try:
+            # One configuration (the creator's tenant or niche profile, or the one the
+            # caller bound with using()) for the whole calculation, even if a reload
+            # swaps it meanwhile
+            config = scoring_config.select(data)
             scores = {}
             weighted_scores = {}
             components = {}
@@ -60,25 +68,21 @@ class KPIOrchestrator:
             tier_weights = {"tier_1": 0.0, "tier_2": 0.0, "tier_3": 0.0}
             
             # Calculate individual KPI scores
-            for scorer_name, scorer in self.scorers.items():
-                score = scorer.calculate_score(data)
-                weighted_score = scorer.calculate_weighted_score(data)
-                component_scores = scorer.get_components(data)
-                
-                scores[scorer_name] = score
-                weighted_scores[scorer_name] = weighted_score
-                components[scorer_name] = component_scores
-                
-                # Categorize by tier
-                if scorer_name in settings.TIER_1_KPIS:
-                    tier_scores["tier_1"] += weighted_score
-                    tier_weights["tier_1"] += scorer.weight
-                elif scorer_name in settings.TIER_2_KPIS:
-                    tier_scores["tier_2"] += weighted_score
-                    tier_weights["tier_2"] += scorer.weight
-                elif scorer_name in settings.TIER_3_KPIS:
-                    tier_scores["tier_3"] += weighted_score
-                    tier_weights["tier_3"] += scorer.weight
+            with scoring_config.using(config):
+                for scorer_name, scorer in self.scorers.items():
+                    score = scorer.calculate_score(data)
+                    weight = config.weights[scorer_name]
+                    weighted_score = score * weight
+                    component_scores = scorer.get_components(data)
+                    
+                    scores[scorer_name] = score
+                    weighted_scores[scorer_name] = weighted_score
+                    components[scorer_name] = component_scores
+                    
+                    # Categorize by tier
+                    tier = config.tier_of[scorer_name]
+                    tier_scores[tier] += weighted_score
+                    tier_weights[tier] += weight
             
             # Calculate overall score (sum of weighted scores)
             overall_score = sum(weighted_scores.values())
@@ -103,25 +107,26 @@ class KPIOrchestrator:
             result = {
                 "overall_score": overall_score,
                 "revenue_focus_score": revenue_focus_score,
+                "scoring_profile": config.name,
                 "tier_scores": tier_averages,
                 "individual_scores": scores,
                 "weighted_scores": weighted_scores,
                 "components": components,
                 "performance_levels": performance_levels,
-                "weights": settings.KPI_WEIGHTS,
+                "weights": config.weights,
                 "tier_breakdown": {
                     "tier_1": {
-                        "kpis": settings.TIER_1_KPIS,
+                        "kpis": config.tiers["tier_1"],
                         "total_weight": tier_weights["tier_1"],
                         "average_score": tier_averages["tier_1"]
                     },
                     "tier_2": {
-                        "kpis": settings.TIER_2_KPIS,
+                        "kpis": config.tiers["tier_2"],
                         "total_weight": tier_weights["tier_2"],
                         "average_score": tier_averages["tier_2"]
                     },
                     "tier_3": {
-                        "kpis": settings.TIER_3_KPIS,
+                        "kpis": config.tiers["tier_3"],
                         "total_weight": tier_weights["tier_3"],
                         "average_score": tier_averages["tier_3"]
                     }
@@ -135,6 +140,7 @@ class KPIOrchestrator:
             
         except Exception as e:
             self.logger.error(f"Error calculating overall score: {e}")
+            errors.inc("kpi_orchestrator")
             return {
                 "overall_score": 0.0,
                 "error": str(e),
@@ -142,6 +148,7 @@ class KPIOrchestrator:
                 "components": {}
             }
     
+    @traced("KPIOrchestrator.get_revenue_optimization_insights")
     def get_revenue_optimization_insights(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Get insights for revenue optimization based on the new algorithm
@@ -153,10 +160,12 @@ class KPIOrchestrator:
             Dictionary containing optimization insights
         """
         try:
-            result = self.calculate_overall_score(data)
+            config = scoring_config.select(data)
+            with scoring_config.using(config):
+                result = self.calculate_overall_score(data)
             
             # Identify low-performing revenue drivers
-            revenue_kpis = settings.REVENUE_KPIS
+            revenue_kpis = config.revenue_kpis
             low_performance_kpis = []
             
             for kpi in revenue_kpis:
@@ -166,8 +175,8 @@ class KPIOrchestrator:
                         low_performance_kpis.append({
                             "kpi": kpi,
                             "score": score,
-                            "weight": settings.KPI_WEIGHTS[kpi],
-                            "impact": score * settings.KPI_WEIGHTS[kpi]
+                            "weight": config.weights[kpi],
+                            "impact": score * config.weights[kpi]
                         })
             
             # Sort by impact (score * weight)
@@ -175,7 +184,7 @@ class KPIOrchestrator:
             
             # Calculate potential improvement
             current_revenue_score = result["revenue_focus_score"]
-            max_possible_revenue_score = sum(settings.KPI_WEIGHTS[kpi] for kpi in revenue_kpis)
+            max_possible_revenue_score = sum(config.weights[kpi] for kpi in revenue_kpis)
             improvement_potential = max_possible_revenue_score - current_revenue_score
             
             insights = {
@@ -192,6 +201,7 @@ class KPIOrchestrator:
             
         except Exception as e:
             self.logger.error(f"Error generating revenue optimization insights: {e}")
+            errors.inc("kpi_orchestrator")
             return {"error": str(e)}
     
     def compare_with_equal_weighting(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -206,15 +216,17 @@ class KPIOrchestrator:
         """
         try:
             # Calculate with new weights
-            new_result = self.calculate_overall_score(data)
-            
-            # Calculate with equal weights (old approach)
+            config = scoring_config.select(data)
             equal_weight = 1.0 / len(self.scorers)
             equal_weighted_scores = []
             
-            for scorer_name, scorer in self.scorers.items():
-                score = scorer.calculate_score(data)
-                equal_weighted_scores.append(score * equal_weight)
+            with scoring_config.using(config):
+                new_result = self.calculate_overall_score(data)
+                
+                # Calculate with equal weights (old approach)
+                for scorer_name, scorer in self.scorers.items():
+                    score = scorer.calculate_score(data)
+                    equal_weighted_scores.append(score * equal_weight)
             
             equal_weighted_score = sum(equal_weighted_scores)
             
@@ -227,7 +239,7 @@ class KPIOrchestrator:
                 "equal_weighted_score": equal_weighted_score,
                 "score_difference": score_difference,
                 "percentage_change": percentage_change,
-                "revenue_focus_improvement": new_result["revenue_focus_score"] - (sum(new_result["individual_scores"][kpi] for kpi in settings.REVENUE_KPIS) / len(settings.REVENUE_KPIS)),
+                "revenue_focus_improvement": new_result["revenue_focus_score"] - (sum(new_result["individual_scores"][kpi] for kpi in config.revenue_kpis) / len(config.revenue_kpis)),
                 "algorithm_benefits": {
                     "revenue_alignment": "Prioritizes direct revenue drivers (55% weight)",
                     "intervention_guidance": "Identifies highest-impact improvement areas",
@@ -239,4 +251,5 @@ class KPIOrchestrator:
             
         except Exception as e:
             self.logger.error(f"Error comparing algorithms: {e}")
+            errors.inc("kpi_orchestrator")
             return {"error": str(e)}
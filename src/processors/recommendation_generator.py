@@ -2,10 +2,13 @@
 Recommendation Generator - AI Pipeline for Revenue Optimization
 """
 
+from time import perf_counter
 from typing import Dict, Any, List, Tuple
-import numpy as np
 from src.config.config import settings
+from src.config.scoring_config import scoring_config
 from src.logger.logger import logger
+from src.monitoring.metrics import errors, stage_latency, timed_stage
+from src.monitoring.tracing import traced
 from src.processors.kpi_orchestrator import KPIOrchestrator
 
 
@@ -143,6 +146,7 @@ class RecommendationGenerator:
             }
         }
     
+    @traced("RecommendationGenerator.generate_recommendations")
     def generate_recommendations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate actionable recommendations for revenue optimization
@@ -153,45 +157,53 @@ class RecommendationGenerator:
         Returns:
             Dictionary containing prioritized recommendations
         """
-        try:
-            # Get KPI analysis
-            kpi_analysis = self.kpi_orchestrator.calculate_overall_score(data)
-            insights = self.kpi_orchestrator.get_revenue_optimization_insights(data)
-            
-            # Identify bottlenecks using improved diagnostic model
-            bottlenecks = self._identify_bottlenecks_improved(data, kpi_analysis)
-            
-            # Generate recommendations for each bottleneck
-            recommendations = []
-            for bottleneck in bottlenecks:
-                recommendation = self._create_recommendation(bottleneck, kpi_analysis)
-                if recommendation:
-                    recommendations.append(recommendation)
-            
-            # Sort by priority and expected impact
-            recommendations.sort(key=lambda x: (x["priority_score"], x["expected_improvement"]), reverse=True)
-            
-            # Limit to top recommendations
-            top_recommendations = recommendations[:settings.MAX_RECOMMENDATIONS]
-            
-            result = {
-                "creator_id": data.get("creator_id", "unknown"),
-                "analysis_timestamp": data.get("timestamp", "unknown"),
-                "overall_score": kpi_analysis["overall_score"],
-                "revenue_focus_score": kpi_analysis["revenue_focus_score"],
-                "bottlenecks_identified": len(bottlenecks),
-                "recommendations": top_recommendations,
-                "insights": insights,
-                "next_steps": self._generate_next_steps(top_recommendations)
-            }
-            
-            self.logger.info(f"Generated {len(top_recommendations)} recommendations for creator {data.get('creator_id', 'unknown')}")
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Error generating recommendations: {e}")
-            return {"error": str(e), "recommendations": []}
+        # One configuration snapshot (the creator's profile) for every step, even
+        # if a reload swaps the configuration meanwhile
+        with scoring_config.using(scoring_config.select(data)):
+            try:
+                # Get KPI analysis
+                kpi_analysis = self.kpi_orchestrator.calculate_overall_score(data)
+                insights = self.kpi_orchestrator.get_revenue_optimization_insights(data)
+                
+                # Identify bottlenecks using improved diagnostic model
+                bottlenecks = self._identify_bottlenecks_improved(data, kpi_analysis)
+                
+                # Generate recommendations for each bottleneck
+                ranking_start = perf_counter()
+                recommendations = []
+                for bottleneck in bottlenecks:
+                    recommendation = self._create_recommendation(bottleneck, kpi_analysis)
+                    if recommendation:
+                        recommendations.append(recommendation)
+                
+                # Sort by priority and expected impact
+                recommendations.sort(key=lambda x: (x["priority_score"], x["expected_improvement"]), reverse=True)
+                
+                # Limit to top recommendations
+                top_recommendations = recommendations[:settings.MAX_RECOMMENDATIONS]
+                stage_latency.observe(perf_counter() - ranking_start, "recommendation_ranking")
+                
+                result = {
+                    "creator_id": data.get("creator_id", "unknown"),
+                    "analysis_timestamp": data.get("timestamp", "unknown"),
+                    "overall_score": kpi_analysis["overall_score"],
+                    "revenue_focus_score": kpi_analysis["revenue_focus_score"],
+                    "bottlenecks_identified": len(bottlenecks),
+                    "recommendations": top_recommendations,
+                    "insights": insights,
+                    "next_steps": self._generate_next_steps(top_recommendations)
+                }
+                
+                self.logger.info(f"Generated {len(top_recommendations)} recommendations for creator {data.get('creator_id', 'unknown')}")
+                return result
+                
+            except Exception as e:
+                self.logger.error(f"Error generating recommendations: {e}")
+                errors.inc("recommendation_generator")
+                return {"error": str(e), "recommendations": []}
     
+    @timed_stage("bottleneck_detection")
+    @traced("RecommendationGenerator._identify_bottlenecks_improved")
     def _identify_bottlenecks_improved(self, data: Dict[str, Any], kpi_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Improved bottleneck identification using component-level analysis
@@ -216,78 +228,91 @@ class RecommendationGenerator:
     def _analyze_component_issues(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Analyze specific component issues based on input data
+        
+        Thresholds and weights come from the creator's profile in the active
+        scoring configuration.
         """
+        config = scoring_config.select(data)
+        weights = config.weights
+        thresholds = config.bottleneck_thresholds
         issues = []
         
         # Sales Performance Issues
-        if data.get("conversion_rate", 0) < 0.05:  # Low conversion rate
+        conversion = thresholds["conversion_rate"]
+        if data.get("conversion_rate", 0) < conversion["threshold"]:  # Low conversion rate
             issues.append({
                 "kpi": "sales_performance_scorer",
                 "component": "conversion_rate",
                 "score": data.get("conversion_rate", 0),
-                "weight": settings.KPI_WEIGHTS["sales_performance_scorer"],
-                "impact": data.get("conversion_rate", 0) * settings.KPI_WEIGHTS["sales_performance_scorer"],
-                "severity": "high" if data.get("conversion_rate", 0) < 0.02 else "medium"
+                "weight": weights["sales_performance_scorer"],
+                "impact": data.get("conversion_rate", 0) * weights["sales_performance_scorer"],
+                "severity": "high" if data.get("conversion_rate", 0) < conversion["severe"] else "medium"
             })
         
         # Shop Conversion Issues
-        if data.get("cart_abandonment_rate", 0) > 0.6:  # High abandonment
+        abandonment = thresholds["cart_abandonment_rate"]
+        if data.get("cart_abandonment_rate", 0) > abandonment["threshold"]:  # High abandonment
             issues.append({
                 "kpi": "shop_conversion_scorer",
                 "component": "cart_abandonment_rate",
                 "score": 1 - data.get("cart_abandonment_rate", 0),  # Invert for scoring
-                "weight": settings.KPI_WEIGHTS["shop_conversion_scorer"],
-                "impact": (1 - data.get("cart_abandonment_rate", 0)) * settings.KPI_WEIGHTS["shop_conversion_scorer"],
-                "severity": "high" if data.get("cart_abandonment_rate", 0) > 0.7 else "medium"
+                "weight": weights["shop_conversion_scorer"],
+                "impact": (1 - data.get("cart_abandonment_rate", 0)) * weights["shop_conversion_scorer"],
+                "severity": "high" if data.get("cart_abandonment_rate", 0) > abandonment["severe"] else "medium"
             })
         
-        if data.get("funnel_completion_rate", 0) < 0.3:  # Low funnel completion
+        funnel = thresholds["funnel_completion_rate"]
+        if data.get("funnel_completion_rate", 0) < funnel["threshold"]:  # Low funnel completion
             issues.append({
                 "kpi": "shop_conversion_scorer",
                 "component": "funnel_completion_rate",
                 "score": data.get("funnel_completion_rate", 0),
-                "weight": settings.KPI_WEIGHTS["shop_conversion_scorer"],
-                "impact": data.get("funnel_completion_rate", 0) * settings.KPI_WEIGHTS["shop_conversion_scorer"],
-                "severity": "high" if data.get("funnel_completion_rate", 0) < 0.2 else "medium"
+                "weight": weights["shop_conversion_scorer"],
+                "impact": data.get("funnel_completion_rate", 0) * weights["shop_conversion_scorer"],
+                "severity": "high" if data.get("funnel_completion_rate", 0) < funnel["severe"] else "medium"
             })
         
         # TikTok Shop Issues
-        if data.get("listing_quality", 0) < 0.5:  # Poor listing quality
+        listing = thresholds["listing_quality"]
+        if data.get("listing_quality", 0) < listing["threshold"]:  # Poor listing quality
             issues.append({
                 "kpi": "tiktok_shop_scorer",
                 "component": "tiktok_shop_integration",
                 "score": data.get("listing_quality", 0),
-                "weight": settings.KPI_WEIGHTS["tiktok_shop_scorer"],
-                "impact": data.get("listing_quality", 0) * settings.KPI_WEIGHTS["tiktok_shop_scorer"],
-                "severity": "high" if data.get("listing_quality", 0) < 0.3 else "medium"
+                "weight": weights["tiktok_shop_scorer"],
+                "impact": data.get("listing_quality", 0) * weights["tiktok_shop_scorer"],
+                "severity": "high" if data.get("listing_quality", 0) < listing["severe"] else "medium"
             })
         
         # Content Strategy Issues - Prioritize video quality when very low
-        if data.get("video_quality", 0) < 0.4:  # Poor video quality
+        video = thresholds["video_quality"]
+        if data.get("video_quality", 0) < video["threshold"]:  # Poor video quality
             # Boost priority for very low video quality
-            severity_multiplier = 3.0 if data.get("video_quality", 0) < 0.2 else 2.0
+            severity_multiplier = 3.0 if data.get("video_quality", 0) < video["severe"] else 2.0
             issues.append({
                 "kpi": "content_strategy_scorer",
                 "component": "video_quality",
                 "score": data.get("video_quality", 0),
-                "weight": settings.KPI_WEIGHTS["content_strategy_scorer"] * severity_multiplier,
-                "impact": data.get("video_quality", 0) * settings.KPI_WEIGHTS["content_strategy_scorer"] * severity_multiplier,
-                "severity": "high" if data.get("video_quality", 0) < 0.2 else "medium"
+                "weight": weights["content_strategy_scorer"] * severity_multiplier,
+                "impact": data.get("video_quality", 0) * weights["content_strategy_scorer"] * severity_multiplier,
+                "severity": "high" if data.get("video_quality", 0) < video["severe"] else "medium"
             })
         
         # Engagement Issues
-        if data.get("interaction_balance", 0) < 0.5:  # Poor interaction balance
+        balance = thresholds["interaction_balance"]
+        if data.get("interaction_balance", 0) < balance["threshold"]:  # Poor interaction balance
             issues.append({
                 "kpi": "engagement_scorer",
                 "component": "interaction_balance",
                 "score": data.get("interaction_balance", 0),
-                "weight": settings.KPI_WEIGHTS["engagement_scorer"],
-                "impact": data.get("interaction_balance", 0) * settings.KPI_WEIGHTS["engagement_scorer"],
-                "severity": "high" if data.get("interaction_balance", 0) < 0.3 else "medium"
+                "weight": weights["engagement_scorer"],
+                "impact": data.get("interaction_balance", 0) * weights["engagement_scorer"],
+                "severity": "high" if data.get("interaction_balance", 0) < balance["severe"] else "medium"
             })
         
         return issues
     
+    @traced("RecommendationGenerator._create_recommendation")
     def _create_recommendation(self, bottleneck: Dict[str, Any], kpi_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a specific recommendation for a bottleneck
@@ -342,6 +367,7 @@ class RecommendationGenerator:
             
         except Exception as e:
             self.logger.error(f"Error creating recommendation: {e}")
+            errors.inc("recommendation_generator")
             return None
     
     def _calculate_priority_score(self, bottleneck: Dict[str, Any], template: Dict[str, Any]) -> float:
@@ -3,9 +3,26 @@ Base scorer class for all KPI scorers
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-import numpy as np
+from functools import wraps
+from time import perf_counter
+from typing import Dict, Any, Optional, Tuple
+from src.config.scoring_config import scoring_config
 from src.logger.logger import logger
+from src.monitoring.metrics import errors, scorer_latency
+from src.monitoring.tracing import tracer
+
+
+def _timed_calculate_score(calculate_score):
+    """Wrap a scorer's calculate_score to record its latency and trace span per scorer"""
+    @wraps(calculate_score)
+    def wrapper(self, data: Dict[str, Any]) -> float:
+        start = perf_counter()
+        try:
+            with tracer.span(self.name):
+                return calculate_score(self, data)
+        finally:
+            scorer_latency.observe(perf_counter() - start, self.name)
+    return wrapper
 
 
 class BaseScorer(ABC):
@@ -19,12 +36,24 @@ class BaseScorer(ABC):
         
         Args:
             name: Scorer name
-            weight: Scorer weight for overall score calculation
+            weight: Scorer weight for overall score calculation, used when the
+                scoring configuration has no weight for this scorer
         """
         self.name = name
-        self.weight = weight
+        self.default_weight = weight
         self.logger = logger
-        
+    
+    @property
+    def weight(self) -> float:
+        """Weight of this scorer in the active scoring configuration (or profile being scored)"""
+        return scoring_config.active.weights.get(self.name, self.default_weight)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Instrument each concrete scorer's calculate_score with latency metrics and tracing"""
+        super().__init_subclass__(**kwargs)
+        if "calculate_score" in cls.__dict__ and not getattr(cls.calculate_score, "__isabstractmethod__", False):
+            cls.calculate_score = _timed_calculate_score(cls.calculate_score)
+    
     @abstractmethod
     def calculate_score(self, data: Dict[str, Any]) -> float:
         """
@@ -69,6 +98,22 @@ class BaseScorer(ABC):
         normalized = (score - min_val) / (max_val - min_val)
         return max(0.0, min(1.0, normalized))
     
+    def normalization_range(self, metric: str) -> Tuple[float, float]:
+        """
+        Normalization range of a metric in the active scoring configuration (or profile being scored)
+        
+        Args:
+            metric: Metric name, one of NORMALIZATION_RANGES
+            
+        Returns:
+            (min_val, max_val) for normalize_score
+        """
+        return scoring_config.active.normalization_ranges[metric]
+    
+    def _record_score_error(self) -> None:
+        """Count an exception that calculate_score swallowed and reported as 0.0"""
+        errors.inc(self.name)
+    
     def calculate_weighted_score(self, data: Dict[str, Any]) -> float:
         """
         Calculate weighted score
@@ -30,10 +30,17 @@ class CostEfficiencyScorer(BaseScorer):
             target_cpv = data.get('target_cpv', 0.05)
             
             # Calculate component scores (lower cost = higher score)
-            cpa_score = self.normalize_score(target_cpa / max(cost_per_acquisition, 0.01), 0.0, 2.0)
-            cpe_score = self.normalize_score(target_cpe / max(cost_per_engagement, 0.01), 0.0, 2.0)
-            cpv_score = self.normalize_score(target_cpv / max(cost_per_view, 0.001), 0.0, 2.0)
-            roi = self.normalize_score(roi_score, 0.0, 5.0)  # 0-500% ROI
+            cpa_score = self.normalize_score(
+                target_cpa / max(cost_per_acquisition, 0.01), *self.normalization_range("cost_per_acquisition")
+            )
+            cpe_score = self.normalize_score(
+                target_cpe / max(cost_per_engagement, 0.01), *self.normalization_range("cost_per_engagement")
+            )
+            cpv_score = self.normalize_score(
+                target_cpv / max(cost_per_view, 0.001), *self.normalization_range("cost_per_view")
+            )
+            # Default 0-500% ROI
+            roi = self.normalize_score(roi_score, *self.normalization_range("roi_score"))
             
             # Weighted combination
             score = (
@@ -48,6 +55,7 @@ class CostEfficiencyScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating cost efficiency score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -63,10 +71,16 @@ class CostEfficiencyScorer(BaseScorer):
         target_cpv = data.get('target_cpv', 0.05)
         
         return {
-            "cpa_score": self.normalize_score(target_cpa / max(cost_per_acquisition, 0.01), 0.0, 2.0),
-            "cpe_score": self.normalize_score(target_cpe / max(cost_per_engagement, 0.01), 0.0, 2.0),
-            "cpv_score": self.normalize_score(target_cpv / max(cost_per_view, 0.001), 0.0, 2.0),
-            "roi": self.normalize_score(roi_score, 0.0, 5.0),
+            "cpa_score": self.normalize_score(
+                target_cpa / max(cost_per_acquisition, 0.01), *self.normalization_range("cost_per_acquisition")
+            ),
+            "cpe_score": self.normalize_score(
+                target_cpe / max(cost_per_engagement, 0.01), *self.normalization_range("cost_per_engagement")
+            ),
+            "cpv_score": self.normalize_score(
+                target_cpv / max(cost_per_view, 0.001), *self.normalization_range("cost_per_view")
+            ),
+            "roi": self.normalize_score(roi_score, *self.normalization_range("roi_score")),
             "cost_per_acquisition": cost_per_acquisition,
             "cost_per_engagement": cost_per_engagement,
             "cost_per_view": cost_per_view,
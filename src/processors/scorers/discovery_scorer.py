@@ -29,7 +29,10 @@ class DiscoveryScorer(BaseScorer):
             # Calculate component scores
             hashtag_score = self.normalize_score(hashtag_performance, 0.0, 1.0)
             search_score = self.normalize_score(search_visibility, 0.0, 1.0)
-            recommendation_score = self.normalize_score(recommendation_rate, 0.0, 0.1)  # 0-10%
+            # Default 0-10%
+            recommendation_score = self.normalize_score(
+                recommendation_rate, *self.normalization_range("recommendation_rate")
+            )
             viral_score = self.normalize_score(viral_potential, 0.0, 1.0)
             
             # Weighted combination
@@ -45,6 +48,7 @@ class DiscoveryScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating discovery score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -59,7 +63,9 @@ class DiscoveryScorer(BaseScorer):
         return {
             "hashtag_score": self.normalize_score(hashtag_performance, 0.0, 1.0),
             "search_score": self.normalize_score(search_visibility, 0.0, 1.0),
-            "recommendation_score": self.normalize_score(recommendation_rate, 0.0, 0.1),
+            "recommendation_score": self.normalize_score(
+                recommendation_rate, *self.normalization_range("recommendation_rate")
+            ),
             "viral_score": self.normalize_score(viral_potential, 0.0, 1.0),
             "hashtag_performance": hashtag_performance,
             "search_visibility": search_visibility,
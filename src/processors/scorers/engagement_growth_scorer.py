@@ -26,9 +26,18 @@ class EngagementGrowthScorer(BaseScorer):
             views_growth_rate = data.get('views_growth_rate', 0.0)
             
             # Calculate component scores
-            engagement_growth = self.normalize_score(engagement_growth_rate, -0.5, 2.0)  # -50% to +200%
-            follower_growth = self.normalize_score(follower_growth_rate, -0.3, 1.0)  # -30% to +100%
-            views_growth = self.normalize_score(views_growth_rate, -0.5, 2.0)  # -50% to +200%
+            # Default -50% to +200%
+            engagement_growth = self.normalize_score(
+                engagement_growth_rate, *self.normalization_range("engagement_growth_rate")
+            )
+            # Default -30% to +100%
+            follower_growth = self.normalize_score(
+                follower_growth_rate, *self.normalization_range("follower_growth_rate")
+            )
+            # Default -50% to +200%
+            views_growth = self.normalize_score(
+                views_growth_rate, *self.normalization_range("views_growth_rate")
+            )
             
             # Weighted combination
             score = (
@@ -42,6 +51,7 @@ class EngagementGrowthScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating engagement growth score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -53,9 +63,15 @@ class EngagementGrowthScorer(BaseScorer):
         views_growth_rate = data.get('views_growth_rate', 0.0)
         
         return {
-            "engagement_growth": self.normalize_score(engagement_growth_rate, -0.5, 2.0),
-            "follower_growth": self.normalize_score(follower_growth_rate, -0.3, 1.0),
-            "views_growth": self.normalize_score(views_growth_rate, -0.5, 2.0),
+            "engagement_growth": self.normalize_score(
+                engagement_growth_rate, *self.normalization_range("engagement_growth_rate")
+            ),
+            "follower_growth": self.normalize_score(
+                follower_growth_rate, *self.normalization_range("follower_growth_rate")
+            ),
+            "views_growth": self.normalize_score(
+                views_growth_rate, *self.normalization_range("views_growth_rate")
+            ),
             "engagement_growth_rate": engagement_growth_rate,
             "follower_growth_rate": follower_growth_rate,
             "views_growth_rate": views_growth_rate
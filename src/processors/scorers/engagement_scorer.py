@@ -36,7 +36,10 @@ class EngagementScorer(BaseScorer):
             # Calculate component scores
             interaction_balance = self._calculate_interaction_balance(likes_ratio, comments_ratio, shares_ratio)
             retention_score = self.normalize_score(retention_rate, 0.0, 1.0)
-            sharing_score = self.normalize_score(shares_ratio, 0.0, 0.1)  # 0-10% range
+            # Default 0-10%
+            sharing_score = self.normalize_score(
+                shares_ratio, *self.normalization_range("shares_ratio")
+            )
             watch_completion = min(avg_watch_time / video_duration, 1.0) if video_duration > 0 else 0.0
             
             # Weighted combination
@@ -52,6 +55,7 @@ class EngagementScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating engagement score: {e}")
+            self._record_score_error()
             return 0.0
     
     def _calculate_interaction_balance(self, likes: float, comments: float, shares: float) -> float:
@@ -94,7 +98,9 @@ class EngagementScorer(BaseScorer):
         return {
             "interaction_balance": self._calculate_interaction_balance(likes_ratio, comments_ratio, shares_ratio),
             "retention_score": self.normalize_score(retention_rate, 0.0, 1.0),
-            "sharing_score": self.normalize_score(shares_ratio, 0.0, 0.1),
+            "sharing_score": self.normalize_score(
+                shares_ratio, *self.normalization_range("shares_ratio")
+            ),
             "watch_completion": min(avg_watch_time / video_duration, 1.0) if video_duration > 0 else 0.0,
             "likes_ratio": likes_ratio,
             "comments_ratio": comments_ratio,
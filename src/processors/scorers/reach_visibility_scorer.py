@@ -30,7 +30,10 @@ class ReachVisibilityScorer(BaseScorer):
             # Calculate component scores
             reach_score = self.normalize_score(total_reach, 0.0, target_reach)
             unique_score = self.normalize_score(unique_viewers, 0.0, target_reach)
-            impression = self.normalize_score(impression_rate, 0.0, 0.1)  # 0-10%
+            # Default 0-10%
+            impression = self.normalize_score(
+                impression_rate, *self.normalization_range("impression_rate")
+            )
             visibility = self.normalize_score(visibility_score, 0.0, 1.0)
             
             # Weighted combination
@@ -46,6 +49,7 @@ class ReachVisibilityScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating reach visibility score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -61,7 +65,9 @@ class ReachVisibilityScorer(BaseScorer):
         return {
             "reach_score": self.normalize_score(total_reach, 0.0, target_reach),
             "unique_score": self.normalize_score(unique_viewers, 0.0, target_reach),
-            "impression": self.normalize_score(impression_rate, 0.0, 0.1),
+            "impression": self.normalize_score(
+                impression_rate, *self.normalization_range("impression_rate")
+            ),
             "visibility": self.normalize_score(visibility_score, 0.0, 1.0),
             "total_reach": total_reach,
             "unique_viewers": unique_viewers,
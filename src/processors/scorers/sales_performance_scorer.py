@@ -33,7 +33,10 @@ class SalesPerformanceScorer(BaseScorer):
             target_aov = data.get('target_aov', 50.0)
             
             # Calculate component scores
-            conversion_score = self.normalize_score(conversion_rate, 0.0, 0.1)  # 0-10% range
+            # Default 0-10%
+            conversion_score = self.normalize_score(
+                conversion_rate, *self.normalization_range("conversion_rate")
+            )
             revenue_score = self.normalize_score(total_revenue, 0.0, target_revenue)
             aov_score = self.normalize_score(avg_order_value, 0.0, target_aov)
             
@@ -49,6 +52,7 @@ class SalesPerformanceScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating sales performance score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -62,7 +66,9 @@ class SalesPerformanceScorer(BaseScorer):
         target_aov = data.get('target_aov', 50.0)
         
         return {
-            "conversion_score": self.normalize_score(conversion_rate, 0.0, 0.1),
+            "conversion_score": self.normalize_score(
+                conversion_rate, *self.normalization_range("conversion_rate")
+            ),
             "revenue_score": self.normalize_score(total_revenue, 0.0, target_revenue),
             "aov_score": self.normalize_score(avg_order_value, 0.0, target_aov),
             "conversion_rate": conversion_rate,
@@ -47,6 +47,7 @@ class ShopConversionScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating shop conversion score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -47,6 +47,7 @@ class TikTokShopScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating TikTok Shop score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
@@ -45,6 +45,7 @@ class TrendFitScorer(BaseScorer):
             
         except Exception as e:
             self.logger.error(f"Error calculating trend fit score: {e}")
+            self._record_score_error()
             return 0.0
     
     def get_components(self, data: Dict[str, Any]) -> Dict[str, float]:
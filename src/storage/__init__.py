@@ -0,0 +1,4 @@
+"""
+Storage module for TikTok Metrics AI Agent
+(Persistent analysis history and the queries built on it)
+"""
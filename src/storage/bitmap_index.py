@@ -0,0 +1,240 @@
+"""
+Bitmap index of scorer performance levels for boolean cohort filters
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from src.processors.batch_scorer import PERFORMANCE_LEVELS, performance_level_codes
+from . import expressions
+from .history import AnalysisHistoryStore
+
+
+# Level code of creators without a score for a scorer
+NO_LEVEL = 255
+
+_WORD_BITS = 64
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+_TERM = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)\s*[:=]\s*([A-Za-z]+)")
+
+
+def popcount(bitmap: np.ndarray) -> int:
+    """Number of set bits in a uint64 bitmap"""
+    return int(_POPCOUNT[bitmap.view(np.uint8)].sum(dtype=np.int64))
+
+
+class LevelBitmapIndex:
+    """
+    One bitmap per scorer per performance level over the latest scores
+
+    Every creator gets a bit position; bitmap (scorer, level) has the bit
+    set when the creator's latest score for that scorer falls in the level.
+    Bitmaps are packed 64 creators per word, so a million creators take
+    125 KB per bitmap, and an expression like
+
+        shop_conversion:low AND engagement:high AND NOT discovery:low
+
+    is a handful of vectorized AND/OR/NOT passes over those words. Counts
+    are popcounts; creator IDs are only materialized when asked for.
+
+    The index follows the shared history store (creator_latest), so every
+    server process converges on the same population. Only creators
+    re-analyzed since the last sync are read and re-indexed.
+    """
+
+    def __init__(self, scorers: Sequence[str]):
+        """
+        Initialize an empty index
+
+        Args:
+            scorers: Scorer names, in the column order of update() scores
+        """
+        self.scorers = tuple(scorers)
+        self._scorer_index = {name: i for i, name in enumerate(self.scorers)}
+        self._positions: Dict[str, int] = {}
+        self._creator_ids: List[str] = []
+        self._codes = np.full((len(self.scorers), 0), NO_LEVEL, dtype=np.uint8)
+        self._bitmaps = np.zeros((len(self.scorers), len(PERFORMANCE_LEVELS), 0), dtype=np.uint64)
+        self._present = np.zeros(0, dtype=np.uint64)
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+        self.watermark = 0
+        self.last_sync = 0.0
+        self.updates = 0
+        self.queries = 0
+
+    @property
+    def size(self) -> int:
+        """Number of indexed creators"""
+        return len(self._creator_ids)
+
+    def update(self, creator_ids: Sequence[str], scores: np.ndarray) -> None:
+        """
+        Index the latest scores of creators, replacing their previous levels
+
+        Args:
+            creator_ids: Creator IDs
+            scores: (len(creator_ids), len(scorers)) normalized scores, NaN if unknown
+        """
+        if not len(creator_ids):
+            return
+        scores = np.asarray(scores, dtype=np.float64)
+        codes = performance_level_codes(scores)
+        codes[np.isnan(scores)] = NO_LEVEL
+
+        with self._lock:
+            positions = np.empty(len(creator_ids), dtype=np.int64)
+            for i, creator_id in enumerate(creator_ids):
+                position = self._positions.get(creator_id)
+                if position is None:
+                    position = self._positions[creator_id] = len(self._creator_ids)
+                    self._creator_ids.append(creator_id)
+                positions[i] = position
+            self._reserve(len(self._creator_ids))
+
+            self._codes[:, positions] = codes.T
+            self._rebuild_words(np.unique(positions // _WORD_BITS))
+            self.updates += len(creator_ids)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the code matrix and bitmaps (doubling) to hold capacity creators"""
+        words = self._present.size
+        if capacity <= words * _WORD_BITS:
+            return
+        new_words = max(words * 2, -(-capacity // _WORD_BITS))
+        extra = new_words - words
+        self._codes = np.concatenate(
+            [self._codes, np.full((len(self.scorers), extra * _WORD_BITS), NO_LEVEL, dtype=np.uint8)], axis=1
+        )
+        self._bitmaps = np.concatenate(
+            [self._bitmaps, np.zeros((*self._bitmaps.shape[:2], extra), dtype=np.uint64)], axis=2
+        )
+        self._present = np.concatenate([self._present, np.zeros(extra, dtype=np.uint64)])
+
+    def _rebuild_words(self, words: np.ndarray) -> None:
+        """Recompute the given bitmap words from the level codes"""
+        block = self._codes.reshape(len(self.scorers), -1, _WORD_BITS)[:, words, :]
+        for level in range(len(PERFORMANCE_LEVELS)):
+            bits = np.packbits(block == level, axis=-1, bitorder="little")
+            self._bitmaps[:, level, words] = bits.view(np.uint64)[..., 0]
+        present = (words[:, None] * _WORD_BITS + np.arange(_WORD_BITS)) < len(self._creator_ids)
+        self._present[words] = np.packbits(present, axis=-1, bitorder="little").view(np.uint64)[:, 0]
+
+    def sync(self, store: AnalysisHistoryStore, max_age: float = 0.0) -> int:
+        """
+        Index creators re-analyzed in the history store since the last sync
+
+        Args:
+            store: Analysis history store
+            max_age: Skip the sync if the last one is more recent than this (seconds)
+
+        Returns:
+            Number of creators re-indexed
+        """
+        if time.monotonic() - self.last_sync < max_age:
+            return 0
+        with self._sync_lock:
+            if time.monotonic() - self.last_sync < max_age:
+                return 0
+            rows = store.latest_changes(self.scorers, self.watermark)
+            if rows:
+                self.update(
+                    [row[0] for row in rows],
+                    np.array([tuple(row)[2:] for row in rows], dtype=np.float64).reshape(len(rows), -1)
+                )
+                self.watermark = rows[-1][1]
+            self.last_sync = time.monotonic()
+            return len(rows)
+
+    def _term(self, scorer: str, level: str) -> np.ndarray:
+        """Copy of the bitmap of a scorer:level term (scorer names may omit the _scorer suffix)"""
+        index = self._scorer_index.get(scorer, self._scorer_index.get(f"{scorer}_scorer"))
+        if index is None:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of {', '.join(self.scorers)}")
+        level = level.lower()
+        if level not in PERFORMANCE_LEVELS:
+            raise ValueError(f"Unknown level '{level}', expected one of {', '.join(PERFORMANCE_LEVELS)}")
+        return self._bitmaps[index, PERFORMANCE_LEVELS.index(level)].copy()
+
+    def evaluate(self, expression: str) -> np.ndarray:
+        """
+        Evaluate a boolean level expression to a bitmap of matching creators
+
+        Terms are scorer:level; NOT binds tighter than AND, AND tighter than
+        OR, and parentheses group. NOT is relative to the indexed creators.
+
+        Args:
+            expression: e.g. "shop_conversion:low AND (engagement:high OR discovery:medium)"
+
+        Returns:
+            uint64 bitmap (bit i = creator at position i)
+        """
+        with self._lock:
+            return expressions.evaluate(expression, _TERM, self._term, self._present)
+
+    def count(self, expression: str) -> int:
+        """
+        Count creators matching a level expression without materializing them
+
+        Args:
+            expression: Boolean level expression (see evaluate)
+
+        Returns:
+            Number of matching creators
+        """
+        self.queries += 1
+        return popcount(self.evaluate(expression))
+
+    def query(self, expression: str, limit: int = 0) -> Dict[str, Any]:
+        """
+        Count creators matching a level expression and optionally list them
+
+        Args:
+            expression: Boolean level expression (see evaluate)
+            limit: Maximum creator IDs to return (0 for the count only)
+
+        Returns:
+            Dictionary with the count and up to limit creator IDs in index order
+        """
+        self.queries += 1
+        with self._lock:
+            bitmap = self.evaluate(expression)
+            result: Dict[str, Any] = {"count": popcount(bitmap)}
+            if limit > 0:
+                positions = np.flatnonzero(np.unpackbits(bitmap.view(np.uint8), bitorder="little"))[:limit]
+                result["creator_ids"] = [self._creator_ids[position] for position in positions]
+        return result
+
+    def level_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count creators per scorer and level
+
+        Returns:
+            Dictionary of scorer -> level -> creator count
+        """
+        with self._lock:
+            return {
+                scorer: {level: popcount(self._bitmaps[i, j]) for j, level in enumerate(PERFORMANCE_LEVELS)}
+                for i, scorer in enumerate(self.scorers)
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with indexed creators, bitmap memory and activity counters
+        """
+        return {
+            "creators": self.size,
+            "bitmaps": self._bitmaps.shape[0] * self._bitmaps.shape[1],
+            "bitmap_bytes": self._bitmaps.nbytes,
+            "watermark": self.watermark,
+            "updates": self.updates,
+            "queries": self.queries
+        }
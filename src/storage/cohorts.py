@@ -0,0 +1,343 @@
+"""
+Cohort queries over an in-memory columnar snapshot of the latest scores and inputs
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import expressions
+from .history import METRIC_COLUMNS, SCORER_COLUMNS, TIER_COLUMNS, AnalysisHistoryStore, unpack_metrics
+
+
+# Score columns mirrored from creator_latest, followed by the input metrics
+SCORE_COLUMNS: Sequence[str] = ("analyzed_at", "overall_score", "revenue_focus_score", *TIER_COLUMNS, *SCORER_COLUMNS)
+NUMERIC_COLUMNS: Sequence[str] = (*SCORE_COLUMNS, *METRIC_COLUMNS)
+
+DEFAULT_COLUMNS: Sequence[str] = ("creator_id", "niche", "overall_score", "revenue_focus_score")
+GROUP_BY_COLUMNS: Sequence[str] = ("niche",)
+
+_TERM = re.compile(
+    r"([A-Za-z_][A-Za-z0-9_]*)\s*(<=|>=|!=|==|=|<|>)\s*"
+    r"('[^']*'|\"[^\"]*\"|[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+)
+_COMPARISONS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "=": np.equal, "==": np.equal, "!=": np.not_equal
+}
+_AGGREGATE = re.compile(r"(count|mean|sum|min|max|p(\d{1,2}(?:\.\d+)?|100))(?::([A-Za-z_][A-Za-z0-9_]*))?$")
+
+
+class _Condition:
+    """
+    Rows where a filter condition is true and rows where it is false
+
+    Rows with unknown values are in neither, so NOT swaps the two masks
+    instead of complementing one (three-valued logic, as in SQL).
+    """
+
+    __slots__ = ("true", "false")
+
+    def __init__(self, true: np.ndarray, false: np.ndarray):
+        self.true = true
+        self.false = false
+
+    @classmethod
+    def comparison(cls, matches: np.ndarray, known: np.ndarray) -> "_Condition":
+        """Condition of a comparison, given the rows satisfying it and the rows with a known value"""
+        return cls(matches & known, ~matches & known)
+
+    def __and__(self, other: "_Condition") -> "_Condition":
+        return _Condition(self.true & other.true, self.false | other.false)
+
+    def __or__(self, other: "_Condition") -> "_Condition":
+        return _Condition(self.true | other.true, self.false & other.false)
+
+    def __invert__(self) -> "_Condition":
+        return _Condition(self.false, self.true)
+
+
+class CohortSnapshot:
+    """
+    Column arrays of every creator's latest scores and input metrics
+
+    Each numeric column is one contiguous float64 array (NaN where unknown),
+    and niches are integer codes, so a filter such as
+
+        tier_1 < 0.3 AND engagement_scorer > 0.6 AND total_revenue > 5000
+
+    is a few vectorized comparisons combined into a boolean mask. Sorting
+    selects the top rows with argpartition; aggregates run per niche over
+    the masked values only.
+
+    Like the level bitmap index, the snapshot follows creator_latest in the
+    history store incrementally, so every server process answers over the
+    same population.
+    """
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        self._column_index = {name: i for i, name in enumerate(NUMERIC_COLUMNS)}
+        self._positions: Dict[str, int] = {}
+        self._creator_ids: List[str] = []
+        self._values = np.empty((len(NUMERIC_COLUMNS), 0), dtype=np.float64)
+        self._niche_codes = np.empty(0, dtype=np.int32)
+        self._niches: List[str] = []
+        self._niche_index: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+        self.watermark = 0
+        self.last_sync = 0.0
+        self.updates = 0
+        self.queries = 0
+
+    @property
+    def size(self) -> int:
+        """Number of creators in the snapshot"""
+        return len(self._creator_ids)
+
+    def _niche_code(self, niche: Optional[str]) -> int:
+        """Integer code of a niche (-1 for none), registering new niches"""
+        if niche is None:
+            return -1
+        code = self._niche_index.get(niche)
+        if code is None:
+            code = self._niche_index[niche] = len(self._niches)
+            self._niches.append(niche)
+        return code
+
+    def update(self, creator_ids: Sequence[str], niches: Sequence[Optional[str]], values: np.ndarray) -> None:
+        """
+        Replace the snapshot rows of creators
+
+        Args:
+            creator_ids: Creator IDs
+            niches: Creator niches (None if unknown)
+            values: (len(creator_ids), len(NUMERIC_COLUMNS)) values, NaN if unknown
+        """
+        if not len(creator_ids):
+            return
+        with self._lock:
+            positions = np.empty(len(creator_ids), dtype=np.int64)
+            for i, creator_id in enumerate(creator_ids):
+                position = self._positions.get(creator_id)
+                if position is None:
+                    position = self._positions[creator_id] = len(self._creator_ids)
+                    self._creator_ids.append(creator_id)
+                positions[i] = position
+
+            capacity = self._niche_codes.size
+            if len(self._creator_ids) > capacity:
+                extra = max(capacity // 2, len(self._creator_ids) - capacity)
+                self._values = np.concatenate(
+                    [self._values, np.full((len(NUMERIC_COLUMNS), extra), np.nan)], axis=1
+                )
+                self._niche_codes = np.concatenate([self._niche_codes, np.full(extra, -1, dtype=np.int32)])
+
+            self._values[:, positions] = np.asarray(values, dtype=np.float64).T
+            self._niche_codes[positions] = [self._niche_code(niche) for niche in niches]
+            self.updates += len(creator_ids)
+
+    def sync(self, store: AnalysisHistoryStore, max_age: float = 0.0) -> int:
+        """
+        Load creators re-analyzed in the history store since the last sync
+
+        Args:
+            store: Analysis history store
+            max_age: Skip the sync if the last one is more recent than this (seconds)
+
+        Returns:
+            Number of creators loaded
+        """
+        if time.monotonic() - self.last_sync < max_age:
+            return 0
+        with self._sync_lock:
+            if time.monotonic() - self.last_sync < max_age:
+                return 0
+            rows = store.latest_changes(("niche", *SCORE_COLUMNS, "metrics"), self.watermark)
+            if rows:
+                scores = np.array(
+                    [tuple(row)[3:3 + len(SCORE_COLUMNS)] for row in rows], dtype=np.float64
+                ).reshape(len(rows), len(SCORE_COLUMNS))
+                metrics = unpack_metrics([row["metrics"] for row in rows])
+                self.update([row[0] for row in rows], [row["niche"] for row in rows], np.hstack([scores, metrics]))
+                self.watermark = rows[-1][1]
+            self.last_sync = time.monotonic()
+            return len(rows)
+
+    def _column(self, name: str) -> np.ndarray:
+        """Live view of a numeric column (scorer names may omit the _scorer suffix)"""
+        index = self._column_index.get(name, self._column_index.get(f"{name}_scorer"))
+        if index is None:
+            raise ValueError(f"Unknown column '{name}'")
+        return self._values[index, :self.size]
+
+    def _term(self, name: str, operator: str, literal: str) -> "_Condition":
+        """Rows where a comparison term is true and where it is false"""
+        compare = _COMPARISONS[operator]
+        if name == "niche":
+            if literal[0] not in "'\"" or operator not in ("=", "==", "!="):
+                raise ValueError("niche only supports = and != with a quoted string")
+            codes = self._niche_codes[:self.size]
+            return _Condition.comparison(compare(codes, self._niche_index.get(literal[1:-1], -2)), codes >= 0)
+        if literal[0] in "'\"":
+            raise ValueError(f"Column '{name}' is numeric, got {literal}")
+        column = self._column(name)
+        return _Condition.comparison(compare(column, float(literal)), ~np.isnan(column))
+
+    def filter(self, where: Optional[str]) -> np.ndarray:
+        """
+        Evaluate a filter expression to a mask over the snapshot
+
+        Unknown values (NaN, no niche) satisfy neither a comparison nor its
+        negation, as in SQL: "NOT total_revenue > 5000" matches the same
+        creators as "total_revenue <= 5000".
+
+        Args:
+            where: Comparisons (column op number, niche = 'name') combined with
+                AND, OR, NOT and parentheses; None or empty matches everyone
+
+        Returns:
+            Boolean mask (position i = creator i)
+        """
+        with self._lock:
+            if not where or not where.strip():
+                return np.ones(self.size, dtype=bool)
+            return expressions.evaluate(where, _TERM, self._term).true
+
+    def _aggregate(self, positions: np.ndarray, aggregates: Sequence[str]) -> Dict[str, Any]:
+        """Compute aggregates over the rows at positions, skipping unknown values"""
+        result: Dict[str, Any] = {}
+        for spec in aggregates:
+            match = _AGGREGATE.match(spec)
+            if match is None:
+                raise ValueError(
+                    f"Invalid aggregate '{spec}', expected count or mean|sum|min|max|pNN:column"
+                )
+            function, percentile, column = match.groups()
+            if function == "count":
+                result[spec] = int(positions.size)
+                continue
+            if column is None:
+                raise ValueError(f"Aggregate '{spec}' needs a column, e.g. {function}:overall_score")
+            values = self._column(column)[positions]
+            values = values[~np.isnan(values)]
+            if not values.size:
+                result[spec] = None
+            elif percentile is not None:
+                result[spec] = float(np.percentile(values, float(percentile)))
+            else:
+                result[spec] = float(getattr(np, function)(values))
+        return result
+
+    def _rows(self, positions: np.ndarray, columns: Sequence[str]) -> List[Dict[str, Any]]:
+        """Materialize rows at positions"""
+        arrays = {
+            name: self._column(name)[positions].tolist()
+            for name in columns if name not in ("creator_id", "niche")
+        }
+        niche_codes = self._niche_codes[positions].tolist()
+        rows = []
+        for i, position in enumerate(positions.tolist()):
+            row: Dict[str, Any] = {}
+            for name in columns:
+                if name == "creator_id":
+                    row[name] = self._creator_ids[position]
+                elif name == "niche":
+                    row[name] = self._niches[niche_codes[i]] if niche_codes[i] >= 0 else None
+                else:
+                    value = arrays[name][i]
+                    row[name] = None if value != value else value
+            rows.append(row)
+        return rows
+
+    def query(
+        self,
+        where: Optional[str] = None,
+        sort_by: str = "overall_score",
+        descending: bool = True,
+        limit: int = 50,
+        columns: Optional[Sequence[str]] = None,
+        group_by: Optional[str] = None,
+        aggregates: Sequence[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Filter, rank and aggregate the snapshot
+
+        Args:
+            where: Filter expression (see filter)
+            sort_by: Numeric column to rank matching creators by (unknown values excluded)
+            descending: Highest values first
+            limit: Maximum rows returned (0 for aggregates only)
+            columns: Columns of returned rows (default: IDs, niche, main scores, sort column)
+            group_by: Column to group aggregates by, one of GROUP_BY_COLUMNS
+            aggregates: "count" or function:column with function mean, sum,
+                min, max or a percentile p0..p100, e.g. "p90:total_revenue"
+
+        Returns:
+            Dictionary with the population, match count, rows and aggregates
+        """
+        if group_by is not None and group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Invalid group_by '{group_by}', expected one of {', '.join(GROUP_BY_COLUMNS)}")
+        columns = list(columns or DEFAULT_COLUMNS)
+        if sort_by not in columns and columns == list(DEFAULT_COLUMNS):
+            columns.append(sort_by)
+
+        self.queries += 1
+        with self._lock:
+            positions = np.flatnonzero(self.filter(where))
+            result: Dict[str, Any] = {"population": self.size, "matched": int(positions.size)}
+
+            if limit > 0:
+                for name in columns:
+                    if name not in ("creator_id", "niche"):
+                        self._column(name)
+                keys = self._column(sort_by)[positions]
+                known = ~np.isnan(keys)
+                ranked, keys = positions[known], keys[known]
+                if descending:
+                    keys = -keys
+                if ranked.size > limit:
+                    top = np.argpartition(keys, limit - 1)[:limit]
+                    ranked, keys = ranked[top], keys[top]
+                result["rows"] = self._rows(ranked[np.lexsort((ranked, keys))], columns)
+
+            if aggregates:
+                if group_by is None:
+                    result["aggregates"] = self._aggregate(positions, aggregates)
+                else:
+                    # One stable sort by group code makes every group a contiguous slice
+                    codes = self._niche_codes[positions]
+                    order = np.argsort(codes, kind="stable")
+                    codes, grouped = codes[order], positions[order]
+                    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+                    ends = np.r_[starts[1:], codes.size]
+                    result["groups"] = [
+                        {
+                            group_by: self._niches[codes[start]] if codes[start] >= 0 else None,
+                            **self._aggregate(grouped[start:end], aggregates)
+                        }
+                        for start, end in zip(starts.tolist(), ends.tolist())
+                    ]
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get snapshot statistics
+
+        Returns:
+            Dictionary with the population, column memory and activity counters
+        """
+        return {
+            "creators": self.size,
+            "columns": len(NUMERIC_COLUMNS),
+            "bytes": self._values.nbytes + self._niche_codes.nbytes,
+            "niches": len(self._niches),
+            "watermark": self.watermark,
+            "updates": self.updates,
+            "queries": self.queries
+        }
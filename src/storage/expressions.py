@@ -0,0 +1,126 @@
+"""
+Boolean filter expressions evaluated to NumPy masks or bitmaps
+"""
+
+import re
+from typing import Any, Callable, List, Optional, Pattern, Tuple
+
+import numpy as np
+
+
+_KEYWORD = re.compile(r"(AND|OR|NOT)\b", re.IGNORECASE)
+
+# Deepest nesting of NOT and parentheses accepted; the parser recurses once per level
+MAX_DEPTH = 50
+
+Token = Tuple[str, Any]
+
+
+def tokenize(expression: str, term_pattern: Pattern[str]) -> List[Token]:
+    """
+    Split a filter expression into "(", ")", "op" and "term" tokens
+
+    Args:
+        expression: Filter expression
+        term_pattern: Regex matching one term; its groups become the token value
+
+    Returns:
+        Tokens in order
+    """
+    tokens: List[Token] = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        while expression[position].isspace():
+            position += 1
+        char = expression[position]
+        if char in "()":
+            tokens.append((char, None))
+            position += 1
+            continue
+        match = term_pattern.match(expression, position)
+        if match is not None:
+            tokens.append(("term", match.groups()))
+            position = match.end()
+            continue
+        match = _KEYWORD.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unexpected input at position {position}: '{expression[position:position + 20]}'")
+        tokens.append(("op", match.group(1).upper()))
+        position = match.end()
+    return tokens
+
+
+def evaluate(
+    expression: str,
+    term_pattern: Pattern[str],
+    term: Callable[..., np.ndarray],
+    universe: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Evaluate a boolean expression of terms with AND, OR, NOT and parentheses
+
+    NOT binds tighter than AND, and AND tighter than OR; NOT and
+    parentheses nest at most MAX_DEPTH deep. Operands are combined with &,
+    | and ~, so terms may return boolean masks, packed integer bitmaps or
+    any object defining those operators.
+
+    Args:
+        expression: Filter expression
+        term_pattern: Regex matching one term
+        term: Called with a term's regex groups, returns its mask; must not
+            return an array it keeps, since masks may be combined in place
+        universe: Mask of valid positions NOT is restricted to (None: all)
+
+    Returns:
+        Mask of the whole expression
+    """
+    tokens = tokenize(expression, term_pattern)
+    if not tokens:
+        raise ValueError("Empty expression")
+    position = 0
+
+    def peek() -> Token:
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def parse_or(depth: int) -> np.ndarray:
+        nonlocal position
+        result = parse_and(depth)
+        while peek() == ("op", "OR"):
+            position += 1
+            result |= parse_and(depth)
+        return result
+
+    def parse_and(depth: int) -> np.ndarray:
+        nonlocal position
+        result = parse_not(depth)
+        while peek() == ("op", "AND"):
+            position += 1
+            result &= parse_not(depth)
+        return result
+
+    def parse_not(depth: int) -> np.ndarray:
+        nonlocal position
+        kind, value = peek()
+        position += 1
+        if (value == "NOT" or kind == "(") and depth >= MAX_DEPTH:
+            raise ValueError(f"Expression nests NOT and parentheses more than {MAX_DEPTH} deep")
+        if (kind, value) == ("op", "NOT"):
+            result = ~parse_not(depth + 1)
+            if universe is not None:
+                result &= universe
+            return result
+        if kind == "(":
+            result = parse_or(depth + 1)
+            if peek()[0] != ")":
+                raise ValueError("Missing closing parenthesis")
+            position += 1
+            return result
+        if kind == "term":
+            return term(*value)
+        raise ValueError(f"Expected a term, NOT or '(' at token {position}")
+
+    result = parse_or(0)
+    if position != len(tokens):
+        raise ValueError(f"Unexpected token at {position}")
+    return result
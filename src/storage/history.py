@@ -0,0 +1,424 @@
+"""
+Persistent analysis history in SQLite
+"""
+
+import sqlite3
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.config.config import settings
+from src.config.metric_value_ranges import METRIC_DEFAULTS
+from src.logger.logger import logger
+from .sqlite import SQLiteDatabase
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+TIER_COLUMNS: Sequence[str] = ("tier_1", "tier_2", "tier_3")
+SCORER_COLUMNS: Sequence[str] = tuple(settings.KPI_WEIGHTS)
+
+# Column order of history rows (after the integer primary key)
+HISTORY_COLUMNS: Sequence[str] = (
+    "creator_id", "niche", "analyzed_at", "overall_score", "revenue_focus_score",
+    *TIER_COLUMNS, *SCORER_COLUMNS, "degraded", "weight_version"
+)
+
+# Input metrics of the latest analysis, packed as float64 in this order
+METRIC_COLUMNS: Sequence[str] = tuple(METRIC_DEFAULTS)
+
+# Columns a leaderboard can be sorted by
+SORT_KEYS: Sequence[str] = ("overall_score", "revenue_focus_score", *TIER_COLUMNS, *SCORER_COLUMNS)
+
+# Sort keys whose leaderboard indexes are part of the schema; the others are
+# built in the background (see AnalysisHistoryStore.start_index_build)
+_PRIMARY_SORT_KEYS: Sequence[str] = ("overall_score", "revenue_focus_score")
+
+HistoryRow = Tuple[Any, ...]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS analysis_history (
+    id INTEGER PRIMARY KEY,
+    creator_id TEXT NOT NULL,
+    niche TEXT,
+    analyzed_at REAL NOT NULL,
+    overall_score REAL NOT NULL,
+    revenue_focus_score REAL NOT NULL,
+    {", ".join(f"{column} REAL" for column in (*TIER_COLUMNS, *SCORER_COLUMNS))},
+    degraded INTEGER NOT NULL DEFAULT 0,
+    weight_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_creator_time ON analysis_history (creator_id, analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_history_time ON analysis_history (analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_history_overall ON analysis_history (overall_score);
+CREATE INDEX IF NOT EXISTS idx_history_revenue ON analysis_history (revenue_focus_score);
+CREATE TABLE IF NOT EXISTS creator_latest (
+    creator_id TEXT PRIMARY KEY,
+    id INTEGER NOT NULL,
+    {", ".join(f"{column} {'REAL' if column != 'niche' else 'TEXT'}" for column in HISTORY_COLUMNS[1:-2])},
+    degraded INTEGER NOT NULL DEFAULT 0,
+    weight_version TEXT,
+    metrics BLOB
+);
+CREATE TRIGGER IF NOT EXISTS trg_history_latest AFTER INSERT ON analysis_history BEGIN
+    INSERT INTO creator_latest (id, {", ".join(HISTORY_COLUMNS)})
+    VALUES (NEW.id, {", ".join(f"NEW.{column}" for column in HISTORY_COLUMNS)})
+    ON CONFLICT (creator_id) DO UPDATE SET
+        id = excluded.id, {", ".join(f"{column} = excluded.{column}" for column in HISTORY_COLUMNS[1:])}
+    WHERE excluded.analyzed_at >= creator_latest.analyzed_at;
+END;
+CREATE INDEX IF NOT EXISTS idx_latest_id ON creator_latest (id);
+"""
+
+_INSERT = (
+    f"INSERT INTO analysis_history ({', '.join(HISTORY_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in HISTORY_COLUMNS)})"
+)
+
+# Attach input metrics to the creator's latest analysis (no-op for an older one)
+_SET_METRICS = "UPDATE creator_latest SET metrics = ? WHERE creator_id = ? AND analyzed_at = ?"
+
+_ADDED_COLUMNS = (("creator_latest", "metrics", "BLOB"),)
+
+
+def _leaderboard_indexes(sort_key: str) -> str:
+    """
+    DDL of the covering indexes serving leaderboards sorted by a column
+
+    Each index holds the sort key, the creator_id tie-breaker and the
+    analysis time, so filtering and seeking never touch the table; only the
+    rows of the returned page are read from it.
+    """
+    return (
+        f"CREATE INDEX IF NOT EXISTS idx_latest_{sort_key} "
+        f"ON creator_latest ({sort_key}, creator_id, analyzed_at);\n"
+        f"CREATE INDEX IF NOT EXISTS idx_latest_niche_{sort_key} "
+        f"ON creator_latest (niche, {sort_key}, creator_id, analyzed_at);\n"
+    )
+
+
+_SCHEMA += "".join(_leaderboard_indexes(sort_key) for sort_key in _PRIMARY_SORT_KEYS)
+
+
+def parse_timestamp(value: Any, default: Optional[float] = None) -> Optional[float]:
+    """
+    Convert an ISO 8601 string or epoch seconds to epoch seconds
+
+    Args:
+        value: Timestamp as ISO string, number or numeric string
+        default: Returned when the value is empty or unparseable
+
+    Returns:
+        Epoch seconds
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return default
+
+
+def pack_metrics(metrics: Mapping[str, Any]) -> bytes:
+    """
+    Pack input metrics as float64 in METRIC_COLUMNS order
+
+    Args:
+        metrics: Creator metrics; missing or None values take their default
+
+    Returns:
+        Packed metrics (see unpack_metrics)
+    """
+    # array("d") packs native float64, like NumPy, without importing it on the write path
+    return array(
+        "d",
+        [metrics.get(name) if metrics.get(name) is not None else METRIC_DEFAULTS[name] for name in METRIC_COLUMNS]
+    ).tobytes()
+
+
+def unpack_metrics(blobs: Sequence[Optional[bytes]]) -> "np.ndarray":
+    """
+    Unpack stored input metrics into a matrix
+
+    Args:
+        blobs: pack_metrics() results, None where unknown
+
+    Returns:
+        (len(blobs), len(METRIC_COLUMNS)) float64 matrix, NaN rows where unknown
+    """
+    import numpy as np
+
+    width = len(METRIC_COLUMNS) * 8
+    packed = b"".join(blob if blob is not None and len(blob) == width else bytes(width) for blob in blobs)
+    matrix = np.frombuffer(packed, dtype=np.float64).reshape(len(blobs), len(METRIC_COLUMNS)).copy()
+    matrix[[blob is None or len(blob) != width for blob in blobs]] = np.nan
+    return matrix
+
+
+def history_row(result: Mapping[str, Any], niche: Optional[str] = None,
+                metrics: Optional[Mapping[str, Any]] = None) -> HistoryRow:
+    """
+    Build a compact history row from an analysis or batch score result
+
+    Args:
+        result: /analyze response or BatchScorer.score_records() result
+        niche: Creator niche, if not part of the result
+        metrics: Input metrics the result was computed from
+
+    Returns:
+        Row values in HISTORY_COLUMNS order, followed by the packed metrics (or None)
+    """
+    if "tier_scores" in result:
+        tiers = result["tier_scores"]
+    else:
+        tiers = {tier: values["average_score"] for tier, values in result["tier_breakdown"].items()}
+    scores = result["individual_scores"]
+    return (
+        result["creator_id"],
+        result.get("niche", niche),
+        parse_timestamp(result.get("timestamp"), default=time.time()),
+        result["overall_score"],
+        result["revenue_focus_score"],
+        *(tiers.get(tier) for tier in TIER_COLUMNS),
+        *(scores.get(scorer) for scorer in SCORER_COLUMNS),
+        1 if result.get("degraded") else 0,
+        settings.weight_version,
+        pack_metrics(metrics) if metrics is not None else None,
+    )
+
+
+def row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """
+    Convert a stored history row to its API representation
+
+    Args:
+        row: analysis_history row
+
+    Returns:
+        Dictionary with nested tier and scorer scores
+    """
+    return {
+        "id": row["id"],
+        "creator_id": row["creator_id"],
+        "niche": row["niche"],
+        "timestamp": datetime.fromtimestamp(row["analyzed_at"]).isoformat(),
+        "analyzed_at": row["analyzed_at"],
+        "overall_score": row["overall_score"],
+        "revenue_focus_score": row["revenue_focus_score"],
+        "tier_scores": {tier: row[tier] for tier in TIER_COLUMNS},
+        "individual_scores": {scorer: row[scorer] for scorer in SCORER_COLUMNS},
+        "degraded": bool(row["degraded"]),
+        "weight_version": row["weight_version"]
+    }
+
+
+class AnalysisHistoryStore:
+    """
+    Analysis results stored one row per analysis, scores as REAL columns
+
+    The database runs in WAL mode so readers never block the writer, and
+    rows are inserted in batches (see WriteBehindBuffer) rather than one
+    transaction per request.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store; the database is created on first use
+
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._db = SQLiteDatabase(path, _SCHEMA, _ADDED_COLUMNS)
+        self._connection = self._db.connection
+        self._indexed_sort_keys = set(_PRIMARY_SORT_KEYS)
+        self._index_thread: Optional[threading.Thread] = None
+
+    def insert_many(self, rows: Sequence[HistoryRow]) -> None:
+        """
+        Insert rows in a single transaction
+
+        Args:
+            rows: history_row() results
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT, [row[:-1] for row in rows])
+            conn.executemany(_SET_METRICS, [(row[-1], row[0], row[2]) for row in rows])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def creator_history(self, creator_id: str, start: Optional[float] = None, end: Optional[float] = None,
+                        limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get a creator's analyses, newest first
+
+        Args:
+            creator_id: Creator ID
+            start: Earliest analysis time (epoch seconds, inclusive)
+            end: Latest analysis time (epoch seconds, exclusive)
+            limit: Maximum rows
+
+        Returns:
+            History rows
+        """
+        rows = self._connection().execute(
+            "SELECT * FROM analysis_history WHERE creator_id = ? AND analyzed_at >= ? AND analyzed_at < ? "
+            "ORDER BY analyzed_at DESC, id DESC LIMIT ?",
+            (creator_id, start if start is not None else float("-inf"),
+             end if end is not None else float("inf"), limit)
+        ).fetchall()
+        return [row_to_dict(row) for row in rows]
+
+    def time_range(self, start: Optional[float] = None, end: Optional[float] = None, limit: int = 1000,
+                   after: Optional[Tuple[float, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Scan analyses of all creators in time order with keyset pagination
+
+        Args:
+            start: Earliest analysis time (epoch seconds, inclusive)
+            end: Latest analysis time (epoch seconds, exclusive)
+            limit: Maximum rows
+            after: (analyzed_at, id) of the last row of the previous page
+
+        Returns:
+            History rows, oldest first
+        """
+        conditions = ["analyzed_at >= ?", "analyzed_at < ?"]
+        params: List[Any] = [start if start is not None else float("-inf"), end if end is not None else float("inf")]
+        if after is not None:
+            conditions.append("(analyzed_at, id) > (?, ?)")
+            params.extend(after)
+        rows = self._connection().execute(
+            f"SELECT * FROM analysis_history WHERE {' AND '.join(conditions)} ORDER BY analyzed_at, id LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [row_to_dict(row) for row in rows]
+
+    def build_sort_indexes(self) -> None:
+        """
+        Build the leaderboard indexes of the remaining sort keys
+
+        Each CREATE INDEX holds the database write lock while it runs, so this
+        belongs off the request path (see start_index_build). Leaderboards of
+        a key are served without its index, by a scan and sort, until built.
+        """
+        for sort_key in SORT_KEYS:
+            if sort_key not in self._indexed_sort_keys:
+                self._connection().executescript(_leaderboard_indexes(sort_key))
+                self._indexed_sort_keys.add(sort_key)
+
+    def start_index_build(self) -> None:
+        """Build the remaining leaderboard indexes in a background thread (once)"""
+        if self._index_thread is not None:
+            return
+        self._index_thread = threading.Thread(target=self._build_indexes, name="history-indexes", daemon=True)
+        self._index_thread.start()
+
+    def _build_indexes(self) -> None:
+        """Background index build; a failure only leaves leaderboards unindexed"""
+        try:
+            self.build_sort_indexes()
+        except sqlite3.Error as e:
+            logger.warning(f"Leaderboard indexes not built: {e}")
+
+    def leaderboard(self, sort_key: str = "overall_score", descending: bool = True, niche: Optional[str] = None,
+                    start: Optional[float] = None, end: Optional[float] = None, limit: int = 50,
+                    after: Optional[Tuple[float, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Rank creators by a score of their latest analysis with keyset pagination
+
+        Pages seek past the previous page's last (score, creator_id) in a
+        covering index instead of skipping rows, so every page costs the same.
+        Keys whose index is still being built fall back to a scan and sort.
+
+        Args:
+            sort_key: Column to rank by, one of SORT_KEYS
+            descending: Highest scores first
+            niche: Only creators in this niche
+            start: Only creators last analyzed at or after this time (epoch seconds)
+            end: Only creators last analyzed before this time (epoch seconds)
+            limit: Maximum rows
+            after: (score, creator_id) of the last row of the previous page
+
+        Returns:
+            Latest analysis rows in rank order
+        """
+        if sort_key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort_key}', expected one of {', '.join(SORT_KEYS)}")
+
+        conditions = [f"{sort_key} IS NOT NULL"]
+        params: List[Any] = []
+        if niche is not None:
+            conditions.append("niche = ?")
+            params.append(niche)
+        if start is not None:
+            conditions.append("analyzed_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("analyzed_at < ?")
+            params.append(end)
+        if after is not None:
+            conditions.append(f"({sort_key}, creator_id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        direction = "DESC" if descending else "ASC"
+        rows = self._connection().execute(
+            f"SELECT * FROM creator_latest WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {sort_key} {direction}, creator_id {direction} LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [row_to_dict(row) for row in rows]
+
+    def latest_changes(self, columns: Sequence[str], after_id: int = 0) -> List[sqlite3.Row]:
+        """
+        Get the latest analyses of creators updated since a history row ID
+
+        History IDs grow with every committed insert, so a reader keeping the
+        highest ID it has seen picks up exactly the creators re-analyzed since.
+
+        Args:
+            columns: creator_latest columns to return besides creator_id and id
+            after_id: Highest history row ID already seen
+
+        Returns:
+            Rows of (creator_id, id, *columns) ordered by id
+        """
+        return self._connection().execute(
+            f"SELECT {', '.join(('creator_id', 'id', *columns))} FROM creator_latest WHERE id > ? ORDER BY id",
+            (after_id,)
+        ).fetchall()
+
+    def last_id(self) -> int:
+        """
+        Get the highest history row ID, the starting point for latest_changes()
+
+        Returns:
+            Highest row ID, 0 for an empty store
+        """
+        row = self._connection().execute("SELECT MAX(id) AS max_id FROM analysis_history").fetchone()
+        return row["max_id"] or 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics
+
+        Returns:
+            Dictionary with the approximate row count and database size
+        """
+        return {
+            "approximate_rows": self.last_id(),
+            "indexed_sort_keys": len(self._indexed_sort_keys),
+            "database_bytes": self._db.size_bytes()
+        }
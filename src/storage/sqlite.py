@@ -0,0 +1,68 @@
+"""
+Shared SQLite connection handling for the local stores
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Sequence, Tuple
+
+
+class SQLiteDatabase:
+    """
+    One SQLite connection per thread, in WAL mode, with the schema applied once
+
+    Connections use autocommit mode; writers open transactions explicitly
+    with ``BEGIN IMMEDIATE``. WAL lets readers run alongside the single
+    writer, including across processes sharing the file.
+    """
+
+    def __init__(self, path: str, schema: str, added_columns: Sequence[Tuple[str, str, str]] = ()):
+        """
+        Initialize the database; the file is created on first use
+
+        Args:
+            path: Database file path
+            schema: Idempotent DDL script (CREATE ... IF NOT EXISTS)
+            added_columns: (table, column, declaration) of columns added to a
+                table after its first release, added to older files if missing
+        """
+        self.path = path
+        self.schema = schema
+        self.added_columns = added_columns
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, creating the database if needed
+
+        Returns:
+            Connection with sqlite3.Row rows
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(self.schema)
+                for table, column, declaration in self.added_columns:
+                    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                self._schema_ready = True
+        self._local.conn = conn
+        return conn
+
+    def size_bytes(self) -> int:
+        """Size of the main database file"""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
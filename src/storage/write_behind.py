@@ -0,0 +1,145 @@
+"""
+Write-behind buffer moving inserts off the request path
+"""
+
+import threading
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from src.logger.logger import logger
+from src.monitoring.metrics import errors
+
+
+T = TypeVar("T")
+
+
+class WriteBehindBuffer(Generic[T]):
+    """
+    Bounded in-memory buffer flushed to a sink in batches by a background thread
+
+    ``add`` only appends under a lock, so callers never wait for storage. The
+    flusher writes whenever a full batch is ready or the flush interval has
+    passed. When the sink falls behind and the buffer is full, new items are
+    dropped (and counted) rather than slowing requests down.
+    """
+
+    def __init__(self, sink: Callable[[List[T]], None], name: str, max_buffer: int,
+                 batch_size: int, flush_interval: float):
+        """
+        Initialize the buffer (items are only written once started)
+
+        Args:
+            sink: Writes a batch of items, e.g. one multi-row insert
+            name: Name used in logs and error metrics
+            max_buffer: Maximum items held before new items are dropped
+            batch_size: Items that trigger an immediate flush
+            flush_interval: Maximum seconds an item waits before being written
+        """
+        self.sink = sink
+        self.name = name
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._items: List[T] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.added = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def add(self, item: T) -> bool:
+        """
+        Buffer an item without blocking on storage
+
+        Args:
+            item: Item to write
+
+        Returns:
+            False if the buffer was full and the item was dropped
+        """
+        with self._lock:
+            if len(self._items) >= self.max_buffer:
+                self.dropped += 1
+                return False
+            self._items.append(item)
+            self.added += 1
+            full_batch = len(self._items) >= self.batch_size
+        if full_batch:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write everything buffered so far
+
+        Returns:
+            Number of items written
+        """
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._items, []
+            if not items:
+                return 0
+            written = 0
+            try:
+                for start in range(0, len(items), self.batch_size):
+                    batch = items[start:start + self.batch_size]
+                    self.sink(batch)
+                    written += len(batch)
+            except Exception as e:
+                # Failed batches are not retried, so a broken sink cannot grow memory
+                logger.error(f"{self.name} write-behind flush failed: {e}")
+                errors.inc(self.name)
+                self.failed += len(items) - written
+            finally:
+                self.written += written
+                self.flushes += 1
+            return written
+
+    def start(self) -> None:
+        """Start the background flusher (no-op if already running)"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher after writing everything still buffered"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        """Flush on a full batch or after the flush interval"""
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get buffer statistics
+
+        Returns:
+            Dictionary with buffered, written, dropped and failed item counts
+        """
+        return {
+            "running": self._thread is not None,
+            "buffered": len(self._items),
+            "added": self.added,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes
+        }
@@ -0,0 +1,3 @@
+"""
+Shared utilities for TikTok Metrics AI Agent
+"""
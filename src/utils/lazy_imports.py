@@ -0,0 +1,28 @@
+"""
+Imports for heavy optional dependencies
+
+pyarrow and similar packages add hundreds of milliseconds to interpreter
+start-up and are not always installed. Batch code paths import them through
+``optional_import`` when they are needed, so the API process does not pay for
+them at cold start and runs without them.
+"""
+
+import importlib
+import types
+from typing import Optional
+
+
+def optional_import(name: str) -> Optional[types.ModuleType]:
+    """
+    Import a module if it is installed
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        The module, or None if it is not installed
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
@@ -4,6 +4,8 @@ class TikTokMetricsDashboard {
     constructor() {
         this.apiBaseUrl = window.location.origin;
         this.currentAnalysis = null;
+        this.scoreStream = null;
+        this.streamCreatorId = null;
         this.init();
     }
 
@@ -33,6 +35,48 @@ class TikTokMetricsDashboard {
         document.getElementById('resetBtn').addEventListener('click', () => {
             this.resetForm();
         });
+
+        // Follow live score updates for the creator being viewed
+        document.getElementById('creator_id').addEventListener('change', (event) => {
+            this.subscribeToScores(event.target.value.trim());
+        });
+    }
+
+    subscribeToScores(creatorId) {
+        if (creatorId === this.streamCreatorId) {
+            return;
+        }
+        if (this.scoreStream) {
+            this.scoreStream.close();
+            this.scoreStream = null;
+        }
+        this.streamCreatorId = creatorId;
+        if (!creatorId || !window.EventSource) {
+            return;
+        }
+
+        // The server pushes every new analysis of this creator (starting with the
+        // latest known one) and coalesces updates if we fall behind
+        this.scoreStream = new EventSource(
+            `${this.apiBaseUrl}/stream/scores?creator_ids=${encodeURIComponent(creatorId)}`
+        );
+        this.scoreStream.addEventListener('score', (event) => {
+            this.applyScoreUpdate(JSON.parse(event.data));
+        });
+    }
+
+    applyScoreUpdate(data) {
+        const current = this.currentAnalysis;
+        if (current && current.creator_id === data.creator_id &&
+            current.timestamp === data.timestamp && current.overall_score === data.overall_score) {
+            return;
+        }
+        // Degraded updates carry scores only; keep the recommendations we have
+        if (data.degraded && current && current.creator_id === data.creator_id) {
+            data = { ...data, recommendations: current.recommendations };
+        }
+        this.currentAnalysis = data;
+        this.displayAnalysis(data, false);
     }
 
     async checkAPIHealth() {
@@ -65,6 +109,7 @@ class TikTokMetricsDashboard {
             
             if (data.success) {
                 this.populateForm(data.demo_data);
+                this.subscribeToScores(data.demo_data.creator_id);
                 this.hideLoading();
                 this.showNotification('Demo data loaded successfully!', 'success');
             } else {
@@ -116,6 +161,7 @@ class TikTokMetricsDashboard {
             if (data.success) {
                 this.currentAnalysis = data;
                 this.displayAnalysis(data);
+                this.subscribeToScores(data.creator_id);
                 this.hideLoading();
                 this.showNotification('Analysis completed successfully!', 'success');
             } else {
@@ -170,7 +216,7 @@ class TikTokMetricsDashboard {
         return formData;
     }
 
-    displayAnalysis(data) {
+    displayAnalysis(data, scrollIntoView = true) {
         // Update overall score
         this.updateOverallScore(data.overall_score, data.revenue_focus_score);
         
@@ -185,7 +231,9 @@ class TikTokMetricsDashboard {
         
         // Show analysis section
         document.getElementById('analysisSection').style.display = 'block';
-        document.getElementById('analysisSection').scrollIntoView({ behavior: 'smooth' });
+        if (scrollIntoView) {
+            document.getElementById('analysisSection').scrollIntoView({ behavior: 'smooth' });
+        }
     }
 
     updateOverallScore(overallScore, revenueScore) {
@@ -370,6 +418,8 @@ class TikTokMetricsDashboard {
         document.querySelectorAll('input').forEach(input => {
             input.value = '';
         });
+        this.subscribeToScores('');
+        this.currentAnalysis = null;
         document.getElementById('analysisSection').style.display = 'none';
         document.getElementById('comparisonSection').style.display = 'none';
         this.showNotification('Form reset successfully!', 'success');
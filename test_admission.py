@@ -0,0 +1,104 @@
+"""
+Admission control tests: load shedding with Retry-After, the degraded
+score-only /analyze response and the priority-ordered wait queue
+"""
+
+import asyncio
+
+import pytest
+
+from app import admission_controller
+from src.api.admission import PRIORITY_CLASSES, AdmissionController
+from src.config.config import settings
+
+
+@pytest.fixture
+def demo(api_client):
+    """Demo metrics, fetched while the service still admits requests"""
+    return api_client.get("/demo-data").json()["demo_data"]
+
+
+@pytest.fixture
+def saturated(demo, monkeypatch):
+    """Admission controller with every slot and queue place taken"""
+    monkeypatch.setattr(admission_controller, "max_concurrency", 0)
+    monkeypatch.setattr(admission_controller, "max_queue", 0)
+    return admission_controller
+
+
+def test_overloaded_routes_get_503_with_retry_after(api_client, demo, saturated):
+    rejected = saturated.rejected
+    response = api_client.post("/compare-algorithms", json={**demo, "creator_id": "admission_503"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+    assert response.json() == {"detail": "Service overloaded, please retry later"}
+    assert saturated.rejected == rejected + 1
+
+    # Critical routes bypass the limiter
+    assert api_client.get("/health").status_code == 200
+
+
+def test_overloaded_analysis_is_degraded_to_scores_only(api_client, demo, saturated):
+    demo = {**demo, "creator_id": "admission_degraded"}
+    degraded_count = saturated.degraded
+    response = api_client.post("/analyze", json=demo)
+    assert response.status_code == 200
+    degraded = response.json()
+    assert degraded["degraded"] is True
+    assert (degraded["recommendations"], degraded["insights"]) == ([], {})
+    assert saturated.degraded == degraded_count + 1
+    assert saturated.stats()["degraded_active"] == 0
+
+    saturated.max_concurrency = settings.ADMISSION_MAX_CONCURRENCY
+    full = api_client.post("/analyze", json=demo).json()
+    assert not full.get("degraded") and full["recommendations"]
+    for key in ("overall_score", "revenue_focus_score", "tier_breakdown", "individual_scores"):
+        assert degraded[key] == full[key]
+
+
+def test_analysis_is_shed_once_the_degraded_budget_is_spent(api_client, demo, saturated, monkeypatch):
+    monkeypatch.setattr(admission_controller, "max_degraded", 0)
+    response = api_client.post("/analyze", json={**demo, "creator_id": "admission_budget"})
+    assert response.status_code == 503 and "Retry-After" in response.headers
+
+
+def test_slots_go_to_the_most_urgent_waiter():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=2, queue_timeout=1.0)
+        assert await controller.acquire(PRIORITY_CLASSES["standard"])
+        order = []
+
+        async def wait(name, priority):
+            if await controller.acquire(PRIORITY_CLASSES[priority]):
+                order.append(name)
+                controller.release()
+            else:
+                order.append(f"{name} shed")
+
+        batch = asyncio.create_task(wait("batch", "batch"))
+        standard = asyncio.create_task(wait("standard", "standard"))
+        await asyncio.sleep(0)
+        # The queue is full: a more urgent newcomer evicts the worst waiter, an equal one is rejected
+        interactive = asyncio.create_task(wait("interactive", "interactive"))
+        await asyncio.sleep(0)
+        assert not await controller.acquire(PRIORITY_CLASSES["standard"])
+
+        controller.release()
+        await asyncio.gather(batch, standard, interactive)
+        return order, controller.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["batch shed", "interactive", "standard"]
+    assert (stats["active"], stats["queue_depth"], stats["evicted"], stats["rejected"]) == (0, 0, 1, 1)
+
+
+def test_waiters_are_shed_after_the_queue_timeout():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.01)
+        assert await controller.acquire(PRIORITY_CLASSES["standard"])
+        granted = await controller.acquire(PRIORITY_CLASSES["interactive"])
+        return granted, controller.stats()
+
+    granted, stats = asyncio.run(scenario())
+    assert not granted
+    assert (stats["timed_out"], stats["queue_depth"], stats["active"]) == (1, 0, 1)
@@ -0,0 +1,142 @@
+"""
+Request coalescing tests: identical concurrent /analyze bodies share one
+computation, and its result or exception reaches every waiting caller
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app
+from src.api.coalescing import SingleFlight, payload_key
+
+_CALLERS = 4
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll condition until it holds, failing the test after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for concurrent requests"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def held_pipeline(monkeypatch):
+    """
+    Analysis pipeline that blocks until released, recording each computation
+
+    Returns:
+        (calls, release): creator IDs computed, and the event letting them finish
+    """
+    calls, release = [], threading.Event()
+    pipeline = app._run_analysis
+
+    def held(data):
+        calls.append(data["creator_id"])
+        assert release.wait(5)
+        return pipeline(data)
+
+    monkeypatch.setattr(app, "_run_analysis", held)
+    return calls, release
+
+
+def _post_concurrently(api_client, body, release):
+    """Send the same /analyze body from _CALLERS threads, releasing the computation once all are waiting"""
+    coalesced = app.analysis_flights.coalesced
+    with ThreadPoolExecutor(_CALLERS) as pool:
+        futures = [pool.submit(api_client.post, "/analyze", json=body) for _ in range(_CALLERS)]
+        _wait_for(lambda: app.analysis_flights.coalesced == coalesced + _CALLERS - 1)
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_identical_concurrent_analyses_compute_once(api_client, held_pipeline):
+    calls, release = held_pipeline
+    demo = api_client.get("/demo-data").json()["demo_data"]
+    responses = _post_concurrently(api_client, {**demo, "creator_id": "coalesced"}, release)
+
+    assert calls == ["coalesced"]
+    assert [response.status_code for response in responses] == [200] * _CALLERS
+    assert len({response.content for response in responses}) == 1
+    assert app.analysis_flights.stats()["in_flight"] == 0
+
+    # Once finished, the same body is computed afresh
+    assert api_client.post("/analyze", json={**demo, "creator_id": "coalesced"}).status_code == 200
+    assert calls == ["coalesced", "coalesced"]
+
+
+def test_computation_error_reaches_every_caller(api_client, held_pipeline, monkeypatch):
+    calls, release = held_pipeline
+    demo = api_client.get("/demo-data").json()["demo_data"]
+
+    def failing_orchestrator():
+        raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(app, "get_kpi_orchestrator", failing_orchestrator)
+    failures = app.analysis_flights.failures
+    responses = _post_concurrently(api_client, {**demo, "creator_id": "coalesced_error"}, release)
+
+    assert calls == ["coalesced_error"]
+    assert [response.status_code for response in responses] == [500] * _CALLERS
+    assert {response.json()["detail"] for response in responses} == {"scoring failed"}
+    assert app.analysis_flights.failures == failures + 1
+
+
+def test_single_flight_shares_results_and_exceptions():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+        gate = asyncio.Event()
+
+        async def compute(result):
+            calls.append(result)
+            await gate.wait()
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        first = [asyncio.create_task(flights.do("a", lambda: compute("a"))) for _ in range(3)]
+        other = asyncio.create_task(flights.do("b", lambda: compute("b")))
+        error = ValueError("boom")
+        failing = [asyncio.create_task(flights.do("c", lambda: compute(error))) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+
+        results = await asyncio.gather(*first, other, *failing, return_exceptions=True)
+        return calls, results, error, flights.stats()
+
+    calls, results, error, stats = asyncio.run(scenario())
+    assert calls == ["a", "b", error]
+    assert results[:4] == ["a", "a", "a", "b"]
+    assert all(result is error for result in results[4:])
+    assert (stats["computations"], stats["coalesced"], stats["failures"], stats["in_flight"]) == (3, 4, 1, 0)
+
+
+def test_cancelled_leader_does_not_cancel_its_followers():
+    async def scenario():
+        flights = SingleFlight()
+        gate = asyncio.Event()
+
+        async def compute():
+            await gate.wait()
+            return "done"
+
+        leader = asyncio.create_task(flights.do("key", compute))
+        follower = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        return leader, await follower
+
+    leader, result = asyncio.run(scenario())
+    assert leader.cancelled() and result == "done"
+
+
+def test_payload_key_ignores_key_order():
+    assert payload_key({"a": 1, "b": 2}, "analyze") == payload_key({"b": 2, "a": 1}, "analyze")
+    assert payload_key({"a": 1}, "analyze") != payload_key({"a": 1}, "compare")
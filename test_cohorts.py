@@ -0,0 +1,294 @@
+"""
+Cohort tests: boolean performance-level filters over the level bitmaps, and
+filters, rankings and aggregates over the columnar cohort snapshot
+"""
+
+import numpy as np
+import pytest
+
+from src.storage.bitmap_index import LevelBitmapIndex
+from src.storage.cohorts import NUMERIC_COLUMNS, CohortSnapshot
+from src.storage.expressions import MAX_DEPTH
+from src.storage.history import SCORER_COLUMNS, TIER_COLUMNS, AnalysisHistoryStore, history_row
+
+
+def _result(creator_id, scores, analyzed_at=100.0, niche="beauty"):
+    """Score result in the shape of BatchScorer.score_records(), scorer name -> score"""
+    return {
+        "creator_id": creator_id,
+        "niche": niche,
+        "timestamp": analyzed_at,
+        "overall_score": 0.5,
+        "revenue_focus_score": 0.5,
+        "tier_scores": {tier: 0.5 for tier in TIER_COLUMNS},
+        "individual_scores": {scorer: scores.get(scorer, 0.5) for scorer in SCORER_COLUMNS},
+    }
+
+
+@pytest.fixture
+def level_index():
+    # Levels: low below 0.3, medium below 0.6, high otherwise; NaN has no level
+    index = LevelBitmapIndex(("engagement_scorer", "discovery_scorer"))
+    index.update(["a", "b", "c", "d"], np.array([
+        [0.9, 0.1],       # engagement high, discovery low
+        [0.5, 0.7],       # medium, high
+        [0.1, np.nan],    # low, no level
+        [0.65, 0.35],     # high, medium
+    ]))
+    return index
+
+
+def _matches(index, expression):
+    return index.query(expression, limit=100)["creator_ids"]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("engagement:high", ["a", "d"]),
+    ("engagement_scorer = high", ["a", "d"]),
+    ("engagement:high AND discovery:low", ["a"]),
+    ("engagement:high AND NOT discovery:low", ["d"]),
+    ("discovery:low OR discovery:medium", ["a", "d"]),
+    ("(engagement:low OR engagement:medium) and not discovery:HIGH", ["c"]),
+    # NOT covers the indexed creators, including those without a level
+    ("NOT discovery:low", ["b", "c", "d"]),
+    # NOT binds tighter than AND, AND tighter than OR
+    ("engagement:low OR engagement:high AND discovery:medium", ["c", "d"]),
+])
+def test_level_expressions(level_index, expression, expected):
+    assert _matches(level_index, expression) == expected
+    assert level_index.count(expression) == len(expected)
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("reach:high", "Unknown scorer"),
+    ("engagement:great", "Unknown level"),
+    ("engagement:high AND", "Expected a term"),
+    ("(engagement:high", "Missing closing parenthesis"),
+    ("engagement:high discovery:low", "Unexpected token"),
+    ("engagement > 0.5", "Unexpected input"),
+    ("", "Empty expression"),
+])
+def test_invalid_level_expressions_are_rejected(level_index, expression, message):
+    with pytest.raises(ValueError, match=message):
+        level_index.count(expression)
+
+
+def test_update_replaces_levels_and_counts_follow(level_index):
+    level_index.update(["a", "e"], np.array([[0.2, 0.8], [0.7, np.nan]]))
+
+    assert level_index.size == 5
+    assert _matches(level_index, "engagement:high") == ["d", "e"]
+    assert level_index.level_counts() == {
+        "engagement_scorer": {"low": 2, "medium": 1, "high": 2},
+        "discovery_scorer": {"low": 0, "medium": 1, "high": 2},
+    }
+    assert level_index.query("engagement:high") == {"count": 2}
+
+
+def test_bitmaps_span_several_words():
+    scores = np.random.default_rng(7).random((200, 2))
+    scores[::17, 1] = np.nan
+    index = LevelBitmapIndex(("engagement_scorer", "discovery_scorer"))
+    index.update([f"creator_{i}" for i in range(200)], scores)
+
+    high = scores[:, 0] >= 0.6
+    low = scores[:, 1] < 0.3
+    assert index.count("engagement:high") == np.count_nonzero(high)
+    assert index.count("engagement:high AND NOT discovery:low") == np.count_nonzero(high & ~low)
+    # NOT must not count the unused bits of the last word
+    assert index.count("NOT engagement:high") == 200 - np.count_nonzero(high)
+    expected = [f"creator_{i}" for i in np.flatnonzero(high | low)[:10]]
+    assert index.query("engagement:high OR discovery:low", limit=10)["creator_ids"] == expected
+
+
+def test_sync_indexes_creators_re_analyzed_since_the_last_sync(tmp_path):
+    store = AnalysisHistoryStore(str(tmp_path / "history.sqlite3"))
+    index = LevelBitmapIndex(SCORER_COLUMNS)
+    store.insert_many([
+        history_row(_result("a", {"engagement_scorer": 0.9})),
+        history_row(_result("b", {"engagement_scorer": 0.1})),
+    ])
+    assert index.sync(store) == 2
+    assert index.sync(store, max_age=60) == 0
+
+    store.insert_many([history_row(_result("b", {"engagement_scorer": 0.8}, analyzed_at=200.0))])
+    assert index.sync(store) == 1
+    assert (index.size, _matches(index, "engagement:high")) == (2, ["a", "b"])
+
+
+def test_levels_endpoint(api_client):
+    from app import analysis_history, get_level_index
+
+    analysis_history.insert_many([
+        history_row(_result("levels_a", {"cost_efficiency_scorer": 0.95, "trend_fit_scorer": 0.05})),
+        history_row(_result("levels_b", {"cost_efficiency_scorer": 0.95, "trend_fit_scorer": 0.95})),
+    ])
+    get_level_index().sync(analysis_history)
+
+    query = "cost_efficiency:high AND trend_fit:low"
+    response = api_client.get("/cohorts/levels", params={"q": query, "limit": 10000})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["query"] == query and result["population"] >= 2
+    assert "levels_a" in result["creator_ids"] and "levels_b" not in result["creator_ids"]
+    assert result["count"] == len(result["creator_ids"])
+
+    assert api_client.get("/cohorts/levels", params={"q": "cost_efficiency:top"}).status_code == 400
+
+
+@pytest.fixture
+def snapshot():
+    creators = {
+        "a": ("beauty", {"overall_score": 0.9, "tier_1": 0.2, "total_revenue": 6000, "engagement_scorer": 0.8}),
+        "b": ("beauty", {"overall_score": 0.4, "tier_1": 0.5, "total_revenue": 1000}),
+        "c": ("gaming", {"overall_score": 0.7, "tier_1": 0.1}),
+        "d": (None, {"overall_score": 0.6, "tier_1": 0.25, "total_revenue": 3000}),
+        "e": ("gaming", {"tier_1": 0.8, "total_revenue": 8000}),
+    }
+    values = np.full((len(creators), len(NUMERIC_COLUMNS)), np.nan)
+    for row, (_, columns) in enumerate(creators.values()):
+        for name, value in columns.items():
+            values[row, NUMERIC_COLUMNS.index(name)] = value
+    cohorts = CohortSnapshot()
+    cohorts.update(list(creators), [niche for niche, _ in creators.values()], values)
+    return cohorts
+
+
+def _filtered(snapshot, where):
+    return [snapshot._creator_ids[position] for position in np.flatnonzero(snapshot.filter(where))]
+
+
+@pytest.mark.parametrize("where, expected", [
+    (None, ["a", "b", "c", "d", "e"]),
+    ("  ", ["a", "b", "c", "d", "e"]),
+    ("niche = 'beauty'", ["a", "b"]),
+    ('niche != "beauty"', ["c", "e"]),
+    ("niche == 'fitness'", []),
+    ("tier_1 < 0.3 AND total_revenue > 5000", ["a"]),
+    ("overall_score >= 0.6 OR niche = 'gaming'", ["a", "c", "d", "e"]),
+    ("engagement > 0.5", ["a"]),
+    # Unknown values satisfy neither a comparison nor its negation
+    ("total_revenue != 1000", ["a", "d", "e"]),
+    ("NOT total_revenue > 5000", ["b", "d"]),
+    ("total_revenue <= 5000", ["b", "d"]),
+    # c: unknown revenue OR tier_1 not above 0.3 is unknown, so NOT excludes it too
+    ("NOT (total_revenue > 5000 OR tier_1 > 0.3)", ["d"]),
+    ("NOT NOT total_revenue > 5000", ["a", "e"]),
+    ("total_revenue <= 3e3 AND NOT (niche = 'gaming')", ["b"]),
+    ("NOT niche = 'beauty'", ["c", "e"]),
+])
+def test_cohort_filters(snapshot, where, expected):
+    assert _filtered(snapshot, where) == expected
+
+
+@pytest.mark.parametrize("where, message", [
+    ("niche > 'beauty'", "niche only supports"),
+    ("niche = 3", "niche only supports"),
+    ("overall_score = 'high'", "is numeric"),
+    ("followers > 5", "Unknown column"),
+    ("niche = beauty", "Unexpected input"),
+    ("tier_1 < 0.3 OR", "Expected a term"),
+])
+def test_invalid_cohort_filters_are_rejected(snapshot, where, message):
+    with pytest.raises(ValueError, match=message):
+        snapshot.filter(where)
+
+
+def test_cohort_ranking(snapshot):
+    result = snapshot.query(limit=3)
+    assert (result["population"], result["matched"]) == (5, 5)
+    # e has no overall score, so it is never ranked
+    assert result["rows"] == [
+        {"creator_id": "a", "niche": "beauty", "overall_score": 0.9, "revenue_focus_score": None},
+        {"creator_id": "c", "niche": "gaming", "overall_score": 0.7, "revenue_focus_score": None},
+        {"creator_id": "d", "niche": None, "overall_score": 0.6, "revenue_focus_score": None},
+    ]
+    assert [row["creator_id"] for row in snapshot.query(descending=False, limit=2)["rows"]] == ["b", "d"]
+
+    result = snapshot.query("niche = 'gaming'", sort_by="total_revenue", columns=["creator_id", "total_revenue"])
+    assert result["matched"] == 2
+    assert result["rows"] == [{"creator_id": "e", "total_revenue": 8000.0}]
+
+    result = snapshot.query(sort_by="tier_1", limit=2)
+    assert [(row["creator_id"], row["tier_1"]) for row in result["rows"]] == [("e", 0.8), ("b", 0.5)]
+
+
+def test_cohort_aggregates(snapshot):
+    aggregates = ["count", "mean:overall_score", "sum:total_revenue", "max:tier_1", "p50:total_revenue"]
+    result = snapshot.query(limit=0, aggregates=aggregates)
+    assert "rows" not in result
+    assert result["aggregates"] == {
+        "count": 5,
+        "mean:overall_score": pytest.approx(0.65),
+        "sum:total_revenue": 18000.0,
+        "max:tier_1": 0.8,
+        "p50:total_revenue": 4500.0,
+    }
+
+    result = snapshot.query(limit=0, group_by="niche", aggregates=["count", "mean:overall_score", "min:engagement"])
+    assert result["groups"] == [
+        {"niche": None, "count": 1, "mean:overall_score": 0.6, "min:engagement": None},
+        {"niche": "beauty", "count": 2, "mean:overall_score": pytest.approx(0.65), "min:engagement": 0.8},
+        {"niche": "gaming", "count": 2, "mean:overall_score": 0.7, "min:engagement": None},
+    ]
+
+
+@pytest.mark.parametrize("arguments, message", [
+    ({"group_by": "tenant_id"}, "Invalid group_by"),
+    ({"aggregates": ["median:overall_score"]}, "Invalid aggregate"),
+    ({"aggregates": ["p101:overall_score"]}, "Invalid aggregate"),
+    ({"aggregates": ["mean"]}, "needs a column"),
+    ({"sort_by": "followers"}, "Unknown column"),
+])
+def test_invalid_cohort_queries_are_rejected(snapshot, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        snapshot.query(**arguments)
+
+
+def test_cohort_query_endpoint(api_client):
+    from app import analysis_history, get_cohort_snapshot
+
+    niche = "cohort_endpoint_test"
+    analysis_history.insert_many([
+        history_row(_result("cohort_a", {}, niche=niche), metrics={"total_revenue": 9000}),
+        history_row(_result("cohort_b", {}, niche=niche), metrics={"total_revenue": 100}),
+        history_row(_result("cohort_c", {}, niche=niche), metrics={"total_revenue": 4000}),
+    ])
+    get_cohort_snapshot().sync(analysis_history)
+
+    response = api_client.post("/cohorts/query", json={
+        "where": f"niche = '{niche}' AND total_revenue > 1000",
+        "sort_by": "total_revenue",
+        "order": "asc",
+        "columns": ["creator_id", "total_revenue"],
+        "group_by": "niche",
+        "aggregates": ["count", "sum:total_revenue"],
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert result["matched"] == 2
+    assert result["rows"] == [
+        {"creator_id": "cohort_c", "total_revenue": 4000.0},
+        {"creator_id": "cohort_a", "total_revenue": 9000.0},
+    ]
+    assert result["groups"] == [{"niche": niche, "count": 2, "sum:total_revenue": 13000.0}]
+
+    for body in ({"where": "niche > 1"}, {"order": "up"}, {"aggregates": ["mode:tier_1"]}):
+        assert api_client.post("/cohorts/query", json=body).status_code == 400
+
+
+def test_nesting_depth_is_limited(snapshot, level_index):
+    assert _filtered(snapshot, "NOT " * MAX_DEPTH + "total_revenue > 5000") == ["a", "e"]
+    assert _filtered(snapshot, "(" * MAX_DEPTH + "tier_1 < 0.2" + ")" * MAX_DEPTH) == ["c"]
+    for expression in ("NOT " * (MAX_DEPTH + 1) + "tier_1 < 0.2", "(" * 5000 + "tier_1 < 0.2" + ")" * 5000):
+        with pytest.raises(ValueError, match="more than"):
+            snapshot.filter(expression)
+    with pytest.raises(ValueError, match="more than"):
+        level_index.count("NOT " * 5000 + "engagement:high")
+
+
+def test_deeply_nested_filters_are_rejected_by_the_endpoints(api_client):
+    response = api_client.post("/cohorts/query", json={"where": "NOT " * 5000 + "tier_1 < 0.2"})
+    assert response.status_code == 400
+    response = api_client.get("/cohorts/levels", params={"q": "(" * 2000 + "engagement:high" + ")" * 2000})
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+"""
+Analysis history tests: the latest-analysis trigger and change feed, and
+keyset-paginated leaderboards
+"""
+
+import pytest
+
+from src.storage.history import (
+    METRIC_COLUMNS, SCORER_COLUMNS, TIER_COLUMNS, AnalysisHistoryStore, history_row, unpack_metrics
+)
+
+
+def _result(creator_id, score, analyzed_at, niche="beauty"):
+    """Score result in the shape of BatchScorer.score_records()"""
+    return {
+        "creator_id": creator_id,
+        "niche": niche,
+        "timestamp": analyzed_at,
+        "overall_score": score,
+        "revenue_focus_score": score / 2,
+        "tier_scores": {tier: score for tier in TIER_COLUMNS},
+        "individual_scores": {scorer: score for scorer in SCORER_COLUMNS},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalysisHistoryStore(str(tmp_path / "history.sqlite3"))
+
+
+def test_trigger_keeps_the_newest_analysis_per_creator(store):
+    store.insert_many([
+        history_row(_result("a", 0.2, 100.0)),
+        history_row(_result("a", 0.6, 300.0)),
+        history_row(_result("b", 0.4, 200.0)),
+    ])
+    # Arrives late but is older: stored in the history, not as the latest
+    store.insert_many([history_row(_result("a", 0.9, 150.0))])
+
+    latest = {row["creator_id"]: row for row in store.latest_changes(("overall_score", "analyzed_at"))}
+    assert {creator: row["overall_score"] for creator, row in latest.items()} == {"a": 0.6, "b": 0.4}
+    assert [row["overall_score"] for row in store.creator_history("a")] == [0.6, 0.9, 0.2]
+    assert [row["overall_score"] for row in store.creator_history("a", start=120.0, end=300.0)] == [0.9]
+
+
+def test_latest_metrics_follow_the_latest_analysis(store):
+    store.insert_many([history_row(_result("a", 0.5, 100.0), metrics={"likes_ratio": 0.3})])
+    store.insert_many([history_row(_result("a", 0.1, 50.0), metrics={"likes_ratio": 0.9})])
+
+    row, = store.latest_changes(("metrics",))
+    metrics = dict(zip(METRIC_COLUMNS, unpack_metrics([row["metrics"]])[0]))
+    assert metrics["likes_ratio"] == 0.3
+
+
+def test_change_feed_returns_creators_updated_after_a_watermark(store):
+    store.insert_many([history_row(_result("a", 0.1, 100.0)), history_row(_result("b", 0.2, 100.0))])
+    watermark = store.last_id()
+    assert store.latest_changes((), watermark) == []
+
+    store.insert_many([history_row(_result("b", 0.3, 200.0)), history_row(_result("c", 0.4, 200.0))])
+    changes = store.latest_changes(("overall_score",), watermark)
+    assert [(row["creator_id"], row["overall_score"]) for row in changes] == [("b", 0.3), ("c", 0.4)]
+    assert changes[-1]["id"] == store.last_id()
+
+
+def _pages(store, sort_key, descending, page_size, **filters):
+    """Walk a leaderboard page by page, as clients do with next_cursor"""
+    pages, after = [], None
+    while True:
+        rows = store.leaderboard(sort_key, descending, limit=page_size, after=after, **filters)
+        if not rows:
+            return pages
+        pages.append([row["creator_id"] for row in rows])
+        last = rows[-1]
+        after = ({**last, **last["individual_scores"]}[sort_key], last["creator_id"])
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_leaderboard_pages_cover_every_creator_once(store, descending):
+    scores = {"a": 0.5, "b": 0.9, "c": 0.5, "d": 0.1, "e": 0.5, "f": 0.7, "g": 0.3}
+    store.insert_many([history_row(_result(creator, score, 100.0)) for creator, score in scores.items()])
+    # Ties are broken by creator_id in the direction of the sort
+    expected = sorted(scores, key=lambda creator: (scores[creator], creator), reverse=descending)
+
+    pages = _pages(store, "overall_score", descending, 3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [creator for page in pages for creator in page] == expected
+
+
+def test_leaderboard_filters_by_niche_and_time(store):
+    store.insert_many([
+        history_row(_result("a", 0.9, 100.0, niche="beauty")),
+        history_row(_result("b", 0.8, 300.0, niche="beauty")),
+        history_row(_result("c", 0.7, 300.0, niche="gaming")),
+    ])
+    assert _pages(store, "overall_score", True, 10, niche="beauty") == [["a", "b"]]
+    assert _pages(store, "overall_score", True, 10, niche="beauty", start=200.0) == [["b"]]
+    assert _pages(store, "overall_score", True, 10, end=200.0) == [["a"]]
+
+
+def test_unindexed_sort_keys_are_served_before_and_after_the_index_build(store):
+    store.insert_many([history_row(_result(creator, score, 100.0))
+                       for creator, score in (("a", 0.2), ("b", 0.8), ("c", 0.5))])
+    sort_key = SCORER_COLUMNS[0]
+    before = _pages(store, sort_key, True, 2)
+
+    store.build_sort_indexes()
+    indexes = {row["name"] for row in store._connection().execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    )}
+    assert f"idx_latest_{sort_key}" in indexes and f"idx_latest_niche_{sort_key}" in indexes
+    assert before == _pages(store, sort_key, True, 2) == [["b", "c"], ["a"]]
+
+
+def test_leaderboard_endpoint_pages_with_next_cursor(api_client):
+    from app import analysis_history
+
+    niche = "leaderboard_endpoint_test"
+    scores = {"lb_a": 0.4, "lb_b": 0.6, "lb_c": 0.6, "lb_d": 0.2}
+    analysis_history.insert_many([history_row(_result(creator, score, 100.0, niche=niche))
+                                  for creator, score in scores.items()])
+
+    creators, cursor = [], None
+    while True:
+        params = {"sort_by": "revenue_focus_score", "niche": niche, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = api_client.get("/leaderboard", params=params).json()
+        creators.extend(row["creator_id"] for row in page["rows"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert creators == ["lb_c", "lb_b", "lb_a", "lb_d"]
+
+    assert api_client.get("/leaderboard", params={"sort_by": "creator_id"}).status_code == 400
+    assert api_client.get("/leaderboard", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,86 @@
+"""
+HTTP caching tests: conditional requests on configuration-derived payloads
+and long-lived caching of fingerprinted static assets
+"""
+
+import os
+from email.utils import formatdate
+
+import app
+from src.api.http_caching import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+from src.config.scoring_config import ScoringConfigManager, compile_config, default_config_data, scoring_config
+
+_MODIFIED_AT = 1_700_000_000
+
+
+def _config(shift=0.0, modified_at=_MODIFIED_AT):
+    """Scoring configuration moving shift from cost efficiency to sales performance"""
+    weights = default_config_data()["weights"]
+    return compile_config({"weights": {
+        "sales_performance_scorer": weights["sales_performance_scorer"] + shift,
+        "cost_efficiency_scorer": weights["cost_efficiency_scorer"] - shift,
+    }}, modified_at=modified_at)
+
+
+def test_weights_are_validated_by_etag_and_last_modified(api_client, monkeypatch):
+    monkeypatch.setattr(scoring_config, "current", _config())
+    response = api_client.get("/weights/api")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"] == formatdate(_MODIFIED_AT, usegmt=True)
+    assert response.headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+
+    not_modified = api_client.get("/weights/api", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    assert api_client.get("/weights/api", headers={"If-None-Match": '"stale"'}).status_code == 200
+    since = {"If-Modified-Since": formatdate(_MODIFIED_AT + 60, usegmt=True)}
+    assert api_client.get("/weights/api", headers=since).status_code == 304
+    earlier = {"If-Modified-Since": formatdate(_MODIFIED_AT - 60, usegmt=True)}
+    assert api_client.get("/weights/api", headers=earlier).status_code == 200
+    # If-None-Match takes precedence over If-Modified-Since
+    assert api_client.get("/weights/api", headers={**since, "If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_config_reload_changes_the_validators(api_client, monkeypatch):
+    monkeypatch.setattr(scoring_config, "current", _config())
+    before = api_client.get("/weights/api")
+
+    monkeypatch.setattr(scoring_config, "current", _config(0.02, modified_at=_MODIFIED_AT + 3600))
+    after = api_client.get("/weights/api", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.headers["Last-Modified"] == formatdate(_MODIFIED_AT + 3600, usegmt=True)
+    assert after.json()["weights"]["sales_performance_scorer"] == scoring_config.current.weights[
+        "sales_performance_scorer"]
+
+
+def test_modification_time_follows_the_configuration_file(tmp_path):
+    path = tmp_path / "scoring.json"
+    path.write_text("{}", encoding="utf-8")
+    os.utime(path, (_MODIFIED_AT, _MODIFIED_AT))
+    manager = ScoringConfigManager()
+    built_in = manager.current.modified_at
+    manager.configure(str(path), poll_interval=60)
+    assert manager.current.modified_at == _MODIFIED_AT != built_in
+    assert manager.stats()["modified_at"] == _MODIFIED_AT
+
+    # Every worker compiling the same file reports the same time
+    other = ScoringConfigManager()
+    other.configure(str(path), poll_interval=60)
+    assert other.current.modified_at == manager.current.modified_at
+
+
+def test_fingerprinted_static_assets_are_immutable(api_client):
+    url = app.static_fingerprints.url("css/dashboard.css")
+    path, version = url.split("?v=")
+    assert path == "/static/css/dashboard.css" and len(version) == 12
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+    # Unversioned or outdated URLs must revalidate
+    assert api_client.get(path).headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+    assert api_client.get(f"{path}?v=000000000000").headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
@@ -0,0 +1,273 @@
+"""
+Ingestion tests: column-wise validation of bulk creator metrics, and
+per-creator aggregation of raw TikTok video exports
+"""
+
+import io
+import math
+
+import numpy as np
+import pytest
+
+from src.config.metric_value_ranges import METRIC_DEFAULTS
+from src.ingestion.tiktok_export import NUMERIC_FIELDS, aggregate_by_creator, load_export, read_export
+from src.ingestion.validation import METRIC_FIELDS, validate_columns
+
+
+def test_valid_columns_are_coerced_and_defaults_filled():
+    validation = validate_columns({
+        "creator_id": ["a", "b", "c"],
+        "niche": ["beauty", None, "gaming"],
+        "likes_ratio": [0.1, "0.2", True],
+        "video_duration": [15, None, 60.5],
+        "total_revenue": np.array([100, 0, 5000], dtype=np.int64),
+        "followers": ["ignored", "like", "CreatorMetrics"],
+    })
+
+    assert (validation.size, validation.invalid_count, validation.errors()) == (3, 0, [])
+    columns = validation.columns()
+    assert list(columns) == list(METRIC_FIELDS)
+    assert columns["likes_ratio"].tolist() == [0.1, 0.2, 1.0]
+    # None and left-out columns take the metric's default
+    assert columns["video_duration"].tolist() == [15.0, METRIC_DEFAULTS["video_duration"], 60.5]
+    assert columns["conversion_rate"].tolist() == [METRIC_DEFAULTS["conversion_rate"]] * 3
+
+    record = validation.records()[1]
+    assert (record["creator_id"], record["niche"], record["total_revenue"]) == ("b", None, 0.0)
+    assert set(record) == {"creator_id", "niche", *METRIC_FIELDS}
+
+
+def test_errors_are_reported_per_creator_and_field():
+    validation = validate_columns({
+        "creator_id": ["ok", None, "bad", "worse"],
+        "likes_ratio": [0.5, 0.5, -0.1, "many"],
+        "retention_rate": [0.9, 0.9, 1.5, math.nan],
+        "engagement_growth_rate": [-0.5, -0.5, -2.0, math.inf],
+        "total_revenue": [10.0, 10.0, 10.0, -math.inf],
+    })
+
+    assert validation.valid.tolist() == [True, False, False, False]
+    assert validation.invalid_count == 3
+    assert validation.errors() == [
+        {"row": 1, "creator_id": None, "errors": {"creator_id": "missing"}},
+        {"row": 2, "creator_id": "bad", "errors": {
+            "likes_ratio": "below the minimum 0",
+            "retention_rate": "above the maximum 1",
+            "engagement_growth_rate": "below the minimum -1",
+        }},
+        {"row": 3, "creator_id": "worse", "errors": {
+            "likes_ratio": "not a number",
+            "retention_rate": "not finite (NaN or infinity)",
+            "engagement_growth_rate": "not finite (NaN or infinity)",
+            "total_revenue": "not finite (NaN or infinity)",
+        }},
+    ]
+    assert [entry["row"] for entry in validation.errors(limit=2)] == [1, 2]
+
+    assert [record["creator_id"] for record in validation.records()] == ["ok"]
+    assert len(validation.records(valid_only=False)) == 4
+    assert validation.columns(valid_only=True)["likes_ratio"].tolist() == [0.5]
+
+
+def test_typed_arrays_are_checked_without_conversion():
+    validation = validate_columns({
+        "creator_id": np.array(["a", "b", "c"]),
+        "likes_ratio": np.array([0.2, np.nan, 2.0], dtype=np.float32),
+    })
+    assert validation.identity["creator_id"].dtype.kind == "U"
+    assert [entry["errors"] for entry in validation.errors()] == [
+        {"likes_ratio": "not finite (NaN or infinity)"},
+        {"likes_ratio": "above the maximum 1"},
+    ]
+
+
+@pytest.mark.parametrize("creator_ids", [["a", "", None], np.array(["a", "", "c"])], ids=["list", "array"])
+def test_empty_creator_ids_are_missing(creator_ids):
+    validation = validate_columns({"creator_id": creator_ids, "likes_ratio": [0.1, 0.2, 0.3]})
+    assert validation.valid.tolist() == [True, False, creator_ids[2] is not None]
+    assert validation.errors()[0] == {"row": 1, "creator_id": "", "errors": {"creator_id": "missing"}}
+
+
+def test_creator_id_column_is_required():
+    validation = validate_columns({"likes_ratio": [0.1, 0.2]})
+    assert validation.invalid_count == 2
+    assert validation.errors(limit=1) == [{"row": 0, "creator_id": None, "errors": {"creator_id": "missing"}}]
+
+
+@pytest.mark.parametrize("columns, message", [
+    ({"creator_id": ["a", "b"], "likes_ratio": [0.1]}, "Columns differ in length"),
+    ({"creator_id": ["a"], "likes_ratio": 0.1}, "likes_ratio: expected a list of values"),
+    ({"creator_id": "a"}, "creator_id: expected a list of values"),
+    ({"creator_id": ["a"], "likes_ratio": np.zeros((1, 1))}, "likes_ratio: expected a list of values"),
+])
+def test_malformed_columns_are_rejected(columns, message):
+    with pytest.raises(ValueError, match=message):
+        validate_columns(columns)
+
+
+def test_columnar_job_reports_invalid_creators(api_client):
+    columns = {"creator_id": ["col_a", "col_b", "col_c"], "retention_rate": [0.5, 1.5, 0.7]}
+
+    response = api_client.post("/jobs/columns", json={"columns": columns})
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["invalid_count"] == 1
+    assert detail["errors"] == [
+        {"row": 1, "creator_id": "col_b", "errors": {"retention_rate": "above the maximum 1"}}
+    ]
+
+    response = api_client.post("/jobs/columns", json={"columns": columns, "skip_invalid": True})
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["invalid_count"], job["progress"]["total_items"]) == (1, 2)
+
+    response = api_client.post("/jobs/columns", json={"columns": {"creator_id": ["a"], "likes_ratio": [1, 2]}})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("field, value, accepted", [
+    ("likes_ratio", 0.0, True),
+    ("likes_ratio", 1.0, True),
+    ("likes_ratio", 1.01, False),
+    ("retention_rate", -0.01, False),
+    ("total_revenue", 0.0, True),
+    ("total_revenue", 1e9, True),
+    ("total_revenue", -1.0, False),
+    ("engagement_growth_rate", -1.0, True),
+    ("engagement_growth_rate", 3.0, True),
+    ("engagement_growth_rate", -1.01, False),
+    # A loss: accepted and scored as no return
+    ("roi_score", -0.5, True),
+    ("roi_score", -20.0, True),
+    ("roi_score", 12.0, True),
+    ("cost_per_view", -0.1, False),
+])
+def test_single_and_bulk_validation_agree(api_client, field, value, accepted):
+    demo = api_client.get("/demo-data").json()["demo_data"]
+    response = api_client.post("/analyze", json={**demo, field: value})
+    assert response.status_code == (200 if accepted else 422)
+    assert validate_columns({"creator_id": ["a"], field: [value]}).invalid_count == (0 if accepted else 1)
+
+
+def test_negative_roi_scores_like_no_return(api_client):
+    demo = api_client.get("/demo-data").json()["demo_data"]
+    loss, flat = (
+        api_client.post("/analyze", json={**demo, "creator_id": "roi_test", "roi_score": roi}).json()
+        for roi in (-0.5, 0.0)
+    )
+    assert loss["individual_scores"]["cost_efficiency_scorer"] == flat["individual_scores"]["cost_efficiency_scorer"]
+
+
+EXPORT_HEADER = "Creator,Category,Video Views,Likes,Comments,Shares,Impressions,Total Play Time,Duration\n"
+
+# Two creators whose names and niches hold commas; bob's videos have no views
+EXPORT = EXPORT_HEADER + (
+    '"smith, jane","home, garden",100,10,2,1,400,1500,20\n'
+    "bob,gaming,0,0,0,0,0,0,30\n"
+    '"smith, jane","home, garden",300,30,3,3,800,9000,40\n'
+    "bob,gaming,0,0,0,0,10,0,50\n"
+)
+
+
+def _aggregate(export):
+    columns = aggregate_by_creator(read_export(io.StringIO(export)))
+    return {name: values.tolist() for name, values in columns.items()}
+
+
+def test_export_columns_are_read_by_header():
+    videos = read_export(io.StringIO(EXPORT))
+    assert videos["creator_id"].tolist() == ["smith, jane", "bob", "smith, jane", "bob"]
+    assert videos["niche"].tolist() == ["home, garden", "gaming", "home, garden", "gaming"]
+    assert videos["views"].tolist() == [100.0, 0.0, 300.0, 0.0]
+    assert videos["duration_seconds"].tolist() == [20.0, 30.0, 40.0, 50.0]
+    assert "tenant_id" not in videos
+
+
+def test_export_aggregation():
+    columns = _aggregate(EXPORT)
+
+    assert columns["creator_id"] == ["smith, jane", "bob"]
+    assert columns["niche"] == ["home, garden", "gaming"]
+    assert columns["video_count"] == [2, 2]
+    assert columns["views"] == [400.0, 0.0]
+    assert columns["likes_ratio"] == [0.1, 0.0]
+    assert columns["comments_ratio"] == [0.0125, 0.0]
+    assert columns["shares_ratio"] == [0.01, 0.0]
+    assert columns["avg_watch_time"] == [26.25, 0.0]
+    # Weighted by views: (100 * 20 + 300 * 40) / 400; the plain mean without views
+    assert columns["video_duration"] == [35.0, 40.0]
+    # 10500 seconds watched of 100 * 20 + 300 * 40 viewed
+    assert columns["retention_rate"] == [0.75, 0.0]
+    assert columns["impression_rate"] == [pytest.approx(49 / 1200), 0.0]
+
+
+def test_creators_keep_the_order_of_their_first_video_and_rewatches_are_capped():
+    export = EXPORT_HEADER + (
+        "zed,,10,1,0,0,100,500,10\n"
+        "amy,,10,1,0,0,100,50,10\n"
+        "zed,,10,1,0,0,100,100,10\n"
+    )
+    columns = _aggregate(export)
+    assert columns["creator_id"] == ["zed", "amy"]
+    assert columns["retention_rate"] == [1.0, 0.5]
+    assert columns["avg_watch_time"] == [30.0, 5.0]
+
+
+def test_export_file_with_byte_order_mark(tmp_path):
+    path = tmp_path / "videos.csv"
+    path.write_text(EXPORT.replace("Creator,", "author_id,"), encoding="utf-8-sig")
+    assert read_export(path)["creator_id"].tolist() == ["smith, jane", "bob", "smith, jane", "bob"]
+    # Paths given as strings are read the same way
+    assert read_export(str(path))["views"].tolist() == [100.0, 0.0, 300.0, 0.0]
+
+
+def test_loaded_export_is_validated_for_scoring():
+    validation = load_export(io.StringIO(EXPORT))
+    assert (validation.size, validation.invalid_count) == (2, 0)
+    record = validation.records()[0]
+    assert (record["creator_id"], record["niche"], record["likes_ratio"]) == ("smith, jane", "home, garden", 0.1)
+    assert validation.columns()["video_duration"].tolist() == [35.0, 40.0]
+
+
+def test_videos_without_a_creator_are_reported():
+    export = EXPORT + ",gaming,10,1,0,0,100,50,10\n" + '"",gaming,20,2,0,0,100,50,10\n'
+    validation = load_export(io.StringIO(export))
+    assert (validation.size, validation.invalid_count) == (3, 1)
+    assert validation.errors() == [{"row": 2, "creator_id": "", "errors": {"creator_id": "missing"}}]
+    assert [record["creator_id"] for record in validation.records()] == ["smith, jane", "bob"]
+
+
+def test_header_only_export_is_empty():
+    videos = read_export(io.StringIO(EXPORT_HEADER))
+    assert all(videos[name].size == 0 for name in (*NUMERIC_FIELDS, "creator_id"))
+
+
+@pytest.mark.parametrize("export, message", [
+    ("creator_id,views\na,1\n", "Export is missing columns"),
+    (EXPORT_HEADER + "a,beauty,10,1,0,0,100,50\n", "short row"),
+    (EXPORT_HEADER + "a,beauty,10,1,0,0,100,50,10\nb,beauty,10\n", "short row"),
+    # Short before the creator_id column, which comes last here
+    ("views,likes,comments,shares,impressions,watch_seconds,duration_seconds,creator_id\n1,2,3,4,5,6,7\n",
+     "short row"),
+    (EXPORT_HEADER + "a,beauty,ten,1,0,0,100,50,10\n", "non-numeric count"),
+])
+def test_malformed_exports_are_rejected(export, message):
+    with pytest.raises(ValueError, match=message):
+        read_export(io.StringIO(export))
+
+
+def test_tiktok_export_job(api_client):
+    response = api_client.post("/jobs/tiktok-export", content=EXPORT.encode("utf-8-sig"),
+                               headers={"Content-Type": "text/csv"})
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["invalid_count"], job["progress"]["total_items"]) == (0, 2)
+
+    export = EXPORT + ",gaming,10,1,0,0,100,50,10\n"
+    assert api_client.post("/jobs/tiktok-export", content=export).status_code == 422
+    response = api_client.post("/jobs/tiktok-export", params={"skip_invalid": True}, content=export)
+    assert (response.status_code, response.json()["invalid_count"]) == (202, 1)
+
+    response = api_client.post("/jobs/tiktok-export", content=EXPORT_HEADER + "a,beauty,10\n")
+    assert response.status_code == 400 and "short row" in response.json()["detail"]
+    assert api_client.post("/jobs/tiktok-export", params={"chunk_size": 0}, content=EXPORT).status_code == 400
@@ -0,0 +1,118 @@
+"""
+Batch job tests: store leases, resumption after a crash and the /jobs API
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src.jobs.manager import JobManager
+from src.jobs.store import JobStore
+
+
+def _records(count):
+    return [{"creator_id": f"creator_{index}", "value": index} for index in range(count)]
+
+
+def _double(records):
+    return [{"creator_id": record["creator_id"], "value": record["value"] * 2} for record in records]
+
+
+def _results(store, job_id):
+    return [json.loads(line) for block in store.iter_results(job_id) for line in block.splitlines()]
+
+
+def _wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_live_lease_blocks_other_workers(store):
+    job = store.create_job("score", _records(5), 2)
+    assert job["total_chunks"] == 3 and job["status"] == "queued"
+
+    claimed = store.claim_next("worker-a", lease_seconds=60)
+    assert claimed["job_id"] == job["job_id"] and claimed["lease_owner"] == "worker-a"
+    assert store.claim_next("worker-b", lease_seconds=60) is None
+
+
+def test_expired_lease_is_taken_over_without_redoing_chunks(store):
+    job_id = store.create_job("score", _records(5), 2)["job_id"]
+
+    # worker-a checkpoints one chunk, then dies; its lease runs out
+    store.claim_next("worker-a", lease_seconds=-1)
+    assert store.complete_chunk(job_id, 0, _double(store.load_chunk(job_id, 0)), "worker-a", lease_seconds=-1)
+
+    taken_over = store.claim_next("worker-b", lease_seconds=60)
+    assert taken_over["lease_owner"] == "worker-b" and taken_over["attempts"] == 2
+    assert store.pending_chunks(job_id) == [1, 2]
+
+    # The old owner can no longer checkpoint
+    assert not store.complete_chunk(job_id, 1, [], "worker-a", lease_seconds=60)
+    for chunk_index in store.pending_chunks(job_id):
+        assert store.complete_chunk(job_id, chunk_index, _double(store.load_chunk(job_id, chunk_index)),
+                                    "worker-b", lease_seconds=60)
+    assert store.finish_job(job_id, "worker-b", "completed")
+
+    job = store.get_job(job_id)
+    assert (job["status"], job["processed_items"], job["completed_chunks"]) == ("completed", 5, 3)
+    assert [result["value"] for result in _results(store, job_id)] == [0, 2, 4, 6, 8]
+
+
+def test_manager_resumes_a_crashed_job(store):
+    job_id = store.create_job("score", _records(6), 2)["job_id"]
+    store.claim_next("crashed-worker", lease_seconds=-1)
+    store.complete_chunk(job_id, 0, _double(store.load_chunk(job_id, 0)), "crashed-worker", lease_seconds=-1)
+
+    processed = []
+    lock = threading.Lock()
+
+    def processor(records):
+        with lock:
+            processed.extend(record["creator_id"] for record in records)
+        return _double(records)
+
+    manager = JobManager(store, {"score": processor}, max_workers=1, lease_seconds=60, poll_interval=0.01)
+    manager.start()
+    try:
+        deadline = time.monotonic() + 10
+        while store.get_job(job_id)["status"] != "completed" and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        manager.stop()
+
+    assert store.get_job(job_id)["status"] == "completed"
+    assert processed == [f"creator_{index}" for index in range(2, 6)]
+    assert [result["value"] for result in _results(store, job_id)] == [0, 2, 4, 6, 8, 10]
+
+
+def test_submit_job_and_download_results(api_client):
+    demo = api_client.get("/demo-data").json()["demo_data"]
+    creators = [{**demo, "creator_id": f"job_creator_{index}"} for index in range(3)]
+
+    response = api_client.post("/jobs", json={"kind": "score", "creators": creators, "chunk_size": 2})
+    assert response.status_code == 202
+    job = _wait_for_job(api_client, response.json()["job_id"])
+    assert job["status"] == "completed"
+    assert job["progress"]["total_chunks"] == 2 and job["progress"]["processed_items"] == 3
+
+    results = [json.loads(line) for line in api_client.get(job["links"]["results"]).text.splitlines()]
+    assert [result["creator_id"] for result in results] == [creator["creator_id"] for creator in creators]
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_non_positive_chunk_size_is_rejected(api_client, chunk_size):
+    demo = api_client.get("/demo-data").json()["demo_data"]
+    response = api_client.post("/jobs", json={"creators": [demo], "chunk_size": chunk_size})
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Profiling session tests: sampling, reports on disk and the session deadline
+"""
+
+import time
+
+import pytest
+
+from src.monitoring.profiling import RequestProfiler
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll condition until it holds, failing the test after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the profiling session to end"
+        time.sleep(0.01)
+
+
+def test_request_session_ends_after_its_last_call(tmp_path):
+    profiler = RequestProfiler(output_dir=str(tmp_path))
+    session = profiler.start(requests=2, endpoints=["analyze"])
+    assert profiler.active and session["mode"] == "requests"
+
+    assert profiler.call("compare", _work, (100,), {}) == _work(100)
+    profiler.call("analyze", _work, (1000,), {})
+    assert profiler.session is not None
+    profiler.call("analyze", _work, (1000,), {})
+
+    assert profiler.session is None and not profiler.active
+    [report] = profiler.reports()
+    assert report["report_id"] == session["session_id"] and report["sampled"] == 2
+    assert report["formats"] == ["prof", "txt", "json"]
+    assert "_work" in profiler.report_path(report["report_id"], "txt").read_text(encoding="utf-8")
+
+
+def test_idle_session_writes_its_report_at_the_deadline(tmp_path):
+    profiler = RequestProfiler(output_dir=str(tmp_path))
+    session = profiler.start(interval=1.0, duration=0.05)
+
+    # Nothing calls status() or a profiled function: the deadline alone ends the session
+    _wait_for(lambda: profiler.reports())
+    assert profiler.session is None and not profiler.active
+    [report] = profiler.reports()
+    assert (report["report_id"], report["sampled"], report["formats"]) == (session["session_id"], 0, ["json"])
+    assert profiler.stop() is None
+
+
+def test_stopped_session_cancels_its_deadline(tmp_path):
+    profiler = RequestProfiler(output_dir=str(tmp_path))
+    profiler.start(interval=0.01, duration=0.05)
+    timer = profiler.session.timer
+    profiler.call("analyze", _work, (100,), {})
+    assert profiler.stop()["sampled"] == 1
+
+    # The next session is not ended by the previous session's deadline
+    profiler.start(requests=1, duration=60)
+    timer.join(1)
+    assert not timer.is_alive()
+    time.sleep(0.1)
+    assert profiler.session is not None and len(profiler.reports()) == 1
+    profiler.stop()
+    assert not profiler.session
+
+
+@pytest.mark.parametrize("arguments, message", [
+    ({}, "exactly one of requests or interval_seconds"),
+    ({"requests": 1, "interval": 1.0}, "exactly one of requests or interval_seconds"),
+    ({"requests": 0}, "requests must be at least 1"),
+    ({"interval": 0}, "interval_seconds must be positive"),
+    ({"requests": 1, "duration": 0}, "duration_seconds must be positive"),
+])
+def test_invalid_sessions_are_rejected(tmp_path, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        RequestProfiler(output_dir=str(tmp_path)).start(**arguments)
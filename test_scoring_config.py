@@ -0,0 +1,221 @@
+"""
+Scoring configuration tests: validation of overrides, hot reload of the
+watched file and per-niche and per-tenant profile selection
+"""
+
+import json
+import threading
+
+import pytest
+
+from src.config.scoring_config import (
+    DEFAULT_PROFILE, ScoringConfigManager, compile_config, default_config_data, scoring_config
+)
+
+
+def _shifted_weights(amount=0.05):
+    """Weight overrides moving amount from cost efficiency to sales performance (still summing to 1)"""
+    weights = default_config_data()["weights"]
+    return {
+        "sales_performance_scorer": weights["sales_performance_scorer"] + amount,
+        "cost_efficiency_scorer": weights["cost_efficiency_scorer"] - amount,
+    }
+
+
+def _write(path, overrides):
+    path.write_text(json.dumps(overrides), encoding="utf-8")
+
+
+def test_overrides_merge_over_the_defaults():
+    defaults = compile_config({})
+    config = compile_config({
+        "weights": _shifted_weights(0.02),
+        "normalization_ranges": {"conversion_rate": [0.0, 0.08]},
+        "bottleneck_thresholds": {"conversion_rate": {"threshold": 0.04}},
+        "revenue_kpis": ["sales_performance_scorer"],
+    })
+
+    assert config.weights["sales_performance_scorer"] == pytest.approx(0.32)
+    assert config.weights["engagement_scorer"] == defaults.weights["engagement_scorer"]
+    assert config.tier_weights["tier_1"] == pytest.approx(defaults.tier_weights["tier_1"] + 0.02)
+    assert config.normalization_ranges["conversion_rate"] == (0.0, 0.08)
+    # Thresholds merge per field, revenue_kpis is replaced
+    assert config.bottleneck_thresholds["conversion_rate"] == {"threshold": 0.04, "severe": 0.02}
+    assert config.revenue_kpis == ["sales_performance_scorer"]
+
+    assert config.version != defaults.version
+    assert compile_config({}).version == defaults.version
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ([], "must be a JSON object"),
+    ({"weigths": {}}, "unknown sections"),
+    ({"weights": {"followers_scorer": 0.1}}, "unknown scorer 'followers_scorer'"),
+    ({"weights": {"engagement_scorer": -0.1}}, "expected a non-negative number"),
+    ({"weights": {"engagement_scorer": float("nan")}}, "expected a non-negative number"),
+    ({"weights": {"engagement_scorer": True}}, "expected a non-negative number"),
+    ({"weights": {"engagement_scorer": 0.5}}, "must sum to 1.0"),
+    ({"tiers": {"tier_4": []}}, "unknown tier 'tier_4'"),
+    ({"tiers": {"tier_1": ["sales_performance_scorer"]}}, "scorers in no tier"),
+    ({"tiers": {"tier_3": ["trend_fit_scorer", "image_score_scorer", "reach_visibility_scorer",
+                           "cost_efficiency_scorer", "engagement_scorer"]}}, "scorers in more than one tier"),
+    ({"revenue_kpis": []}, "at least one scorer is required"),
+    ({"revenue_kpis": ["sales_performance_scorer", "sales_performance_scorer"]}, "duplicate scorers"),
+    ({"normalization_ranges": {"followers": [0, 1]}}, "unknown metric 'followers'"),
+    ({"normalization_ranges": {"conversion_rate": [0.1, 0.1]}}, "expected \\[min, max\\] with min < max"),
+    ({"normalization_ranges": {"conversion_rate": [0.1]}}, "expected \\[min, max\\] with min < max"),
+    ({"bottleneck_thresholds": {"conversion_rate": {"limit": 0.1}}}, "expected an object with threshold"),
+    ({"bottleneck_thresholds": {"conversion_rate": {"threshold": "low"}}}, "expected a number"),
+    # Lower is worse for conversion_rate, higher for cart_abandonment_rate
+    ({"bottleneck_thresholds": {"conversion_rate": {"severe": 0.08}}}, "less extreme than threshold"),
+    ({"bottleneck_thresholds": {"cart_abandonment_rate": {"severe": 0.5}}}, "less extreme than threshold"),
+    ({"profiles": {"default": {}}}, "invalid profile name 'default'"),
+    ({"profiles": {"beauty": {"profiles": {}}}}, "profiles.beauty: unknown sections"),
+    ({"profiles": {"beauty": {"weights": {"engagement_scorer": 0.5}}}}, "profiles.beauty.weights: must sum"),
+    ({"niche_profiles": {"skincare": "beauty"}}, "niche_profiles: unknown profiles \\['beauty'\\]"),
+    ({"tenant_profiles": {"acme": 3}}, "tenant_profiles: expected an object of profile names"),
+])
+def test_invalid_overrides_are_rejected(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        compile_config(overrides)
+
+
+def test_every_problem_is_reported():
+    with pytest.raises(ValueError) as error:
+        compile_config({"weights": {"followers_scorer": 0.1}, "normalization_ranges": {"conversion_rate": [1, 0]}})
+    assert "unknown scorer 'followers_scorer'" in str(error.value)
+    assert "normalization_ranges.conversion_rate" in str(error.value)
+
+
+def test_changed_file_is_reloaded_and_invalid_versions_are_skipped(tmp_path):
+    path = tmp_path / "scoring.json"
+    _write(path, {"weights": _shifted_weights(0.01)})
+    manager = ScoringConfigManager()
+    manager.configure(str(path), poll_interval=60)
+    loaded = manager.current
+    assert loaded.source == str(path) and loaded.weights["sales_performance_scorer"] == pytest.approx(0.31)
+    assert not manager.check()
+
+    # A broken edit is logged and counted; the loaded configuration stays active
+    _write(path, {"weights": {"sales_performance_scorer": 0.9}})
+    assert not manager.check()
+    assert manager.current is loaded
+    assert manager.failures == 1 and "must sum to 1.0" in manager.last_error
+    # ... and is not retried until the file changes again
+    assert not manager.check() and manager.failures == 1
+
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(ValueError, match="Cannot read scoring configuration"):
+        manager.reload()
+    assert manager.current is loaded
+
+    _write(path, {"weights": _shifted_weights(0.02)})
+    assert manager.check()
+    assert manager.current.weights["sales_performance_scorer"] == pytest.approx(0.32)
+    assert (manager.reloads, manager.last_error) == (2, None)
+    assert manager.stats()["version"] == manager.current.version != loaded.version
+
+
+def test_invalid_file_stops_configuration(tmp_path):
+    path = tmp_path / "scoring.json"
+    _write(path, {"tiers": {"tier_2": []}})
+    manager = ScoringConfigManager()
+    defaults = manager.current
+    with pytest.raises(ValueError, match="scorers in no tier"):
+        manager.configure(str(path), poll_interval=60)
+    assert manager.current is defaults
+
+
+def test_missing_file_keeps_the_built_in_configuration(tmp_path):
+    manager = ScoringConfigManager()
+    defaults = manager.current
+    manager.configure(str(tmp_path / "missing.json"), poll_interval=60)
+    assert not manager.check()
+    assert manager.current is defaults and manager.current.source is None
+
+
+def _profiled_config():
+    return compile_config({
+        "weights": _shifted_weights(0.01),
+        "profiles": {
+            "beauty": {"weights": _shifted_weights(0.03)},
+            "enterprise": {"revenue_kpis": ["sales_performance_scorer"]},
+        },
+        "niche_profiles": {"skincare": "beauty", "makeup": "beauty"},
+        "tenant_profiles": {"acme": "enterprise"},
+    })
+
+
+@pytest.mark.parametrize("tenant, niche, expected", [
+    (None, None, DEFAULT_PROFILE),
+    (None, "gaming", DEFAULT_PROFILE),
+    ("unknown_tenant", "gaming", DEFAULT_PROFILE),
+    # A profile applies to the niche of its own name and the niches mapped to it
+    (None, "beauty", "beauty"),
+    (None, "skincare", "beauty"),
+    ("unknown_tenant", "makeup", "beauty"),
+    # The tenant wins over the niche
+    ("acme", None, "enterprise"),
+    ("acme", "skincare", "enterprise"),
+])
+def test_profile_selection(tenant, niche, expected):
+    assert _profiled_config().profile_for(tenant, niche).name == expected
+
+
+def test_profiles_are_compiled_over_the_file_configuration():
+    config = _profiled_config()
+    beauty, enterprise = config.profiles["beauty"], config.profiles["enterprise"]
+
+    # Profiles start from the merged file sections, not from the built-in defaults
+    assert enterprise.weights == config.weights
+    assert config.weights["sales_performance_scorer"] == pytest.approx(0.31)
+    assert beauty.weights["sales_performance_scorer"] == pytest.approx(0.33)
+    assert enterprise.revenue_kpis == ["sales_performance_scorer"] != config.revenue_kpis
+    assert len({config.version, beauty.version, enterprise.version}) == 3
+
+    # Lookups return the compiled objects themselves
+    assert config.profile_for(niche="skincare") is beauty
+    assert config.as_dict()["profiles"]["beauty"]["weights"] == beauty.weights
+    assert config.as_dict()["niche_profiles"] == {"skincare": "beauty", "makeup": "beauty"}
+
+
+def test_select_keeps_the_profile_bound_for_the_request():
+    manager = ScoringConfigManager()
+    manager.current = config = _profiled_config()
+    beauty = manager.select({"niche": "skincare"})
+    assert beauty is config.profiles["beauty"]
+    assert manager.select({"tenant_id": "acme", "niche": "skincare"}) is config.profiles["enterprise"]
+    assert manager.active is config
+
+    with manager.using(beauty):
+        # A reload during the request does not change what its steps read
+        manager.current = compile_config({})
+        assert manager.active is beauty
+        assert manager.select({"tenant_id": "acme"}) is beauty
+        with manager.using(config.profiles["enterprise"]):
+            assert manager.active is config.profiles["enterprise"]
+        assert manager.active is beauty
+
+        # The binding is per thread
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(manager.active))
+        thread.start()
+        thread.join()
+        assert seen == [manager.current]
+    assert manager.active is manager.current
+
+
+def test_analysis_scores_with_the_creator_profile(api_client, monkeypatch):
+    monkeypatch.setattr(scoring_config, "current", _profiled_config())
+    demo = api_client.get("/demo-data").json()["demo_data"]
+
+    def overall_score(**identity):
+        response = api_client.post("/analyze", json={**demo, "creator_id": "profile_test", **identity})
+        assert response.status_code == 200
+        return response.json()["overall_score"]
+
+    default = overall_score(niche="gaming")
+    beauty = overall_score(niche="skincare")
+    assert beauty != default
+    assert overall_score(niche="beauty") == beauty
+    assert overall_score(tenant_id="acme", niche="skincare") == overall_score(tenant_id="acme", niche="gaming")
@@ -3,6 +3,7 @@ Task 1 Testing: KPI Algorithm Optimization
 Tests the multi-tier weighted algorithm vs equal weighting
 """
 
+import pytest
 import requests
 import json
 from datetime import datetime
@@ -10,8 +11,22 @@ import os
 from src.config.config import settings
 
 class Task1Tester:
-    def __init__(self, base_url=None):
-        self.base_url = base_url or settings.base_url
+    SCENARIOS = (
+        "test_algorithm_comparison",
+        "test_weight_distribution",
+        "test_revenue_focus_calculation",
+        "test_tier_classification",
+        "test_mathematical_formula",
+        "test_business_impact_measurement",
+        "test_performance_validation",
+        "test_edge_cases",
+    )
+
+    def __init__(self, base_url=None, client=None):
+        # client: anything with requests' get/post API (a live-server session by
+        # default, or an in-process TestClient, see conftest.py)
+        self.client = client or requests
+        self.base_url = base_url or (settings.base_url if client is None else "")
         self.test_results = []
     
     def test_algorithm_comparison(self):
@@ -48,7 +63,7 @@ class Task1Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/compare-algorithms", json=test_data)
+            response = self.client.post(f"{self.base_url}/compare-algorithms", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 
@@ -90,7 +105,7 @@ class Task1Tester:
         print("=" * 50)
         
         try:
-            response = requests.get(f"{self.base_url}/weights/api")
+            response = self.client.get(f"{self.base_url}/weights/api")
             if response.status_code == 200:
                 weights = response.json()["weights"]
                 
@@ -166,7 +181,7 @@ class Task1Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 
@@ -201,7 +216,7 @@ class Task1Tester:
         print("=" * 50)
         
         try:
-            response = requests.get(f"{self.base_url}/weights/api")
+            response = self.client.get(f"{self.base_url}/weights/api")
             if response.status_code == 200:
                 weights = response.json()["weights"]
                 
@@ -272,7 +287,7 @@ class Task1Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 
@@ -331,7 +346,7 @@ class Task1Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 
@@ -396,7 +411,7 @@ class Task1Tester:
         
         try:
             start_time = time.time()
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             end_time = time.time()
             
             response_time = (end_time - start_time) * 1000  # Convert to milliseconds
@@ -451,7 +466,7 @@ class Task1Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -484,14 +499,8 @@ class Task1Tester:
         print("=" * 60)
         
         # Run all tests
-        self.test_algorithm_comparison()
-        self.test_weight_distribution()
-        self.test_revenue_focus_calculation()
-        self.test_tier_classification()
-        self.test_mathematical_formula()
-        self.test_business_impact_measurement()
-        self.test_performance_validation()
-        self.test_edge_cases()
+        for scenario in self.SCENARIOS:
+            getattr(self, scenario)()
         
         # Summary
         print("\n📊 Task 1 Test Summary")
@@ -512,6 +521,15 @@ class Task1Tester:
         
         return passed == total
 
+
+@pytest.mark.parametrize("scenario", Task1Tester.SCENARIOS)
+def test_scenario(api_client, scenario):
+    """Run one Task 1 scenario against the in-process app (see conftest.py)"""
+    tester = Task1Tester(client=api_client)
+    completed = getattr(tester, scenario)()
+    failures = [f"{name}: {result}" for name, success, result in tester.test_results if not success]
+    assert completed and not failures, failures
+
 if __name__ == "__main__":
     tester = Task1Tester()
     tester.run_all_tests()
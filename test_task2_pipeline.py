@@ -3,6 +3,7 @@ Task 2 Testing: Revenue Optimization AI Pipeline
 Tests the AI recommendation system and diagnostic capabilities
 """
 
+import pytest
 import requests
 import json
 from datetime import datetime
@@ -10,8 +11,17 @@ import os
 from src.config.config import settings
 
 class Task2Tester:
-    def __init__(self, base_url=None):
-        self.base_url = base_url or settings.base_url
+    SCENARIOS = (
+        "test_bottleneck_identification",
+        "test_recommendation_quality",
+        "test_revenue_optimization",
+    )
+
+    def __init__(self, base_url=None, client=None):
+        # client: anything with requests' get/post API (a live-server session by
+        # default, or an in-process TestClient, see conftest.py)
+        self.client = client or requests
+        self.base_url = base_url or (settings.base_url if client is None else "")
         self.test_results = []
     
     def test_bottleneck_identification(self):
@@ -121,7 +131,7 @@ class Task2Tester:
             print(f"\n🔍 Testing: {scenario['name']}")
             
             try:
-                response = requests.post(f"{self.base_url}/analyze", json=scenario['data'])
+                response = self.client.post(f"{self.base_url}/analyze", json=scenario['data'])
                 if response.status_code == 200:
                     result = response.json()
                     recommendations = result['recommendations']
@@ -190,7 +200,7 @@ class Task2Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 recommendations = result['recommendations']
@@ -289,7 +299,7 @@ class Task2Tester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/analyze", json=test_data)
+            response = self.client.post(f"{self.base_url}/analyze", json=test_data)
             if response.status_code == 200:
                 result = response.json()
                 recommendations = result['recommendations']
@@ -347,9 +357,8 @@ class Task2Tester:
         print("=" * 60)
         
         # Run all tests
-        self.test_bottleneck_identification()
-        self.test_recommendation_quality()
-        self.test_revenue_optimization()
+        for scenario in self.SCENARIOS:
+            getattr(self, scenario)()
         
         # Summary
         print("\n📊 Task 2 Test Summary")
@@ -370,6 +379,15 @@ class Task2Tester:
         
         return passed == total
 
+
+@pytest.mark.parametrize("scenario", Task2Tester.SCENARIOS)
+def test_scenario(api_client, scenario):
+    """Run one Task 2 scenario against the in-process app (see conftest.py)"""
+    tester = Task2Tester(client=api_client)
+    completed = getattr(tester, scenario)()
+    failures = [f"{name}: {result}" for name, success, result in tester.test_results if not success]
+    assert completed and not failures, failures
+
 if __name__ == "__main__":
     tester = Task2Tester()
     tester.run_all_tests()